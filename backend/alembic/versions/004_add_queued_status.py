@@ -0,0 +1,23 @@
+"""
+Migration 004: Add QUEUED to the meetingstatus enum.
+Meetings wait in this state while all MAX_CONCURRENT_BOTS slots are busy.
+"""
+from alembic import op
+
+
+# revision identifiers
+revision = '004'
+down_revision = '003'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # ALTER TYPE ... ADD VALUE cannot run inside a transaction block
+    with op.get_context().autocommit_block():
+        op.execute("ALTER TYPE meetingstatus ADD VALUE IF NOT EXISTS 'QUEUED'")
+
+
+def downgrade() -> None:
+    # Postgres cannot drop enum values; move rows back to SCHEDULED instead
+    op.execute("UPDATE meetings SET status = 'SCHEDULED' WHERE status = 'QUEUED'")
@@ -0,0 +1,24 @@
+"""
+Migration 005: Add claimed_by and claim_expires_at columns to meetings table.
+Scheduler instances claim due meetings with FOR UPDATE SKIP LOCKED under a
+lease so that several API replicas never launch the same bot twice.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers
+revision = '005'
+down_revision = '004'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('meetings', sa.Column('claimed_by', sa.String(), nullable=True))
+    op.add_column('meetings', sa.Column('claim_expires_at', sa.DateTime(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('meetings', 'claim_expires_at')
+    op.drop_column('meetings', 'claimed_by')
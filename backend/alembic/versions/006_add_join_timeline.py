@@ -0,0 +1,25 @@
+"""
+Migration 006: Add bot_started_at, lobby_reached_at and admitted_at columns to meetings table.
+The scheduler learns per-platform pre-launch lead times from these.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers
+revision = '006'
+down_revision = '005'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('meetings', sa.Column('bot_started_at', sa.DateTime(), nullable=True))
+    op.add_column('meetings', sa.Column('lobby_reached_at', sa.DateTime(), nullable=True))
+    op.add_column('meetings', sa.Column('admitted_at', sa.DateTime(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('meetings', 'admitted_at')
+    op.drop_column('meetings', 'lobby_reached_at')
+    op.drop_column('meetings', 'bot_started_at')
@@ -0,0 +1,40 @@
+"""
+Migration 007: Add bot_runs table.
+Persists every launched bot (PID or container, host, heartbeat) so a
+restarted API can re-attach to bots that are still mid-meeting.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers
+revision = '007'
+down_revision = '006'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'bot_runs',
+        sa.Column('id', sa.String(), nullable=False),
+        sa.Column('meeting_id', sa.String(), nullable=False),
+        sa.Column('host', sa.String(), nullable=False),
+        sa.Column('supervisor_pid', sa.Integer(), nullable=True),
+        sa.Column('pid', sa.Integer(), nullable=True),
+        sa.Column('container_name', sa.String(), nullable=True),
+        sa.Column('log_path', sa.String(), nullable=True),
+        sa.Column('status', sa.String(), nullable=False),
+        sa.Column('started_at', sa.DateTime(), nullable=False),
+        sa.Column('last_heartbeat_at', sa.DateTime(), nullable=False),
+        sa.Column('ended_at', sa.DateTime(), nullable=True),
+        sa.Column('exit_code', sa.Integer(), nullable=True),
+        sa.ForeignKeyConstraint(['meeting_id'], ['meetings.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_bot_runs_meeting_id', 'bot_runs', ['meeting_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_bot_runs_meeting_id', table_name='bot_runs')
+    op.drop_table('bot_runs')
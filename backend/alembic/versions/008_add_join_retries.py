@@ -0,0 +1,28 @@
+"""
+Migration 008: Add join_attempts and next_attempt_at to meetings, and
+attempt and failure_reason to bot_runs.
+Failed joins are retried with backoff up to MAX_JOIN_ATTEMPTS.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers
+revision = '008'
+down_revision = '007'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('meetings', sa.Column('join_attempts', sa.Integer(), server_default='0', nullable=False))
+    op.add_column('meetings', sa.Column('next_attempt_at', sa.DateTime(), nullable=True))
+    op.add_column('bot_runs', sa.Column('attempt', sa.Integer(), server_default='1', nullable=False))
+    op.add_column('bot_runs', sa.Column('failure_reason', sa.String(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('bot_runs', 'failure_reason')
+    op.drop_column('bot_runs', 'attempt')
+    op.drop_column('meetings', 'next_attempt_at')
+    op.drop_column('meetings', 'join_attempts')
@@ -0,0 +1,26 @@
+"""
+Migration 009: Add claimed_at, browser_ready_at and ended_at columns to meetings table.
+Together with the existing timeline columns these time every join stage
+for the latency percentiles and histograms.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers
+revision = '009'
+down_revision = '008'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('meetings', sa.Column('claimed_at', sa.DateTime(), nullable=True))
+    op.add_column('meetings', sa.Column('browser_ready_at', sa.DateTime(), nullable=True))
+    op.add_column('meetings', sa.Column('ended_at', sa.DateTime(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('meetings', 'ended_at')
+    op.drop_column('meetings', 'browser_ready_at')
+    op.drop_column('meetings', 'claimed_at')
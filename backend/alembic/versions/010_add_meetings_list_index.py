@@ -0,0 +1,25 @@
+"""
+Migration 010: Add composite (user_id, status, scheduled_time) index to meetings table.
+Serves the per-user meeting list, its status filter and keyset ordering.
+"""
+from alembic import op
+
+
+# revision identifiers
+revision = '010'
+down_revision = '009'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        'ix_meetings_user_status_scheduled',
+        'meetings',
+        ['user_id', 'status', 'scheduled_time'],
+        unique=False
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_meetings_user_status_scheduled', table_name='meetings')
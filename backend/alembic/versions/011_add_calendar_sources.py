@@ -0,0 +1,61 @@
+"""
+Migration 011: Add calendar_sources table and calendar columns to meetings.
+ICS feeds are ingested into meetings keyed by (calendar_source_id,
+external_uid); source_hash lets a re-sync skip unchanged events.
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers
+revision = '011'
+down_revision = '010'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'calendar_sources',
+        sa.Column('id', sa.String(), nullable=False),
+        sa.Column('user_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('name', sa.String(), nullable=False),
+        sa.Column('url', sa.String(), nullable=False),
+        sa.Column('etag', sa.String(), nullable=True),
+        sa.Column('last_modified', sa.String(), nullable=True),
+        sa.Column('next_sync_at', sa.DateTime(), nullable=False),
+        sa.Column('last_synced_at', sa.DateTime(), nullable=True),
+        sa.Column('last_changed_at', sa.DateTime(), nullable=True),
+        sa.Column('last_error', sa.String(), nullable=True),
+        sa.Column('event_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_calendar_sources_user_id', 'calendar_sources', ['user_id'], unique=False)
+
+    op.add_column('meetings', sa.Column('calendar_source_id', sa.String(), nullable=True))
+    op.add_column('meetings', sa.Column('external_uid', sa.String(), nullable=True))
+    op.add_column('meetings', sa.Column('source_hash', sa.String(length=64), nullable=True))
+    op.create_foreign_key(
+        'fk_meetings_calendar_source_id', 'meetings', 'calendar_sources',
+        ['calendar_source_id'], ['id'], ondelete='SET NULL'
+    )
+    op.create_index(
+        'ux_meetings_calendar_event',
+        'meetings',
+        ['calendar_source_id', 'external_uid'],
+        unique=True
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ux_meetings_calendar_event', table_name='meetings')
+    op.drop_constraint('fk_meetings_calendar_source_id', 'meetings', type_='foreignkey')
+    op.drop_column('meetings', 'source_hash')
+    op.drop_column('meetings', 'external_uid')
+    op.drop_column('meetings', 'calendar_source_id')
+    op.drop_index('ix_calendar_sources_user_id', table_name='calendar_sources')
+    op.drop_table('calendar_sources')
@@ -0,0 +1,52 @@
+"""
+Migration 012: Add partial indexes for the scheduler and supervisor hot paths.
+Due-meeting scans, retry scans, in-progress orphan checks and open bot runs
+only ever touch live rows; partial indexes keep them from walking history.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers
+revision = '012'
+down_revision = '011'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        'ix_meetings_due',
+        'meetings',
+        ['scheduled_time'],
+        unique=False,
+        postgresql_where=sa.text("status IN ('SCHEDULED', 'QUEUED')")
+    )
+    op.create_index(
+        'ix_meetings_retry_due',
+        'meetings',
+        ['next_attempt_at'],
+        unique=False,
+        postgresql_where=sa.text("next_attempt_at IS NOT NULL")
+    )
+    op.create_index(
+        'ix_meetings_in_progress',
+        'meetings',
+        ['join_attempted_at'],
+        unique=False,
+        postgresql_where=sa.text("status = 'IN_PROGRESS'")
+    )
+    op.create_index(
+        'ix_bot_runs_open',
+        'bot_runs',
+        ['meeting_id'],
+        unique=False,
+        postgresql_where=sa.text("ended_at IS NULL")
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_bot_runs_open', table_name='bot_runs')
+    op.drop_index('ix_meetings_in_progress', table_name='meetings')
+    op.drop_index('ix_meetings_retry_due', table_name='meetings')
+    op.drop_index('ix_meetings_due', table_name='meetings')
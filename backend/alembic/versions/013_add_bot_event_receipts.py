@@ -0,0 +1,32 @@
+"""
+Migration 013: Add bot_event_receipts table.
+Records the ID of every bot event applied by /complete and /events so
+bots can resend from their on-disk outbox without double-applying.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers
+revision = '013'
+down_revision = '012'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'bot_event_receipts',
+        sa.Column('id', sa.String(), nullable=False),
+        sa.Column('meeting_id', sa.String(), nullable=False),
+        sa.Column('event', sa.String(), nullable=False),
+        sa.Column('received_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['meeting_id'], ['meetings.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_bot_event_receipts_meeting_id', 'bot_event_receipts', ['meeting_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_bot_event_receipts_meeting_id', table_name='bot_event_receipts')
+    op.drop_table('bot_event_receipts')
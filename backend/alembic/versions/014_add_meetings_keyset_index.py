@@ -0,0 +1,27 @@
+"""
+Migration 014: Add (user_id, scheduled_time NULLS FIRST, id) index to meetings table.
+Serves the unfiltered meeting list's keyset order; the status-filtered
+list keeps ix_meetings_user_status_scheduled.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers
+revision = '014'
+down_revision = '013'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        'ix_meetings_user_scheduled_id',
+        'meetings',
+        ['user_id', sa.text('scheduled_time NULLS FIRST'), 'id'],
+        unique=False
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_meetings_user_scheduled_id', table_name='meetings')
@@ -3,7 +3,7 @@ API Router
 Aggregates all API v1 endpoints
 """
 from fastapi import APIRouter
-from app.api.v1.endpoints import auth, platforms, meetings
+from app.api.v1.endpoints import auth, platforms, meetings, calendars
 
 api_router = APIRouter()
 
@@ -11,6 +11,7 @@ api_router = APIRouter()
 api_router.include_router(auth.router, prefix="/auth", tags=["Authentication"])
 api_router.include_router(platforms.router, prefix="/platforms", tags=["Platforms"])
 api_router.include_router(meetings.router, prefix="/meetings", tags=["Meetings"])
+api_router.include_router(calendars.router, prefix="/calendars", tags=["Calendars"])
 
 # Future routers (to be uncommented as implemented)
 # api_router.include_router(personas.router, prefix="/personas", tags=["Personas"])
@@ -5,16 +5,17 @@ User registration, login, and profile
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import select, func
 from datetime import timedelta
 
 from app.db.session import get_db
+from app.db.instrumentation import QueryBudget
 from app.models.user import User
 from app.schemas.user import UserCreate, UserResponse, UserLogin
 from app.schemas.token import Token
 from app.core.security import (
-    get_password_hash,
-    verify_password,
+    hash_password,
+    verify_and_update_password,
     create_access_token,
     get_current_active_user
 )
@@ -23,7 +24,12 @@ from app.core.config import settings
 router = APIRouter()
 
 
-@router.post("/register", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
+@router.post(
+    "/register",
+    response_model=UserResponse,
+    status_code=status.HTTP_201_CREATED,
+    dependencies=[Depends(QueryBudget(queries=5, rows=4))]
+)
 async def register(
     user_data: UserCreate,
     db: AsyncSession = Depends(get_db)
@@ -61,15 +67,14 @@ async def register(
             )
     
     # Check if this is the first user (make them superuser)
-    result = await db.execute(select(User))
-    users_count = len(result.scalars().all())
-    is_first_user = users_count == 0
+    result = await db.execute(select(User.id).limit(1))
+    is_first_user = result.first() is None
     
     # Create new user
     new_user = User(
         username=user_data.username,
         email=user_data.email,
-        hashed_password=get_password_hash(user_data.password),
+        hashed_password=await hash_password(user_data.password),
         is_active=True,
         is_superuser=is_first_user  # First user is superuser
     )
@@ -98,7 +103,12 @@ async def login(
     user = result.scalar_one_or_none()
     
     # Verify user exists and password is correct
-    if not user or not verify_password(user_credentials.password, user.hashed_password):
+    valid, new_hash = False, None
+    if user:
+        valid, new_hash = await verify_and_update_password(
+            user_credentials.password, user.hashed_password
+        )
+    if not valid:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect username or password",
@@ -111,6 +121,11 @@ async def login(
             detail="User account is inactive"
         )
     
+    # Stored hash predates the current BCRYPT_ROUNDS — upgrade it transparently
+    if new_hash:
+        user.hashed_password = new_hash
+        await db.commit()
+    
     # Create access token
     access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     access_token = create_access_token(
@@ -131,16 +146,16 @@ async def get_current_user_profile(
     return current_user
 
 
-@router.get("/check-first-user")
+@router.get("/check-first-user", dependencies=[Depends(QueryBudget(queries=1, rows=1))])
 async def check_first_user(db: AsyncSession = Depends(get_db)):
     """
     Check if any users exist in the database
     Used to determine if registration should be shown
     """
-    result = await db.execute(select(User))
-    users = result.scalars().all()
+    result = await db.execute(select(func.count()).select_from(User))
+    total_users = result.scalar_one()
     
     return {
-        "is_first_user": len(users) == 0,
-        "total_users": len(users)
+        "is_first_user": total_users == 0,
+        "total_users": total_users
     }
@@ -0,0 +1,111 @@
+"""
+Calendar API Endpoints
+Manage ICS feeds that meetings are ingested from
+"""
+from fastapi import APIRouter, Depends, HTTPException, status, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, and_
+from typing import List
+
+from app.db.session import get_db
+from app.models.calendar_source import CalendarSource
+from app.models.user import User
+from app.schemas.calendar import CalendarSourceCreate, CalendarSourceResponse, CalendarSyncResponse
+from app.services.calendar_ingest import calendar_ingestor, CalendarSyncError
+from app.core.security import get_current_user
+
+router = APIRouter()
+
+
+async def _get_source(db: AsyncSession, source_id: str, user: User) -> CalendarSource:
+    result = await db.execute(
+        select(CalendarSource).where(
+            and_(
+                CalendarSource.id == source_id,
+                CalendarSource.user_id == user.id
+            )
+        )
+    )
+    source = result.scalar_one_or_none()
+    if not source:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Calendar with ID {source_id} not found"
+        )
+    return source
+
+
+@router.post("", response_model=CalendarSourceResponse, status_code=status.HTTP_201_CREATED)
+async def create_calendar(
+    source_data: CalendarSourceCreate,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Add an ICS feed. It is synced by the scheduler shortly after, or
+    immediately via POST /calendars/{id}/sync
+    """
+    if not source_data.url.startswith(("http://", "https://")) and calendar_ingestor.local_path(source_data.url, current_user.id) is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Calendar URL must be http(s):// or a file under CALENDAR_FILE_DIR/{current_user.id}"
+        )
+
+    source = CalendarSource(
+        name=source_data.name,
+        url=source_data.url,
+        user_id=current_user.id
+    )
+    db.add(source)
+    await db.commit()
+    await db.refresh(source)
+    return source
+
+
+@router.get("", response_model=List[CalendarSourceResponse])
+async def list_calendars(
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """Get all calendar feeds for current user"""
+    result = await db.execute(
+        select(CalendarSource)
+        .where(CalendarSource.user_id == current_user.id)
+        .order_by(CalendarSource.created_at)
+    )
+    return result.scalars().all()
+
+
+@router.post("/{source_id}/sync", response_model=CalendarSyncResponse)
+async def sync_calendar(
+    source_id: str,
+    force: bool = Query(False, description="Re-read the feed even if its ETag/mtime is unchanged"),
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """Sync one feed now"""
+    source = await _get_source(db, source_id, current_user)
+    try:
+        return await calendar_ingestor.sync_source(db, source, force=force)
+    except CalendarSyncError as e:
+        await db.rollback()
+        source = await _get_source(db, source_id, current_user)
+        source.last_error = str(e)[:500]
+        await db.commit()
+        raise HTTPException(
+            status_code=status.HTTP_502_BAD_GATEWAY,
+            detail=str(e)
+        )
+
+
+@router.delete("/{source_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_calendar(
+    source_id: str,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """Remove a feed. Meetings already ingested from it are kept."""
+    source = await _get_source(db, source_id, current_user)
+    await db.delete(source)
+    await db.commit()
+    return None
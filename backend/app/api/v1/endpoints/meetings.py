@@ -2,28 +2,56 @@
 Meeting API Endpoints
 CRUD operations for meeting management with platform auto-detection
 """
-from fastapi import APIRouter, Depends, HTTPException, status, Header
+from fastapi import APIRouter, Depends, HTTPException, status, Header, Query, Response
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, and_
+from sqlalchemy import select, insert, and_, or_, func
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from pydantic import ValidationError
 from typing import List, Optional
 from datetime import datetime
+import asyncio
+import base64
+import binascii
+import hashlib
+import json
 
-from app.db.session import get_db
+from app.db.session import get_db, AsyncSessionLocal
+from app.db.instrumentation import QueryBudget
 from app.models.meeting import Meeting, MeetingStatus
+from app.models.bot_event_receipt import BotEventReceipt
 from app.models.user import User
 from app.schemas.meeting import (
     MeetingCreate,
+    MeetingBulkCreate,
+    MeetingBulkItemResult,
+    MeetingBulkResponse,
     MeetingUpdate,
     MeetingResponse,
     MeetingListResponse,
-    PlatformDetectionResponse
+    PlatformDetectionResponse,
+    BotEventCreate,
+    BotEventType,
+    BotCompletion
 )
 from app.services.platform_detector import platform_detector
+from app.services.scheduler import scheduler
+from app.services.admission import admission_controller
+from app.services.bot_launcher import is_supported_platform
+from app.services.bot_supervisor import bot_supervisor
+from app.services.join_metrics import join_latency_percentiles, observe_stages
+from app.services.meeting_events import meeting_event_broker, publish_statuses
 from app.core.security import get_current_user
 from app.core.config import settings
 
 router = APIRouter()
 
+# The list endpoint selects exactly the response's columns
+LIST_COLUMNS = [getattr(Meeting, name) for name in MeetingResponse.model_fields]
+
+STREAM_KEEPALIVE_SECONDS = 15
+STREAM_RETRY_MS = 3000  # EventSource reconnect delay
+
 
 @router.post("", response_model=MeetingResponse, status_code=status.HTTP_201_CREATED)
 async def create_meeting(
@@ -61,64 +89,319 @@ async def create_meeting(
     await db.commit()
     await db.refresh(meeting)
     
+    # Arm the auto-join timer
+    scheduler.schedule_meeting(meeting)
+    
     return meeting
 
 
-@router.get("", response_model=MeetingListResponse)
+# Budgets count the user lookup in get_current_user
+@router.post("/bulk", response_model=MeetingBulkResponse, dependencies=[Depends(QueryBudget(queries=3))])
+async def create_meetings_bulk(
+    bulk_data: MeetingBulkCreate,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Create many meetings in one transaction (one multi-row INSERT).
+    Each item is validated and platform-detected on its own; invalid items
+    are reported in `results` by index and the rest are still created.
+    """
+    results: List[MeetingBulkItemResult] = []
+    rows = []
+    row_indexes = []
+
+    for index, item in enumerate(bulk_data.meetings):
+        try:
+            meeting_data = MeetingCreate(**item)
+        except ValidationError as e:
+            errors = "; ".join(
+                f"{'.'.join(str(loc) for loc in err['loc'])}: {err['msg']}" for err in e.errors()
+            )
+            results.append(MeetingBulkItemResult(index=index, created=False, error=errors))
+            continue
+
+        if not platform_detector.is_valid_url(meeting_data.url):
+            results.append(MeetingBulkItemResult(
+                index=index,
+                created=False,
+                error="Invalid meeting URL. Could not detect a supported platform."
+            ))
+            continue
+
+        platform, meeting_code = platform_detector.detect_platform(meeting_data.url)
+        rows.append({
+            "url": meeting_data.url,
+            "platform": platform,
+            "meeting_code": meeting_code,
+            "title": meeting_data.title,
+            "scheduled_time": meeting_data.scheduled_time,
+            "duration_minutes": meeting_data.duration_minutes,
+            "purpose": meeting_data.purpose,
+            "user_id": current_user.id,
+            "status": MeetingStatus.SCHEDULED
+        })
+        row_indexes.append(index)
+
+    if rows:
+        # ORM bulk INSERT ... RETURNING: batched into multi-row VALUES,
+        # rows returned in parameter order so they line up with row_indexes
+        created = (await db.scalars(
+            insert(Meeting).returning(Meeting, sort_by_parameter_order=True),
+            rows
+        )).all()
+        # Bulk INSERT skips Session.flush, so the after_flush NOTIFY never runs
+        await publish_statuses(db, created)
+        await db.commit()
+
+        for index, meeting in zip(row_indexes, created):
+            scheduler.schedule_meeting(meeting)
+            results.append(MeetingBulkItemResult(
+                index=index,
+                created=True,
+                meeting=MeetingResponse.model_validate(meeting)
+            ))
+        print(f"[OK] Bulk created {len(created)} meeting(s) for {current_user.username}")
+
+    results.sort(key=lambda r: r.index)
+    return MeetingBulkResponse(
+        created=len(rows),
+        failed=len(results) - len(rows),
+        results=results
+    )
+
+
+@router.get("", response_model=MeetingListResponse, dependencies=[Depends(QueryBudget(queries=3))])
 async def list_meetings(
     skip: int = 0,
-    limit: int = 100,
+    limit: int = Query(100, ge=1, le=1000),
     status_filter: MeetingStatus = None,
+    cursor: Optional[str] = None,
+    if_none_match: Optional[str] = Header(None),
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ):
     """
-    List all meetings for the current user with optional filtering
+    List all meetings for the current user with optional filtering.
+    Pass the returned next_cursor back as `cursor` to fetch the next page
+    (keyset pagination); skip is still honoured when no cursor is given.
+    Sends a weak ETag; a matching If-None-Match gets 304 Not Modified.
     """
-    # Base query
-    query = select(Meeting).where(Meeting.user_id == current_user.id)
+    filters = [Meeting.user_id == current_user.id]
     
     # Apply status filter if provided
     if status_filter:
-        query = query.where(Meeting.status == status_filter)
+        filters.append(Meeting.status == status_filter)
     
-    # Order by scheduled time (upcoming first, then by created_at)
-    query = query.order_by(
+    # Get total count, and the latest change for the ETag
+    total, last_updated = (await db.execute(
+        select(func.count(), func.max(Meeting.updated_at)).select_from(Meeting).where(and_(*filters))
+    )).one()
+    
+    # Any insert, update or delete in the filtered set moves count or
+    # max(updated_at); the page parameters pick which slice of it this is
+    etag = _weak_etag(
+        current_user.id, total, last_updated,
+        status_filter.value if status_filter else None, cursor, skip if not cursor else None, limit
+    )
+    if _etag_matches(if_none_match, etag):
+        return _not_modified(etag)
+    
+    # Order by scheduled time (unscheduled first, then upcoming), id breaks ties
+    query = select(*LIST_COLUMNS).where(and_(*filters)).order_by(
         Meeting.scheduled_time.asc().nullsfirst(),
-        Meeting.created_at.desc()
+        Meeting.id.asc()
     )
     
-    # Get total count
-    count_query = select(Meeting).where(Meeting.user_id == current_user.id)
-    if status_filter:
-        count_query = count_query.where(Meeting.status == status_filter)
+    # Apply pagination
+    if cursor:
+        query = query.where(_after_cursor(cursor))
+    else:
+        query = query.offset(skip)
     
-    total_result = await db.execute(count_query)
-    total = len(total_result.scalars().all())
+    # One extra row tells us whether there is a next page. Plain rows, no
+    # ORM objects: nothing to hydrate or track in the identity map
+    result = await db.execute(query.limit(limit + 1))
+    meetings = result.mappings().all()
     
-    # Apply pagination
-    query = query.offset(skip).limit(limit)
+    next_cursor = None
+    if len(meetings) > limit:
+        meetings = meetings[:limit]
+        next_cursor = _encode_cursor(meetings[-1])
     
-    result = await db.execute(query)
-    meetings = result.scalars().all()
+    # Rows already have MeetingResponse's shape (LIST_COLUMNS), so they go
+    # straight to orjson instead of being validated model by model
+    response = ORJSONResponse({
+        "meetings": [dict(row) for row in meetings],
+        "total": total,
+        "page": skip // limit + 1 if not cursor else None,
+        "page_size": limit,
+        "next_cursor": next_cursor
+    })
+    _set_etag(response, etag)
+    return response
+
+
+def _weak_etag(*parts) -> str:
+    """Weak validator over the values that determine a response body"""
+    digest = hashlib.sha1("|".join(str(p) for p in parts).encode()).hexdigest()[:20]
+    return f'W/"{digest}"'
+
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """If-None-Match uses weak comparison: W/ prefixes are ignored"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    bare = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == bare for tag in if_none_match.split(","))
+
+
+def _set_etag(response: Response, etag: str):
+    response.headers["ETag"] = etag
+    # Browsers may keep the body but must revalidate (and the body is per user)
+    response.headers["Cache-Control"] = "private, no-cache"
+    response.headers["Vary"] = "Authorization"
+
+
+def _not_modified(etag: str) -> Response:
+    response = Response(status_code=status.HTTP_304_NOT_MODIFIED)
+    _set_etag(response, etag)
+    return response
+
+
+def _encode_cursor(row) -> str:
+    """Opaque keyset cursor: the (scheduled_time, id) of the last row returned"""
+    key = {
+        "t": row["scheduled_time"].isoformat() if row["scheduled_time"] else None,
+        "id": row["id"]
+    }
+    return base64.urlsafe_b64encode(json.dumps(key).encode()).decode().rstrip("=")
+
+
+def _after_cursor(cursor: str):
+    """WHERE clause for rows after the cursor in (scheduled_time NULLS FIRST, id) order"""
+    try:
+        key = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        last_id = str(key["id"])
+        last_time = datetime.fromisoformat(key["t"]) if key["t"] else None
+    except (binascii.Error, ValueError, KeyError, TypeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
+        )
     
-    return MeetingListResponse(
-        meetings=meetings,
-        total=total,
-        page=skip // limit + 1 if limit > 0 else 1,
-        page_size=limit
+    if last_time is None:
+        # Still inside the unscheduled (NULL) block, which sorts first
+        return or_(
+            and_(Meeting.scheduled_time.is_(None), Meeting.id > last_id),
+            Meeting.scheduled_time.isnot(None)
+        )
+    return or_(
+        Meeting.scheduled_time > last_time,
+        and_(Meeting.scheduled_time == last_time, Meeting.id > last_id)
     )
 
 
-@router.get("/{meeting_id}", response_model=MeetingResponse)
+@router.get("/admission")
+async def get_admission_stats(
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Bot slot usage: running bots, queue depth and wait times
+    """
+    return admission_controller.stats()
+
+
+@router.get("/lead-times")
+async def get_lead_times(
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Per-platform pre-launch lead times learned from recent joins
+    """
+    return scheduler.lead_times.stats()
+
+
+@router.get("/join-latency")
+async def get_join_latency(
+    days: int = Query(7, ge=1, le=90),
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Per-platform p50/p95/p99 (seconds) for each join stage, from schedule
+    to admission, over meetings joined in the last `days` days
+    """
+    return {
+        "days": days,
+        "platforms": await join_latency_percentiles(db, days=days)
+    }
+
+
+@router.get("/stream")
+async def stream_meeting_events(
+    token: str = Query(..., description="Access token (EventSource cannot send headers)")
+):
+    """
+    Server-sent events: one `status` event per status change of the
+    caller's meetings, from any API replica. A `resync` event means some
+    changes may have been missed and the client should refetch.
+    """
+    # Own short-lived session: a request-scoped one would hold a pooled
+    # connection for as long as the stream stays open
+    async with AsyncSessionLocal() as db:
+        current_user = await get_current_user(token=token, db=db)
+    user_id = str(current_user.id)
+
+    async def events():
+        queue = meeting_event_broker.subscribe(user_id)
+        try:
+            yield f"retry: {STREAM_RETRY_MS}\n\n"
+            while True:
+                try:
+                    message = await asyncio.wait_for(queue.get(), timeout=STREAM_KEEPALIVE_SECONDS)
+                except asyncio.TimeoutError:
+                    # Comment line: keeps proxies from closing an idle stream
+                    yield ": keepalive\n\n"
+                    continue
+                yield f"event: {message['type']}\ndata: {json.dumps(message)}\n\n"
+        finally:
+            meeting_event_broker.unsubscribe(user_id, queue)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+@router.get("/{meeting_id}", response_model=MeetingResponse, dependencies=[Depends(QueryBudget(queries=3, rows=3))])
 async def get_meeting(
     meeting_id: str,
+    response: Response,
+    if_none_match: Optional[str] = Header(None),
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ):
     """
-    Get a specific meeting by ID
+    Get a specific meeting by ID.
+    Sends a weak ETag; a matching If-None-Match gets 304 Not Modified.
     """
+    if if_none_match:
+        # Revalidation: compare against updated_at alone, before loading the row
+        updated_at = (await db.execute(
+            select(Meeting.updated_at).where(
+                and_(
+                    Meeting.id == meeting_id,
+                    Meeting.user_id == current_user.id
+                )
+            )
+        )).scalar_one_or_none()
+        if updated_at is not None and _etag_matches(if_none_match, _weak_etag(updated_at)):
+            return _not_modified(_weak_etag(updated_at))
+
     result = await db.execute(
         select(Meeting).where(
             and_(
@@ -135,6 +418,7 @@ async def get_meeting(
             detail=f"Meeting with ID {meeting_id} not found"
         )
     
+    _set_etag(response, _weak_etag(meeting.updated_at))
     return meeting
 
 
@@ -170,11 +454,21 @@ async def update_meeting(
     for field, value in update_data.items():
         setattr(meeting, field, value)
     
+    # Rescheduling (or re-activating) a meeting starts a fresh retry budget
+    if "scheduled_time" in update_data or "status" in update_data:
+        meeting.join_attempts = 0
+        meeting.next_attempt_at = None
+    
     meeting.updated_at = datetime.utcnow()
     
     await db.commit()
     await db.refresh(meeting)
     
+    # Move (or drop) the auto-join timer to match the new schedule/status
+    scheduler.schedule_meeting(meeting)
+    if meeting.status == MeetingStatus.CANCELLED:
+        admission_controller.remove(meeting_id)
+    
     return meeting
 
 
@@ -205,6 +499,9 @@ async def delete_meeting(
     
     await db.delete(meeting)
     await db.commit()
+    
+    scheduler.cancel_meeting(meeting_id)
+    admission_controller.remove(meeting_id)
 
 
 @router.post("/{meeting_id}/join")
@@ -233,77 +530,32 @@ async def trigger_join(
             detail=f"Meeting with ID {meeting_id} not found"
         )
     
-    # Update status
-    meeting.status = MeetingStatus.IN_PROGRESS
-    meeting.join_attempted_at = datetime.utcnow()
-    
-    await db.commit()
-    await db.refresh(meeting)
-    
-    # Trigger automation script based on platform
-    import subprocess
-    from pathlib import Path
-    from app.models.meeting import PlatformType
-    
-    backend_dir = Path(__file__).parent.parent.parent.parent.parent
-    
-    # Select script based on platform
-    if meeting.platform == PlatformType.GOOGLE_MEET:
-        script_path = backend_dir / "simple_join.py"
-        print(f"[INFO] Triggering Google Meet automation for: {meeting.url}")
-    elif meeting.platform == PlatformType.ZOOM:
-        script_path = backend_dir / "zoom_join.py"
-        print(f"[INFO] Triggering Zoom automation for: {meeting.url}")
-    elif meeting.platform == PlatformType.MICROSOFT_TEAMS:
-        script_path = backend_dir / "teams_join.py"
-        print(f"[INFO] Triggering Teams automation for: {meeting.url}")
-    else:
+    if not is_supported_platform(meeting.platform):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=f"Automation not supported for platform: {meeting.platform}"
         )
     
+    # Claim first so a scheduler on another instance can't launch it too
+    if not await scheduler.claim_meeting(db, meeting_id):
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Meeting is already being joined by another scheduler instance"
+        )
+    
+    # A manual join starts a fresh retry budget. Finished meetings are
+    # re-joined: back to SCHEDULED, or _start_bot would skip them
+    if meeting.status in (MeetingStatus.COMPLETED, MeetingStatus.CANCELLED):
+        meeting.status = MeetingStatus.SCHEDULED
+        meeting.updated_at = datetime.utcnow()
+    meeting.join_attempts = 0
+    meeting.next_attempt_at = None
+    await db.commit()
+    
+    # Manual join goes through the same admission queue as auto-join
     try:
-        if settings.BOT_MODE == "docker":
-            # ── Docker mode: spin up bot-worker container ──────────────────────
-            # One container per meeting. Auto-destroys on exit (--rm).
-            # Chrome runs inside the container on a virtual display (Xvfb) with
-            # virtual audio (PulseAudio) — reliable cross-platform capture.
-            import os
-            recordings_abs = os.path.abspath(settings.RECORDINGS_PATH)
-            os.makedirs(recordings_abs, exist_ok=True)
-
-            subprocess.Popen([
-                "docker", "run", "--rm",
-                # Pass meeting details as env vars
-                "-e", f"MEETING_URL={meeting.url}",
-                "-e", f"MEETING_ID={meeting_id}",
-                "-e", f"PLATFORM={meeting.platform.value}",
-                "-e", f"API_URL=http://host.docker.internal:8000/api/v1",
-                "-e", f"API_SECRET={settings.INTERNAL_BOT_SECRET}",
-                "-e", "VNC_ENABLED=false",
-                "-e", "RECORD_VIDEO=true",
-                # Mount local recordings folder into container
-                "-v", f"{recordings_abs}:/recordings",
-                # Allow container to reach host machine's backend API
-                "--add-host", "host.docker.internal:host-gateway",
-                # Container name = meeting ID (useful for `docker ps` visibility)
-                "--name", f"meetborg-bot-{meeting_id[:8]}",
-                settings.BOT_WORKER_IMAGE,
-            ])
-            print(f"[OK] Bot-worker container launched for meeting {meeting_id}")
-        else:
-            # ── Local mode: run join script directly (Windows dev default) ─────
-            subprocess.Popen([
-                "python", str(script_path),
-                meeting.url,
-                "--meeting-id", str(meeting_id),
-                "--api-url", "http://localhost:8000/api/v1",
-                "--api-secret", settings.INTERNAL_BOT_SECRET,
-            ])
-            print(f"[OK] Automation script launched: {script_path.name}")
+        launched = await scheduler.request_join(meeting, db)
     except Exception as e:
-
         print(f"[ERROR] Failed to launch automation script: {e}")
         import traceback
         traceback.print_exc()
@@ -312,27 +564,69 @@ async def trigger_join(
             detail=f"Failed to trigger automation: {str(e)}"
         )
     
+    if not launched:
+        return {
+            "message": "All bot slots are busy — join queued",
+            "meeting_id": meeting_id,
+            "url": meeting.url,
+            "platform": meeting.platform,
+            "status": MeetingStatus.QUEUED,
+            "queue_depth": admission_controller.queue_depth
+        }
 
     return {
         "message": "Join triggered successfully",
         "meeting_id": meeting_id,
         "url": meeting.url,
-        "platform": meeting.platform
+        "platform": meeting.platform,
+        "status": MeetingStatus.IN_PROGRESS
     }
 
 
-@router.post("/{meeting_id}/complete", status_code=status.HTTP_204_NO_CONTENT)
-async def complete_meeting(
+@router.get("/{meeting_id}/logs")
+async def get_meeting_bot_logs(
     meeting_id: str,
-    authorization: Optional[str] = Header(None),
+    lines: int = Query(200, ge=1, le=settings.BOT_LOG_TAIL_LINES),
+    current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ):
     """
-    Internal endpoint called by bot scripts when a meeting ends.
-    Auth: Authorization: Bearer {INTERNAL_BOT_SECRET}
-    No user session required.
+    Live tail of the bot's output for a meeting
     """
-    # Validate internal secret
+    result = await db.execute(
+        select(Meeting.id).where(
+            and_(
+                Meeting.id == meeting_id,
+                Meeting.user_id == current_user.id
+            )
+        )
+    )
+    if result.scalar_one_or_none() is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Meeting with ID {meeting_id} not found"
+        )
+    
+    run = bot_supervisor.get_run(meeting_id)
+    if run is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"No bot output captured for meeting {meeting_id}"
+        )
+    
+    return {
+        "meeting_id": meeting_id,
+        "pid": run.pid,
+        "running": run.running,
+        "exit_code": run.exit_code,
+        "started_at": run.started_at,
+        "ended_at": run.ended_at,
+        "lines": run.tail(lines)
+    }
+
+
+def _require_bot_secret(authorization: Optional[str]):
+    """Validate the internal secret bots send as a bearer token"""
     expected = f"Bearer {settings.INTERNAL_BOT_SECRET}"
     if not authorization or authorization != expected:
         raise HTTPException(
@@ -340,6 +634,42 @@ async def complete_meeting(
             detail="Invalid internal secret"
         )
 
+
+async def _claim_bot_event(db: AsyncSession, event_id: Optional[str], meeting_id: str, event: str) -> bool:
+    """
+    Record a bot event ID in the caller's transaction. False means it was
+    already applied (a resend from the bot's outbox) and must be skipped.
+    Events without an ID (older bots) are always applied.
+    """
+    if not event_id:
+        return True
+    claimed = await db.execute(
+        pg_insert(BotEventReceipt)
+        .values(id=event_id, meeting_id=meeting_id, event=event, received_at=datetime.utcnow())
+        .on_conflict_do_nothing(index_elements=[BotEventReceipt.id])
+        .returning(BotEventReceipt.id)
+    )
+    return claimed.scalar_one_or_none() is not None
+
+
+@router.post("/{meeting_id}/complete", status_code=status.HTTP_204_NO_CONTENT)
+async def complete_meeting(
+    meeting_id: str,
+    completion: Optional[BotCompletion] = None,
+    authorization: Optional[str] = Header(None),
+    idempotency_key: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Internal endpoint called by bot scripts when a meeting ends.
+    Auth: Authorization: Bearer {INTERNAL_BOT_SECRET}
+    No user session required.
+
+    Bots send an Idempotency-Key per event and retry until acknowledged;
+    a key that was already applied is acknowledged without changes.
+    """
+    _require_bot_secret(authorization)
+
     result = await db.execute(
         select(Meeting).where(Meeting.id == meeting_id)
     )
@@ -350,13 +680,68 @@ async def complete_meeting(
             detail=f"Meeting {meeting_id} not found"
         )
 
+    if not await _claim_bot_event(db, idempotency_key, meeting_id, "complete"):
+        print(f"[OK] Meeting {meeting_id} completion already applied ({idempotency_key})")
+        return
+
     meeting.status = MeetingStatus.COMPLETED
     meeting.join_successful = "success"
     meeting.updated_at = datetime.utcnow()
+    first_end = meeting.ended_at is None
+    # The bot may deliver this long after the fact (outbox resend): keep its time
+    meeting.ended_at = meeting.ended_at or (completion and completion.at) or meeting.updated_at
     await db.commit()
+    if first_end:
+        observe_stages(meeting, "ended_at")
+    admission_controller.release(meeting_id)
     print(f"[OK] Meeting {meeting_id} marked COMPLETED by bot")
 
 
+@router.post("/{meeting_id}/events", status_code=status.HTTP_204_NO_CONTENT)
+async def record_bot_event(
+    meeting_id: str,
+    event: BotEventCreate,
+    authorization: Optional[str] = Header(None),
+    idempotency_key: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Internal endpoint called by bot scripts at join milestones
+    (browser ready, lobby reached, admitted). Feeds the adaptive join
+    lead time and the join latency metrics.
+    Auth: Authorization: Bearer {INTERNAL_BOT_SECRET}
+    Resends carrying an already-applied Idempotency-Key are ignored.
+    """
+    _require_bot_secret(authorization)
+
+    result = await db.execute(
+        select(Meeting).where(Meeting.id == meeting_id)
+    )
+    meeting = result.scalar_one_or_none()
+    if not meeting:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Meeting {meeting_id} not found"
+        )
+
+    if not await _claim_bot_event(db, idempotency_key, meeting_id, event.event.value):
+        return
+
+    at = event.at or datetime.utcnow()
+    field = {
+        BotEventType.BROWSER_READY: "browser_ready_at",
+        BotEventType.LOBBY_REACHED: "lobby_reached_at",
+        BotEventType.ADMITTED: "admitted_at",
+    }[event.event]
+    # First report wins — bots may repeat a milestone
+    if getattr(meeting, field) is None:
+        setattr(meeting, field, at)
+        await db.commit()
+        observe_stages(meeting, field)
+    elif idempotency_key:
+        await db.commit()  # Keep the receipt
+
+
 @router.post("/detect-platform", response_model=PlatformDetectionResponse)
 async def detect_platform(url: str):
     """
@@ -51,6 +51,23 @@ class Settings(BaseSettings):
     # 'docker' → spin up bot-worker container per meeting (production, audio capture)
     BOT_MODE: str = "local"
     BOT_WORKER_IMAGE: str = "meetborg/bot-worker:latest"
+    # Docker Engine API endpoint for docker mode (unix:///... or tcp://host:port;
+    # on Docker Desktop for Windows expose the daemon on tcp://localhost:2375)
+    DOCKER_HOST: str = "unix:///var/run/docker.sock"
+    # Bot output capture: each bot writes to <BOT_LOG_DIR>/<meeting_id>.log
+    # (so it survives API restarts); the last N lines are kept in memory per
+    # meeting for the live tail
+    BOT_LOG_TAIL_LINES: int = 500
+    BOT_LOG_DIR: str = "./bot_logs"
+    # host:port of a running browser_pool.py (local mode only); bots lease a
+    # warm Chrome from it instead of cold-launching one
+    BOT_BROWSER_POOL_ADDR: Optional[str] = None
+    # Bots record every monitor tick to <recording dir>/monitor_ticks.jsonl.gz
+    # for the end-detection replay corpus (replay_monitor.py)
+    BOT_RECORD_MONITOR: bool = False
+    # Local .ics feeds must live under <this directory>/<owner's user id>
+    # (http(s) feeds are fetched)
+    CALENDAR_FILE_DIR: str = "./calendars"
 
     
     # Session Security
@@ -72,6 +89,13 @@ class Settings(BaseSettings):
     # JWT
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60 * 24  # 24 hours
     ALGORITHM: str = "HS256"
+    # Password hashing: bcrypt work factor (changing it rehashes on next login)
+    # and the size of the thread pool hashes run on
+    BCRYPT_ROUNDS: int = 12
+    PASSWORD_HASH_WORKERS: int = 2
+    # Resolved users cached by get_current_user (per process)
+    USER_CACHE_TTL_SECONDS: int = 60
+    USER_CACHE_MAX_ENTRIES: int = 1024
     
     # OAuth Configuration
     GOOGLE_CLIENT_ID: Optional[str] = None
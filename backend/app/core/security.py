@@ -2,27 +2,99 @@
 Security Utilities
 Password hashing, JWT token generation and validation
 """
+import asyncio
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Optional, Tuple
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import event
 
 from app.core.config import settings
 from app.schemas.token import TokenData
 from app.models.user import User
 from app.db.session import get_db
 
-# Password hashing context
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Password hashing context. Min/max pin the work factor, so hashes made
+# with any other BCRYPT_ROUNDS are flagged for rehash on the next login.
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__default_rounds=settings.BCRYPT_ROUNDS,
+    bcrypt__min_rounds=settings.BCRYPT_ROUNDS,
+    bcrypt__max_rounds=settings.BCRYPT_ROUNDS,
+)
+
+# bcrypt is deliberately slow (~250 ms at 12 rounds) and releases the GIL,
+# so it runs on its own small pool instead of blocking the event loop.
+# The pool size caps how many hashes run at once; the rest wait in line.
+_hash_executor = ThreadPoolExecutor(
+    max_workers=settings.PASSWORD_HASH_WORKERS,
+    thread_name_prefix="bcrypt",
+)
 
 # OAuth2 scheme for token extraction
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/login")
 
 
+class UserCache:
+    """
+    TTL-bounded LRU of resolved users, keyed by user_id.
+    Holds detached User instances; callers merge them into their session.
+    """
+
+    def __init__(self, ttl_seconds: float, max_entries: int):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[float, User]]" = OrderedDict()
+
+    def get(self, user_id: str) -> Optional[User]:
+        entry = self._entries.get(user_id)
+        if entry is None:
+            return None
+        expires_at, user = entry
+        if expires_at < time.monotonic():
+            del self._entries[user_id]
+            return None
+        self._entries.move_to_end(user_id)
+        return user
+
+    def put(self, user_id: str, user: User):
+        self._entries[user_id] = (time.monotonic() + self.ttl_seconds, user)
+        self._entries.move_to_end(user_id)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, user_id: str):
+        self._entries.pop(user_id, None)
+
+
+# Global instance
+user_cache = UserCache(settings.USER_CACHE_TTL_SECONDS, settings.USER_CACHE_MAX_ENTRIES)
+
+
+def invalidate_cached_user(user_id) -> None:
+    """
+    Drop a user from the auth cache. Call after changing a user outside the
+    ORM (Core UPDATE, raw SQL); ORM updates and deletes invalidate automatically.
+    Other worker processes pick the change up within USER_CACHE_TTL_SECONDS.
+    """
+    user_cache.invalidate(str(user_id))
+
+
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _invalidate_on_change(mapper, connection, target):
+    # Deactivation, superuser or username changes must not be served stale
+    invalidate_cached_user(target.id)
+
+
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """
     Verify a plain password against a hashed password
@@ -37,6 +109,28 @@ def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
 
+async def hash_password(password: str) -> str:
+    """
+    Hash a password on the bcrypt pool (use from async handlers)
+    """
+    loop = asyncio.get_event_loop()
+    return await loop.run_in_executor(_hash_executor, pwd_context.hash, password)
+
+
+async def verify_and_update_password(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    """
+    Verify a password on the bcrypt pool (use from async handlers)
+    
+    Returns:
+        (valid, new_hash) — new_hash is set when the stored hash uses an old
+        work factor or scheme and should be replaced
+    """
+    loop = asyncio.get_event_loop()
+    return await loop.run_in_executor(
+        _hash_executor, pwd_context.verify_and_update, plain_password, hashed_password
+    )
+
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     """
     Create a JWT access token
@@ -91,15 +185,22 @@ async def get_current_user(
     except JWTError:
         raise credentials_exception
     
-    # Get user from database
-    result = await db.execute(
-        select(User).where(User.username == token_data.username)
-    )
-    user = result.scalar_one_or_none()
-    
-    if user is None:
+    # Resolve the user: cache first, primary-key lookup on a miss
+    try:
+        user_key = str(uuid.UUID(token_data.user_id))
+    except ValueError:
         raise credentials_exception
     
+    cached = user_cache.get(user_key)
+    if cached is not None:
+        # Attach a copy to this request's session without hitting the DB
+        user = await db.merge(cached, load=False)
+    else:
+        user = await db.get(User, uuid.UUID(user_key))
+        if user is None:
+            raise credentials_exception
+        user_cache.put(user_key, user)
+    
     if not user.is_active:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
@@ -0,0 +1,167 @@
+"""
+Query Instrumentation
+Counts SQL statements, rows fetched and time spent in the database per
+request, via engine cursor events and a context variable. Surfaced as a
+Server-Timing header and a debug log line; routes can declare a query/row
+budget that is logged when exceeded and enforced under test.
+
+Usage on a route:
+    @router.get("/...", dependencies=[Depends(QueryBudget(queries=3))])
+"""
+import logging
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import List, Optional, Union
+
+from fastapi import Request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+logger = logging.getLogger(__name__)
+
+
+class QueryBudgetExceeded(AssertionError):
+    """A request or block ran more queries/rows than it declared"""
+
+
+class QueryStats:
+    """Counters for one request (or one query_budget block)"""
+
+    def __init__(self, label: str = ""):
+        self.label = label
+        self.queries = 0
+        self.rows = 0
+        self.db_seconds = 0.0
+        self.statements: List[str] = []
+        self.max_queries: Optional[int] = None
+        self.max_rows: Optional[int] = None
+
+    def record(self, statement: str, rows: int, seconds: float):
+        self.queries += 1
+        self.rows += rows
+        self.db_seconds += seconds
+        self.statements.append(statement)
+
+    def violation(self) -> Optional[str]:
+        """Description of the exceeded budget, or None if within it."""
+        problems = []
+        if self.max_queries is not None and self.queries > self.max_queries:
+            problems.append(f"{self.queries} queries > budget {self.max_queries}")
+        if self.max_rows is not None and self.rows > self.max_rows:
+            problems.append(f"{self.rows} rows > budget {self.max_rows}")
+        if not problems:
+            return None
+        statements = "\n".join(f"  {i + 1}. {s[:200]}" for i, s in enumerate(self.statements))
+        return f"{self.label}: {', '.join(problems)}\n{statements}"
+
+    def server_timing(self) -> str:
+        return (
+            f'db;dur={self.db_seconds * 1000:.1f};'
+            f'desc="{self.queries} queries, {self.rows} rows"'
+        )
+
+
+_current: ContextVar[Optional[QueryStats]] = ContextVar("query_stats", default=None)
+
+# When set (under test), budget violations are collected here instead of only logged
+_violations: Optional[List[str]] = None
+
+
+def current_stats() -> Optional[QueryStats]:
+    return _current.get()
+
+
+def install(engine: Union[AsyncEngine, Engine]):
+    """Attach the counting hooks to an engine (async, or a plain sync one)."""
+    sync_engine = getattr(engine, "sync_engine", engine)
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        started = conn.info["query_started"].pop()
+        stats = _current.get()
+        if stats is None:
+            return
+        # asyncpg's adapter buffers the whole result before this fires
+        buffered = getattr(cursor, "_rows", None)
+        rows = len(buffered) if buffered is not None else max(cursor.rowcount, 0)
+        stats.record(statement, rows, time.perf_counter() - started)
+
+    @event.listens_for(sync_engine, "handle_error")
+    def _on_error(context):
+        # A failed statement never reaches after_cursor_execute: drop its
+        # start time so it doesn't linger on the pooled connection
+        if context.connection is not None:
+            context.connection.info.pop("query_started", None)
+
+
+class QueryBudget:
+    """Route dependency declaring the most queries/rows a request may use"""
+
+    def __init__(self, queries: Optional[int] = None, rows: Optional[int] = None):
+        self.queries = queries
+        self.rows = rows
+
+    def __call__(self):
+        stats = _current.get()
+        if stats is not None:
+            stats.max_queries = self.queries
+            stats.max_rows = self.rows
+
+
+@contextmanager
+def query_budget(queries: Optional[int] = None, rows: Optional[int] = None, label: str = "block"):
+    """
+    Count the queries run inside the block and raise QueryBudgetExceeded if
+    it goes over. Nests inside a request: the outer counters are restored.
+    """
+    stats = QueryStats(label)
+    stats.max_queries = queries
+    stats.max_rows = rows
+    token = _current.set(stats)
+    try:
+        yield stats
+    finally:
+        _current.reset(token)
+    problem = stats.violation()
+    if problem:
+        raise QueryBudgetExceeded(problem)
+
+
+@contextmanager
+def collect_violations():
+    """Collect request budget violations (for the pytest fixture)."""
+    global _violations
+    previous, _violations = _violations, []
+    try:
+        yield _violations
+    finally:
+        _violations = previous
+
+
+async def query_stats_middleware(request: Request, call_next):
+    """Per-request counters → Server-Timing header, debug log, budget check."""
+    stats = QueryStats(f"{request.method} {request.url.path}")
+    token = _current.set(stats)
+    try:
+        response = await call_next(request)
+    finally:
+        _current.reset(token)
+
+    response.headers["Server-Timing"] = stats.server_timing()
+    logger.debug(
+        f"{stats.label}: {stats.queries} queries, {stats.rows} rows, "
+        f"{stats.db_seconds * 1000:.1f} ms in DB"
+    )
+
+    problem = stats.violation()
+    if problem:
+        logger.warning(f"Query budget exceeded — {problem}")
+        if _violations is not None:
+            _violations.append(problem)
+    return response
@@ -0,0 +1,29 @@
+"""
+Pytest Plugin — Query Budgets
+Enable in a conftest.py with:
+    pytest_plugins = ["app.db.pytest_plugin"]
+
+Every test then fails if a request it makes goes over the budget declared
+on its route (QueryBudget), and can assert budgets on arbitrary code:
+    def test_x(query_budget):
+        with query_budget(queries=2):
+            ...
+"""
+import pytest
+
+from app.db.instrumentation import collect_violations, query_budget as _query_budget
+
+
+@pytest.fixture
+def query_budget():
+    """The query_budget context manager (raises QueryBudgetExceeded)"""
+    return _query_budget
+
+
+@pytest.fixture(autouse=True)
+def enforce_query_budgets():
+    """Fail the test if any request it made exceeded its route's budget"""
+    with collect_violations() as violations:
+        yield
+    if violations:
+        pytest.fail("Query budget exceeded:\n" + "\n\n".join(violations))
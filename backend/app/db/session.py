@@ -4,6 +4,7 @@ SQLAlchemy async engine and session factory
 """
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
 from app.core.config import settings
+from app.db import instrumentation
 
 # Create async engine
 engine = create_async_engine(
@@ -14,6 +15,9 @@ engine = create_async_engine(
     max_overflow=20
 )
 
+# Per-request query/row/time counters (Server-Timing, query budgets)
+instrumentation.install(engine)
+
 # Create async session factory
 AsyncSessionLocal = async_sessionmaker(
     engine,
@@ -6,14 +6,19 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 from contextlib import asynccontextmanager
+from prometheus_client import make_asgi_app
 
 from app.core.config import settings
 from app.api.v1.api import api_router
 from app.db.session import engine
 from app.db.base import Base
+from app.db.instrumentation import query_stats_middleware
 from app.services.scheduler import scheduler
+from app.services.docker_engine import docker_engine
+from app.services.meeting_events import meeting_event_broker
+from app.services.calendar_ingest import calendar_ingestor
 # Import models so Base.metadata registers all tables BEFORE create_all runs
-from app.models import User, Platform, Meeting  # noqa: F401
+from app.models import User, Platform, Meeting, BotRun, CalendarSource  # noqa: F401
 
 
 
@@ -38,6 +43,9 @@ async def lifespan(app: FastAPI):
     # Start scheduler
     scheduler.start()
     print("⏰ Auto-join scheduler started")
+
+    # Status changes from every replica, pushed to dashboard streams
+    meeting_event_broker.start()
     
     yield
     
@@ -45,6 +53,9 @@ async def lifespan(app: FastAPI):
     print("🛑 Shutting down AI Meeting Automation System...")
     scheduler.stop()
     print("zzz Scheduler stopped")
+    await meeting_event_broker.stop()
+    await docker_engine.close()
+    await calendar_ingestor.close()
 
 
 # Create FastAPI application
@@ -66,9 +77,15 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Per-request DB query counts and time (Server-Timing header)
+app.middleware("http")(query_stats_middleware)
+
 # Include API router
 app.include_router(api_router, prefix="/api/v1")
 
+# Prometheus scrape endpoint (join latency histograms; per worker process)
+app.mount("/metrics", make_asgi_app())
+
 
 @app.get("/")
 async def root():
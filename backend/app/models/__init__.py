@@ -1,3 +1,6 @@
 from app.models.user import User
 from app.models.platform import Platform
 from app.models.meeting import Meeting
+from app.models.bot_run import BotRun
+from app.models.calendar_source import CalendarSource
+from app.models.bot_event_receipt import BotEventReceipt
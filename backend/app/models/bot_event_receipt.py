@@ -0,0 +1,22 @@
+"""
+Bot Event Receipt Model
+The IDs of bot→backend events already applied, so a bot replaying its
+outbox after a lost response cannot apply the same event twice
+"""
+from sqlalchemy import Column, String, DateTime, ForeignKey
+from datetime import datetime
+from app.db.base import Base
+
+
+class BotEventReceipt(Base):
+    """One applied bot event, keyed by the bot-generated event ID"""
+
+    __tablename__ = "bot_event_receipts"
+
+    id = Column(String, primary_key=True)  # Idempotency-Key sent by the bot
+    meeting_id = Column(String, ForeignKey("meetings.id", ondelete="CASCADE"), nullable=False, index=True)
+    event = Column(String, nullable=False)  # "complete", or a BotEventType value
+    received_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+    def __repr__(self):
+        return f"<BotEventReceipt(id={self.id}, meeting_id={self.meeting_id}, event={self.event})>"
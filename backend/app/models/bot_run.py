@@ -0,0 +1,49 @@
+"""
+Bot Run Model
+One row per bot process/container launched for a meeting, so the API can
+find its bots again after a restart
+"""
+from sqlalchemy import Column, String, Integer, DateTime, ForeignKey, Index, text
+from datetime import datetime
+import enum
+from app.db.base import Base
+import uuid
+
+
+class BotRunStatus(str, enum.Enum):
+    """Bot run lifecycle status"""
+    RUNNING = "running"
+    EXITED = "exited"  # Reaped; exit_code is set if it was known
+    LOST = "lost"      # Owner went away and the run could not be re-attached
+
+
+class BotRun(Base):
+    """A launched bot: where it runs, and when it was last seen alive"""
+    
+    __tablename__ = "bot_runs"
+    __table_args__ = (
+        # Open runs, scanned by every reconcile and the orphan check
+        Index("ix_bot_runs_open", "meeting_id", postgresql_where=text("ended_at IS NULL")),
+    )
+    
+    id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
+    meeting_id = Column(String, ForeignKey("meetings.id", ondelete="CASCADE"), nullable=False, index=True)
+    
+    # Where the bot lives
+    host = Column(String, nullable=False)             # Hostname of the API that launched it
+    supervisor_pid = Column(Integer, nullable=True)   # PID of the API process supervising it
+    pid = Column(Integer, nullable=True)              # Local bot / docker CLI process
+    container_name = Column(String, nullable=True)    # Docker mode
+    log_path = Column(String, nullable=True)
+    
+    # Lifecycle
+    attempt = Column(Integer, default=1, nullable=False)  # Meeting.join_attempts at launch
+    status = Column(String, default=BotRunStatus.RUNNING.value, nullable=False)
+    started_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    last_heartbeat_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    ended_at = Column(DateTime, nullable=True)
+    exit_code = Column(Integer, nullable=True)
+    failure_reason = Column(String, nullable=True)
+    
+    def __repr__(self):
+        return f"<BotRun(id={self.id}, meeting_id={self.meeting_id}, host={self.host}, pid={self.pid}, status={self.status})>"
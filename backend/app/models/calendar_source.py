@@ -0,0 +1,39 @@
+"""
+Calendar Source Model
+An ICS feed (URL or local file) that meetings are ingested from, with the
+validators and sync state that make an unchanged feed cheap to re-check
+"""
+from sqlalchemy import Column, String, Integer, DateTime, ForeignKey
+from sqlalchemy.dialects.postgresql import UUID
+from datetime import datetime
+from app.db.base import Base
+import uuid
+
+
+class CalendarSource(Base):
+    """An ICS calendar feed owned by a user"""
+
+    __tablename__ = "calendar_sources"
+
+    id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
+    name = Column(String, nullable=False)
+    url = Column(String, nullable=False)  # http(s):// feed, or a local file path
+
+    # Validators from the last fetch: HTTP ETag/Last-Modified, or the file's
+    # mtime/size for local feeds. A match means the feed was not re-read.
+    etag = Column(String, nullable=True)
+    last_modified = Column(String, nullable=True)
+
+    # Sync state
+    next_sync_at = Column(DateTime, default=datetime.utcnow, nullable=False)  # Due for the periodic sync
+    last_synced_at = Column(DateTime, nullable=True)
+    last_changed_at = Column(DateTime, nullable=True)  # Last sync that actually changed meetings
+    last_error = Column(String, nullable=True)
+    event_count = Column(Integer, default=0, nullable=False)  # VEVENTs seen in the last full read
+
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+
+    def __repr__(self):
+        return f"<CalendarSource(id={self.id}, name={self.name}, url={self.url})>"
@@ -2,7 +2,7 @@
 Meeting Model
 Stores meeting information with auto-detected platform
 """
-from sqlalchemy import Column, String, Integer, DateTime, Text, ForeignKey, Enum as SQLEnum
+from sqlalchemy import Column, String, Integer, DateTime, Text, ForeignKey, Index, Enum as SQLEnum, text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from datetime import datetime
@@ -24,6 +24,7 @@ class PlatformType(str, enum.Enum):
 class MeetingStatus(str, enum.Enum):
     """Meeting lifecycle status"""
     SCHEDULED = "scheduled"
+    QUEUED = "queued"  # due, waiting for a free bot slot
     IN_PROGRESS = "in_progress"
     COMPLETED = "completed"
     CANCELLED = "cancelled"
@@ -34,6 +35,29 @@ class Meeting(Base):
     """Meeting model with URL, platform detection, and scheduling"""
     
     __tablename__ = "meetings"
+    __table_args__ = (
+        # Per-user list filtered by status, ordered by scheduled_time
+        Index("ix_meetings_user_status_scheduled", "user_id", "status", "scheduled_time"),
+        # Unfiltered per-user list: matches its ORDER BY scheduled_time
+        # NULLS FIRST, id so keyset pages are index range scans
+        Index("ix_meetings_user_scheduled_id", "user_id", text("scheduled_time NULLS FIRST"), "id"),
+        # One meeting per calendar event; the upsert key for ICS ingestion
+        Index("ux_meetings_calendar_event", "calendar_source_id", "external_uid", unique=True),
+        # Scheduler hot paths, partial so they only hold the few live rows
+        # rather than every completed/failed meeting (SQLEnum stores names)
+        Index(
+            "ix_meetings_due", "scheduled_time",
+            postgresql_where=text("status IN ('SCHEDULED', 'QUEUED')")
+        ),
+        Index(
+            "ix_meetings_retry_due", "next_attempt_at",
+            postgresql_where=text("next_attempt_at IS NOT NULL")
+        ),
+        Index(
+            "ix_meetings_in_progress", "join_attempted_at",
+            postgresql_where=text("status = 'IN_PROGRESS'")
+        ),
+    )
     
     # Primary key
     id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
@@ -63,6 +87,27 @@ class Meeting(Base):
     # Join tracking
     join_attempted_at = Column(DateTime, nullable=True)
     join_successful = Column(String, nullable=True)  # Success/failure reason
+    join_attempts = Column(Integer, default=0, nullable=False)  # Launches so far (retry budget)
+    next_attempt_at = Column(DateTime, nullable=True)  # Backoff: not due again before this
+
+    # Join timeline reported by the scheduler (claim/start/end) and the bot
+    # (browser ready/lobby/admitted)
+    claimed_at = Column(DateTime, nullable=True)
+    bot_started_at = Column(DateTime, nullable=True)
+    browser_ready_at = Column(DateTime, nullable=True)
+    lobby_reached_at = Column(DateTime, nullable=True)
+    admitted_at = Column(DateTime, nullable=True)
+    ended_at = Column(DateTime, nullable=True)
+
+    # Scheduler claim (which instance owns launching this meeting, and until when)
+    claimed_by = Column(String, nullable=True)
+    claim_expires_at = Column(DateTime, nullable=True)
+
+    # Calendar ingestion: which feed/event this came from, and a hash of the
+    # event's content so unchanged events are skipped on re-sync
+    calendar_source_id = Column(String, ForeignKey("calendar_sources.id", ondelete="SET NULL"), nullable=True)
+    external_uid = Column(String, nullable=True)  # VEVENT UID (+ RECURRENCE-ID)
+    source_hash = Column(String(64), nullable=True)
 
     # Recording (populated after meeting ends)
     recording_path = Column(String, nullable=True)  # path to screen.mkv
@@ -0,0 +1,50 @@
+"""
+Pydantic Schemas for Calendar Sources
+Request and response models for ICS feed ingestion
+"""
+from pydantic import BaseModel, Field, validator
+from datetime import datetime
+from typing import Optional
+from uuid import UUID
+
+
+class CalendarSourceCreate(BaseModel):
+    """Schema for adding an ICS feed"""
+    name: str = Field(..., min_length=1, max_length=200, description="Display name")
+    url: str = Field(..., description="http(s) feed URL, or a file under CALENDAR_FILE_DIR/<your user id>")
+
+    @validator('url')
+    def validate_url(cls, v):
+        """Strip whitespace; webcal:// is plain HTTPS"""
+        v = v.strip()
+        if not v:
+            raise ValueError('URL cannot be empty')
+        if v.startswith('webcal://'):
+            v = 'https://' + v[len('webcal://'):]
+        return v
+
+
+class CalendarSourceResponse(BaseModel):
+    """Schema for calendar source response"""
+    id: str
+    user_id: UUID
+    name: str
+    url: str
+    next_sync_at: datetime
+    last_synced_at: Optional[datetime]
+    last_changed_at: Optional[datetime]
+    last_error: Optional[str]
+    event_count: int
+    created_at: datetime
+
+    class Config:
+        from_attributes = True
+
+
+class CalendarSyncResponse(BaseModel):
+    """Outcome of one sync"""
+    unchanged: bool  # Feed validators matched: nothing was re-read
+    events: int
+    created: int
+    updated: int
+    cancelled: int
@@ -3,8 +3,9 @@ Meeting Schemas - Pydantic models for API request/response
 """
 from pydantic import BaseModel, Field, HttpUrl, validator
 from datetime import datetime, timezone
-from typing import Optional
+from typing import Any, Dict, Optional
 from uuid import UUID
+import enum
 from app.models.meeting import PlatformType, MeetingStatus
 
 
@@ -51,6 +52,38 @@ class MeetingUpdate(BaseModel):
         return v.astimezone(timezone.utc).replace(tzinfo=None) if v else None
 
 
+class BotEventType(str, enum.Enum):
+    """Join milestones reported by the bot"""
+    BROWSER_READY = "browser_ready"
+    LOBBY_REACHED = "lobby_reached"
+    ADMITTED = "admitted"
+
+
+class BotEventCreate(BaseModel):
+    """Schema for a bot lifecycle event (internal)"""
+    event: BotEventType
+    at: Optional[datetime] = Field(None, description="When it happened (defaults to receipt time)")
+    
+    @validator('at')
+    def normalize_at(cls, v):
+        """Store as naive UTC like every other meeting timestamp"""
+        if v and v.tzinfo:
+            return v.astimezone(timezone.utc).replace(tzinfo=None)
+        return v
+
+
+class BotCompletion(BaseModel):
+    """Schema for a bot's meeting-ended report (internal)"""
+    at: Optional[datetime] = Field(None, description="When the meeting ended (defaults to receipt time)")
+
+    @validator('at')
+    def normalize_at(cls, v):
+        """Store as naive UTC like every other meeting timestamp"""
+        if v and v.tzinfo:
+            return v.astimezone(timezone.utc).replace(tzinfo=None)
+        return v
+
+
 # Response schemas
 class MeetingResponse(BaseModel):
     """Schema for meeting response"""
@@ -68,6 +101,15 @@ class MeetingResponse(BaseModel):
     updated_at: datetime
     join_attempted_at: Optional[datetime]
     join_successful: Optional[str]
+    join_attempts: int = 0
+    next_attempt_at: Optional[datetime] = None
+    claimed_at: Optional[datetime] = None
+    bot_started_at: Optional[datetime] = None
+    browser_ready_at: Optional[datetime] = None
+    lobby_reached_at: Optional[datetime] = None
+    admitted_at: Optional[datetime] = None
+    ended_at: Optional[datetime] = None
+    calendar_source_id: Optional[str] = None  # Set for meetings ingested from a calendar
     recording_path: Optional[str] = None
     audio_path: Optional[str] = None
     
@@ -79,8 +121,34 @@ class MeetingListResponse(BaseModel):
     """Schema for list of meetings"""
     meetings: list[MeetingResponse]
     total: int
-    page: int
+    page: Optional[int] = None  # Offset paging only
     page_size: int
+    next_cursor: Optional[str] = None  # Pass as ?cursor= for the next page
+
+
+MAX_BULK_MEETINGS = 500
+
+
+class MeetingBulkCreate(BaseModel):
+    """Schema for creating many meetings at once"""
+    # Items are validated one by one (as MeetingCreate) so a bad item is
+    # reported in its result instead of rejecting the whole batch
+    meetings: list[Dict[str, Any]] = Field(..., min_length=1, max_length=MAX_BULK_MEETINGS)
+
+
+class MeetingBulkItemResult(BaseModel):
+    """Outcome for one item of a bulk create, by its index in the request"""
+    index: int
+    created: bool
+    meeting: Optional[MeetingResponse] = None
+    error: Optional[str] = None
+
+
+class MeetingBulkResponse(BaseModel):
+    """Schema for bulk create response"""
+    created: int
+    failed: int
+    results: list[MeetingBulkItemResult]
 
 
 class PlatformDetectionResponse(BaseModel):
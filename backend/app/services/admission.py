@@ -0,0 +1,138 @@
+"""
+Bot Admission Controller
+Caps the number of concurrently running bots at settings.MAX_CONCURRENT_BOTS.
+Joins beyond the cap wait in a priority queue ordered by scheduled_time and
+are admitted as running bots release their slots.
+"""
+import asyncio
+import heapq
+import itertools
+import logging
+import time
+from datetime import datetime
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Starts the bot for a meeting; receives the meeting ID
+LaunchFn = Callable[[str], Awaitable[None]]
+
+
+class AdmissionController:
+    """Bounded bot slots with a scheduled_time-ordered wait queue"""
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self._running: Dict[str, float] = {}  # meeting_id: admitted at (monotonic)
+        # Heap of (scheduled_time, seq, meeting_id); seq keeps FIFO order on ties
+        self._queue: List[Tuple[datetime, int, str]] = []
+        self._waiting: Dict[str, Tuple[float, LaunchFn]] = {}  # meeting_id: (enqueued at, launch)
+        self._seq = itertools.count()
+        self._admitted_total = 0
+        self._wait_seconds_total = 0.0
+
+    @property
+    def queue_depth(self) -> int:
+        return len(self._waiting)
+
+    def is_tracked(self, meeting_id: str) -> bool:
+        """True if the meeting is running or waiting for a slot"""
+        return meeting_id in self._running or meeting_id in self._waiting
+
+    async def request(
+        self,
+        meeting_id: str,
+        scheduled_time: Optional[datetime],
+        launch: LaunchFn,
+    ) -> bool:
+        """
+        Ask for a bot slot.
+
+        If a slot is free the bot is launched before returning and True is
+        returned; launch errors release the slot and propagate to the caller.
+        Otherwise the meeting is queued and False is returned — the caller is
+        responsible for marking it QUEUED.
+        """
+        if self.is_tracked(meeting_id):
+            return meeting_id in self._running
+
+        if len(self._running) < self.capacity:
+            self._running[meeting_id] = time.monotonic()
+            self._record_admission(0.0)
+            try:
+                await launch(meeting_id)
+            except Exception:
+                self.release(meeting_id)
+                raise
+            return True
+
+        self._waiting[meeting_id] = (time.monotonic(), launch)
+        heapq.heappush(self._queue, (scheduled_time or datetime.utcnow(), next(self._seq), meeting_id))
+        logger.info(
+            f"Bot slots full ({len(self._running)}/{self.capacity}) — "
+            f"queued meeting {meeting_id} (depth {self.queue_depth})"
+        )
+        return False
+
+    def release(self, meeting_id: str):
+        """Free the slot held by a meeting (idempotent) and admit waiters."""
+        if self._running.pop(meeting_id, None) is not None:
+            logger.info(f"Bot slot released by meeting {meeting_id}")
+        self._admit_waiting()
+
+    def adopt(self, meeting_id: str):
+        """
+        Count an already-running bot (re-attached after a restart) against
+        capacity. It may briefly push running above capacity; new launches
+        wait until it releases.
+        """
+        self._waiting.pop(meeting_id, None)
+        self._running.setdefault(meeting_id, time.monotonic())
+
+    def remove(self, meeting_id: str):
+        """Drop a meeting from the wait queue (e.g. deleted or cancelled)."""
+        self._waiting.pop(meeting_id, None)
+
+    def _admit_waiting(self):
+        while self._queue and len(self._running) < self.capacity:
+            _, _, meeting_id = heapq.heappop(self._queue)
+            entry = self._waiting.pop(meeting_id, None)
+            if entry is None:
+                continue  # removed while waiting
+            enqueued_at, launch = entry
+            self._running[meeting_id] = time.monotonic()
+            self._record_admission(time.monotonic() - enqueued_at)
+            asyncio.get_event_loop().create_task(self._launch_admitted(meeting_id, launch))
+
+    async def _launch_admitted(self, meeting_id: str, launch: LaunchFn):
+        try:
+            await launch(meeting_id)
+        except Exception as e:
+            logger.error(f"Queued launch failed for meeting {meeting_id}: {e}")
+            self.release(meeting_id)
+
+    def _record_admission(self, waited: float):
+        self._admitted_total += 1
+        self._wait_seconds_total += waited
+
+    def stats(self) -> dict:
+        """Snapshot of slot usage, queue depth and wait times"""
+        now = time.monotonic()
+        waits = [now - enqueued_at for enqueued_at, _ in self._waiting.values()]
+        return {
+            "capacity": self.capacity,
+            "running": len(self._running),
+            "queue_depth": self.queue_depth,
+            "oldest_wait_seconds": round(max(waits), 1) if waits else 0.0,
+            "admitted_total": self._admitted_total,
+            "avg_wait_seconds": (
+                round(self._wait_seconds_total / self._admitted_total, 1)
+                if self._admitted_total else 0.0
+            ),
+        }
+
+
+# Global instance
+admission_controller = AdmissionController(settings.MAX_CONCURRENT_BOTS)
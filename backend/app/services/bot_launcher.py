@@ -0,0 +1,149 @@
+"""
+Bot Launcher
+Builds and starts the join bot process for a meeting.
+Shared by the auto-join scheduler and the manual join endpoint.
+"""
+import os
+import sys
+from pathlib import Path
+from typing import List
+
+from app.core.config import settings
+from app.models.meeting import Meeting, PlatformType
+from app.services.bot_supervisor import SupervisedBot, bot_supervisor
+
+# backend/ — where the join scripts live
+BACKEND_DIR = Path(__file__).parent.parent.parent
+
+BOT_SCRIPTS = {
+    PlatformType.GOOGLE_MEET: "simple_join.py",
+    PlatformType.ZOOM: "zoom_join.py",
+    PlatformType.MICROSOFT_TEAMS: "teams_join.py",
+}
+
+
+def is_supported_platform(platform: PlatformType) -> bool:
+    """True if a join bot exists for this platform"""
+    return platform in BOT_SCRIPTS
+
+
+def container_name(meeting_id: str) -> str:
+    return f"meetborg-bot-{meeting_id[:8]}"
+
+
+def schedule_args(meeting: Meeting) -> List[str]:
+    """--scheduled-time/--duration-minutes, so the bot's monitor can pace itself around the end"""
+    argv = []
+    if meeting.scheduled_time:
+        argv += ["--scheduled-time", meeting.scheduled_time.isoformat()]
+    if meeting.duration_minutes:
+        argv += ["--duration-minutes", str(meeting.duration_minutes)]
+    return argv
+
+
+def build_container_config(meeting: Meeting) -> dict:
+    """
+    Build the Docker Engine API create body for a meeting's bot-worker.
+
+    One container per meeting. Chrome runs inside the container on a virtual
+    display (Xvfb) with virtual audio (PulseAudio) — reliable cross-platform
+    capture. The supervisor removes the container once it has recorded the
+    exit, so the exit code and OOM state are never lost to --rm.
+
+    Raises:
+        ValueError: If no bot exists for the meeting's platform
+    """
+    if not is_supported_platform(meeting.platform):
+        raise ValueError(f"Automation not supported for platform: {meeting.platform}")
+
+    meeting_id = str(meeting.id)
+    recordings_abs = os.path.abspath(settings.RECORDINGS_PATH)
+    os.makedirs(recordings_abs, exist_ok=True)
+
+    return {
+        "Image": settings.BOT_WORKER_IMAGE,
+        # Pass meeting details as env vars
+        "Env": [
+            f"MEETING_URL={meeting.url}",
+            f"MEETING_ID={meeting_id}",
+            f"PLATFORM={meeting.platform.value}",
+            f"API_URL=http://host.docker.internal:{settings.API_PORT}/api/v1",
+            f"API_SECRET={settings.INTERNAL_BOT_SECRET}",
+            f"SCHEDULED_TIME={meeting.scheduled_time.isoformat() if meeting.scheduled_time else ''}",
+            f"DURATION_MINUTES={meeting.duration_minutes or ''}",
+            f"MONITOR_RECORD={'true' if settings.BOT_RECORD_MONITOR else 'false'}",
+            "VNC_ENABLED=false",
+            "RECORD_VIDEO=true",
+        ],
+        "HostConfig": {
+            # Mount local recordings folder into container
+            "Binds": [f"{recordings_abs}:/recordings"],
+            # Allow container to reach host machine's backend API
+            "ExtraHosts": ["host.docker.internal:host-gateway"],
+        },
+    }
+
+
+def build_bot_command(meeting: Meeting) -> List[str]:
+    """
+    Build the argv that runs the join script for a meeting (local mode).
+
+    Raises:
+        ValueError: If no bot exists for the meeting's platform
+    """
+    if not is_supported_platform(meeting.platform):
+        raise ValueError(f"Automation not supported for platform: {meeting.platform}")
+
+    meeting_id = str(meeting.id)
+
+    # ── Local mode: run join script directly (Windows dev default) ─────
+    script_path = BACKEND_DIR / BOT_SCRIPTS[meeting.platform]
+    argv = [
+        sys.executable, str(script_path),
+        meeting.url,
+        "--meeting-id", meeting_id,
+        "--api-url", f"http://localhost:{settings.API_PORT}/api/v1",
+        "--api-secret", settings.INTERNAL_BOT_SECRET,
+        *schedule_args(meeting),
+    ]
+    if settings.BOT_BROWSER_POOL_ADDR:
+        argv += ["--browser-pool", settings.BOT_BROWSER_POOL_ADDR]
+    return argv
+
+
+async def launch_bot(meeting: Meeting) -> SupervisedBot:
+    """
+    Start the join bot for a meeting under the bot supervisor.
+    Shared by the scheduler and the manual join endpoint (via request_join).
+
+    Raises:
+        ValueError: If no bot exists for the meeting's platform
+    """
+    meeting_id = str(meeting.id)
+    attempt = meeting.join_attempts or 1
+
+    if settings.BOT_MODE == "docker":
+        # ── Docker mode: bot-worker container via the Docker Engine API ──
+        run = await bot_supervisor.spawn_container(
+            meeting_id,
+            # Container name = meeting ID (useful for `docker ps` visibility)
+            container_name(meeting_id),
+            build_container_config(meeting),
+            attempt=attempt,
+        )
+        print(f"[OK] Bot-worker container launched for meeting {meeting.id} ({run.container_name})")
+        return run
+
+    run = await bot_supervisor.spawn(
+        meeting_id,
+        build_bot_command(meeting),
+        cwd=str(BACKEND_DIR),
+        attempt=attempt,
+        # Same layout as the container's /recordings/<id>; the bot keeps its event outbox there
+        extra_env={
+            "RECORDING_DIR": os.path.join(os.path.abspath(settings.RECORDINGS_PATH), meeting_id),
+            "MONITOR_RECORD": "true" if settings.BOT_RECORD_MONITOR else "false",
+        },
+    )
+    print(f"[OK] Automation script launched for meeting {meeting.id} (PID: {run.pid})")
+    return run
@@ -0,0 +1,645 @@
+"""
+Bot Process Supervisor
+Runs join bots in their own session with output going to a per-meeting log
+file, tails that file into a bounded ring buffer, reaps bots when they exit
+and maps the exit code onto the meeting's status.
+
+In docker mode bots are bot-worker containers driven through the Docker
+Engine API: their logs are streamed into the same log file and one shared
+engine event stream reports exits and OOM kills.
+
+Every run is also recorded in the bot_runs table (PID or container, host,
+heartbeat), so a restarted API can re-attach to bots that are still in a
+meeting instead of orphaning them — and fail the meetings whose bots died
+while nobody was watching. Failed and lost runs are settled through the
+join retry policy, so the meeting may be requeued rather than failed.
+"""
+import asyncio
+import logging
+import os
+import socket
+import subprocess
+import sys
+from collections import deque
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+from sqlalchemy import select, update, and_, or_, exists
+
+from app.core.config import settings
+from app.db.session import AsyncSessionLocal as SessionLocal
+from app.models.bot_run import BotRun, BotRunStatus
+from app.models.meeting import Meeting, MeetingStatus
+from app.services.admission import admission_controller
+from app.services.docker_engine import docker_engine, DockerEngineError, MEETING_LABEL
+from app.services.join_retry import fail_or_retry
+from app.services.join_metrics import observe_stages
+
+logger = logging.getLogger(__name__)
+
+# Config
+MAX_READ_BYTES = 1024 * 1024  # Per log poll, so a burst can't stall the event loop
+MAX_LINE_BYTES = 16 * 1024  # Longer lines are split rather than buffered forever
+MAX_FINISHED_RUNS = 200  # Exited runs kept around so their tail stays readable
+LOG_POLL_SECONDS = 0.5
+LIVENESS_POLL_SECONDS = 5  # Re-attached bots aren't our children; poll their PID
+HEARTBEAT_SECONDS = 30
+RECONCILE_SECONDS = 60
+STALE_HEARTBEAT_SECONDS = 600  # Runs on other hosts silent this long are given up on
+ORPHAN_GRACE_SECONDS = 120  # IN_PROGRESS without any open run for this long → failed
+EVENT_RECONNECT_SECONDS = 2
+LOG_DRAIN_TIMEOUT_SECONDS = 5  # After a container dies, wait this long for its last log frames
+
+# Own session / process group: stopping or reloading the API must not take
+# the bots down with it
+if sys.platform == "win32":
+    DETACH_KWARGS = {"creationflags": subprocess.CREATE_NEW_PROCESS_GROUP}
+else:
+    DETACH_KWARGS = {"start_new_session": True}
+
+
+def pid_alive(pid: Optional[int], meeting_id: Optional[str] = None) -> bool:
+    """
+    True if the process exists. With a meeting_id, also require it on the
+    process's command line where that can be checked (/proc), so a recycled
+    PID isn't mistaken for the bot.
+    """
+    if not pid:
+        return False
+
+    if sys.platform == "win32":
+        # os.kill() would terminate the process on Windows
+        import ctypes
+        PROCESS_QUERY_LIMITED_INFORMATION = 0x1000
+        STILL_ACTIVE = 259
+        kernel32 = ctypes.windll.kernel32
+        handle = kernel32.OpenProcess(PROCESS_QUERY_LIMITED_INFORMATION, False, pid)
+        if not handle:
+            return False
+        try:
+            code = ctypes.c_ulong()
+            return bool(kernel32.GetExitCodeProcess(handle, ctypes.byref(code))) and code.value == STILL_ACTIVE
+        finally:
+            kernel32.CloseHandle(handle)
+
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass  # Exists, owned by someone else
+
+    cmdline = Path(f"/proc/{pid}/cmdline")
+    if meeting_id and cmdline.exists():
+        try:
+            return meeting_id.encode() in cmdline.read_bytes()
+        except OSError:
+            return False
+    return True
+
+
+class SupervisedBot:
+    """One bot process (started here or re-attached) and its captured output"""
+
+    def __init__(
+        self,
+        meeting_id: str,
+        pid: Optional[int],
+        log_path: Optional[Path],
+        process: Optional[asyncio.subprocess.Process] = None,
+        container_name: Optional[str] = None,
+        started_at: Optional[datetime] = None,
+        offset: int = 0,
+        attempt: int = 1,
+    ):
+        self.meeting_id = meeting_id
+        self.attempt = attempt
+        self.run_id: Optional[str] = None  # bot_runs.id once registered
+        self.process = process  # None when re-attached after a restart
+        self.pid = pid
+        self.container_name = container_name
+        # Docker mode: resolved with the exit code by the engine event stream
+        self.container_id: Optional[str] = None
+        self.container_exit: Optional[asyncio.Future] = None
+        self.oom_killed = False
+        self.log_task: Optional[asyncio.Task] = None
+        self.started_at = started_at or datetime.utcnow()
+        self.ended_at: Optional[datetime] = None
+        self.exit_code: Optional[int] = None  # Unknown for re-attached bots
+        self.lines: deque = deque(maxlen=settings.BOT_LOG_TAIL_LINES)
+        self.log_path = log_path
+        self.offset = offset  # Where this run's output starts in the log file
+        self._partial = b""
+
+    @property
+    def running(self) -> bool:
+        return self.ended_at is None
+
+    def append(self, raw: bytes):
+        self.lines.append(raw.decode("utf-8", errors="replace").rstrip("\r"))
+
+    def feed(self, chunk: bytes, final: bool = False):
+        self._partial += chunk
+        *lines, self._partial = self._partial.split(b"\n")
+        for line in lines:
+            self.append(line)
+        if self._partial and (final or len(self._partial) > MAX_LINE_BYTES):
+            self.append(self._partial)
+            self._partial = b""
+
+    def tail(self, n: int) -> List[str]:
+        if n <= 0:
+            return []
+        return list(self.lines)[-n:]
+
+
+def exit_code_to_status(exit_code: Optional[int]) -> MeetingStatus:
+    """A clean exit means the bot saw the meeting through; anything else failed."""
+    return MeetingStatus.COMPLETED if exit_code == 0 else MeetingStatus.FAILED
+
+
+class BotSupervisor:
+    """Owns every bot process started (or re-attached) by this API instance"""
+
+    def __init__(self):
+        self.runs: Dict[str, SupervisedBot] = {}  # meeting_id: latest run
+        self.host = socket.gethostname()
+        # Called with a meeting that was put back to SCHEDULED for a retry
+        # (the scheduler arms its timer)
+        self.on_requeue: Optional[Callable[[Meeting], None]] = None
+        self._event_task: Optional[asyncio.Task] = None
+
+    # ── Launching ──────────────────────────────────────────────────────────────
+
+    async def spawn(
+        self,
+        meeting_id: str,
+        argv: List[str],
+        cwd: Optional[str] = None,
+        attempt: int = 1,
+        extra_env: Optional[Dict[str, str]] = None,
+    ) -> SupervisedBot:
+        """Start a bot process, register it in bot_runs and start tailing its log."""
+        env = dict(os.environ)
+        env.update(extra_env or {})
+        # Unbuffered UTF-8 output so the live tail is actually live
+        env["PYTHONUNBUFFERED"] = "1"
+        env["PYTHONIOENCODING"] = "utf-8"
+
+        # The bot writes straight to the log file rather than a pipe, so it
+        # keeps running (and logging) if this API process goes away
+        log_path, offset = self._log_file(meeting_id)
+        with open(log_path, "ab") as log_file:
+            process = await asyncio.create_subprocess_exec(
+                *argv,
+                stdout=log_file,
+                stderr=asyncio.subprocess.STDOUT,
+                stdin=asyncio.subprocess.DEVNULL,
+                cwd=cwd,
+                env=env,
+                **DETACH_KWARGS,
+            )
+
+        bot = SupervisedBot(
+            meeting_id, process.pid, log_path,
+            process=process, offset=offset, attempt=attempt,
+        )
+        await self._track(bot)
+        logger.info(f"Supervising bot for {meeting_id} (PID: {bot.pid})")
+        return bot
+
+    async def spawn_container(self, meeting_id: str, name: str, config: dict, attempt: int = 1) -> SupervisedBot:
+        """Create and start a bot-worker container and follow its logs and exit."""
+        config.setdefault("Labels", {})[MEETING_LABEL] = meeting_id
+        container_id = await self._create_container(name, config)
+        try:
+            await docker_engine.start_container(container_id)
+        except Exception:
+            await docker_engine.remove_container(container_id, force=True)
+            raise
+
+        log_path, offset = self._log_file(meeting_id)
+        bot = SupervisedBot(
+            meeting_id, None, log_path,
+            container_name=name, offset=offset, attempt=attempt,
+        )
+        self._attach_container(bot, container_id)
+        await self._track(bot)
+        logger.info(f"Supervising bot container {name} for {meeting_id}")
+        return bot
+
+    async def _create_container(self, name: str, config: dict) -> str:
+        try:
+            return await docker_engine.create_container(name, config)
+        except DockerEngineError as e:
+            if e.status_code != 409:
+                raise
+        # Name taken: a leftover from an earlier attempt is removed, a live
+        # container is a bot that is still running for this meeting
+        existing = await docker_engine.inspect_container(name)
+        if existing and existing["State"]["Running"]:
+            raise RuntimeError(f"Container {name} is already running")
+        await docker_engine.remove_container(name, force=True)
+        return await docker_engine.create_container(name, config)
+
+    def _log_file(self, meeting_id: str):
+        """Path of the meeting's bot log and where the next run's output starts."""
+        log_dir = Path(settings.BOT_LOG_DIR)
+        log_dir.mkdir(parents=True, exist_ok=True)
+        log_path = (log_dir / f"{meeting_id}.log").resolve()
+        return log_path, (log_path.stat().st_size if log_path.exists() else 0)
+
+    async def _track(self, bot: SupervisedBot):
+        self.runs[bot.meeting_id] = bot
+        try:
+            await self._register(bot)
+        except Exception as e:
+            # The bot still runs; it just can't be re-attached after a restart
+            logger.error(f"Failed to record bot run for {bot.meeting_id}: {e}")
+
+        asyncio.get_event_loop().create_task(self._supervise(bot))
+
+    async def _register(self, bot: SupervisedBot):
+        async with SessionLocal() as db:
+            row = BotRun(
+                meeting_id=bot.meeting_id,
+                host=self.host,
+                supervisor_pid=os.getpid(),
+                pid=bot.pid,
+                container_name=bot.container_name,
+                log_path=str(bot.log_path) if bot.log_path else None,
+                attempt=bot.attempt,
+                status=BotRunStatus.RUNNING.value,
+                started_at=bot.started_at,
+                last_heartbeat_at=bot.started_at,
+            )
+            db.add(row)
+            await db.commit()
+            bot.run_id = row.id
+
+    async def record_failed_launch(self, meeting_id: str, attempt: int, reason: str):
+        """Keep a bot_runs row for an attempt that never got a process."""
+        now = datetime.utcnow()
+        async with SessionLocal() as db:
+            db.add(BotRun(
+                meeting_id=meeting_id,
+                host=self.host,
+                supervisor_pid=os.getpid(),
+                attempt=attempt,
+                status=BotRunStatus.EXITED.value,
+                started_at=now,
+                last_heartbeat_at=now,
+                ended_at=now,
+                failure_reason=reason[:500],
+            ))
+            await db.commit()
+
+    def get_run(self, meeting_id: str) -> Optional[SupervisedBot]:
+        return self.runs.get(meeting_id)
+
+    def is_running(self, meeting_id: str) -> bool:
+        run = self.runs.get(meeting_id)
+        return run is not None and run.running
+
+    # ── Watching ───────────────────────────────────────────────────────────────
+
+    async def _supervise(self, bot: SupervisedBot):
+        waiter = asyncio.get_event_loop().create_task(self._wait_exit(bot))
+        try:
+            while not waiter.done():
+                self._read_output(bot)
+                await asyncio.wait({waiter}, timeout=LOG_POLL_SECONDS)
+            bot.exit_code = waiter.result()
+        except Exception as e:
+            logger.error(f"Lost track of bot for {bot.meeting_id}: {e}")
+            if bot.process is not None:
+                bot.exit_code = bot.process.returncode if bot.process.returncode is not None else -1
+        finally:
+            if bot.log_task is not None:
+                await asyncio.wait({bot.log_task}, timeout=LOG_DRAIN_TIMEOUT_SECONDS)
+            self._read_output(bot, final=True)
+            bot.ended_at = datetime.utcnow()
+
+        if bot.container_id:
+            try:
+                await docker_engine.remove_container(bot.container_id, force=True)
+            except Exception as e:
+                logger.warning(f"Failed to remove container {bot.container_name}: {e}")
+
+        logger.info(f"Bot for meeting {bot.meeting_id} exited (code {bot.exit_code})")
+        try:
+            await self._record_exit(bot)
+        except Exception as e:
+            logger.error(f"Failed to record bot exit for {bot.meeting_id}: {e}")
+        finally:
+            admission_controller.release(bot.meeting_id)
+            self._trim_finished()
+
+    async def _wait_exit(self, bot: SupervisedBot) -> Optional[int]:
+        """Exit code of the bot, or None if it can't be known (re-attached)."""
+        if bot.process is not None:
+            return await bot.process.wait()
+
+        if bot.container_exit is not None:
+            return await bot.container_exit
+
+        while pid_alive(bot.pid, bot.meeting_id):
+            await asyncio.sleep(LIVENESS_POLL_SECONDS)
+        return None
+
+    # ── Containers ─────────────────────────────────────────────────────────────
+
+    def _attach_container(self, bot: SupervisedBot, container_id: str, since: int = 0):
+        """Follow a container's logs into the bot's log file and await its exit event."""
+        loop = asyncio.get_event_loop()
+        bot.container_id = container_id
+        bot.container_exit = loop.create_future()
+        bot.log_task = loop.create_task(self._pump_logs(bot, since))
+        if self._event_task is None or self._event_task.done():
+            self._event_task = loop.create_task(self._watch_events())
+
+    async def _pump_logs(self, bot: SupervisedBot, since: int):
+        if bot.log_path is None:
+            return
+        try:
+            with open(bot.log_path, "ab") as log_file:
+                async for frame in docker_engine.stream_logs(bot.container_id, since=since):
+                    log_file.write(frame)
+                    log_file.flush()
+        except Exception as e:
+            logger.warning(f"Log stream for container {bot.container_name} ended: {e}")
+
+    def _container_exited(self, bot: SupervisedBot, exit_code: Optional[int]):
+        if bot.container_exit is not None and not bot.container_exit.done():
+            bot.container_exit.set_result(exit_code)
+
+    async def _watch_events(self):
+        """
+        One engine event stream for every bot container: OOM kills are noted,
+        deaths resolve the container's exit. After a reconnect, containers are
+        re-inspected so an exit missed while the stream was down isn't lost.
+        """
+        filters = {"type": ["container"], "event": ["die", "oom"], "label": [MEETING_LABEL]}
+        since = None
+        while any(bot.container_exit is not None and bot.running for bot in self.runs.values()):
+            try:
+                await self._resync_containers()
+                async for event in docker_engine.stream_events(filters, since=since):
+                    since = event.get("time", since)
+                    self._on_container_event(event)
+            except Exception as e:
+                logger.warning(f"Docker event stream dropped: {e}")
+            await asyncio.sleep(EVENT_RECONNECT_SECONDS)
+
+    def _on_container_event(self, event: dict):
+        actor = event.get("Actor", {})
+        attributes = actor.get("Attributes", {})
+        bot = self.runs.get(attributes.get(MEETING_LABEL))
+        if bot is None or bot.container_id != actor.get("ID"):
+            return
+
+        action = event.get("Action") or event.get("status")
+        if action == "oom":
+            bot.oom_killed = True
+            logger.warning(f"Bot container {bot.container_name} ran out of memory")
+        elif action == "die":
+            try:
+                exit_code = int(attributes.get("exitCode", -1))
+            except ValueError:
+                exit_code = -1
+            self._container_exited(bot, exit_code)
+
+    async def _resync_containers(self):
+        for bot in list(self.runs.values()):
+            if bot.container_exit is None or bot.container_exit.done():
+                continue
+            info = await docker_engine.inspect_container(bot.container_id)
+            if info is None:
+                self._container_exited(bot, None)
+            elif not info["State"]["Running"]:
+                bot.oom_killed = bot.oom_killed or info["State"].get("OOMKilled", False)
+                self._container_exited(bot, info["State"].get("ExitCode"))
+
+    def _read_output(self, bot: SupervisedBot, final: bool = False):
+        """Feed whatever the bot appended to its log since the last poll."""
+        if bot.log_path is None:
+            return
+        try:
+            with open(bot.log_path, "rb") as f:
+                f.seek(bot.offset)
+                chunk = f.read(MAX_READ_BYTES)
+        except OSError:
+            return
+        bot.offset += len(chunk)
+        bot.feed(chunk, final=final)
+
+    async def _record_exit(self, bot: SupervisedBot):
+        """
+        Close the bot_runs row, then map the exit code onto the meeting — but
+        only if the meeting is still IN_PROGRESS; a bot that already called
+        /complete (or a user who cancelled) has the final word. A failed
+        attempt is retried while the meeting's retry budget lasts.
+        """
+        status = exit_code_to_status(bot.exit_code)
+        reason = None
+        if status == MeetingStatus.FAILED:
+            last_line = next((l for l in reversed(bot.lines) if l.strip()), "")
+            if bot.oom_killed:
+                reason = f"Bot container was killed for running out of memory (code {bot.exit_code})"
+            elif bot.exit_code is None:
+                reason = "Bot exited while detached from the API (exit code unknown)"
+            else:
+                reason = f"Bot exited with code {bot.exit_code}"
+            reason = f"{reason}: {last_line[:200]}"
+
+        requeued = None
+        async with SessionLocal() as db:
+            if bot.run_id:
+                await db.execute(
+                    update(BotRun)
+                    .where(BotRun.id == bot.run_id)
+                    .values(
+                        status=BotRunStatus.EXITED.value,
+                        ended_at=bot.ended_at,
+                        exit_code=bot.exit_code,
+                        failure_reason=reason,
+                    )
+                )
+
+            result = await db.execute(select(Meeting).where(Meeting.id == bot.meeting_id))
+            meeting = result.scalar_one_or_none()
+            ended = False
+            if meeting is not None and meeting.ended_at is None and meeting.bot_started_at is not None:
+                meeting.ended_at = bot.ended_at
+                ended = True
+            if meeting is not None and meeting.status == MeetingStatus.IN_PROGRESS:
+                if status == MeetingStatus.COMPLETED:
+                    meeting.status = status
+                    meeting.join_successful = meeting.join_successful or "success"
+                    meeting.updated_at = datetime.utcnow()
+                elif fail_or_retry(meeting, reason):
+                    requeued = meeting
+
+            await db.commit()
+
+        if ended:
+            observe_stages(meeting, "ended_at")
+        if requeued is not None:
+            self._notify_requeue(requeued)
+
+    def _notify_requeue(self, meeting: Meeting):
+        if self.on_requeue is not None:
+            self.on_requeue(meeting)
+
+    def _trim_finished(self):
+        finished = [r for r in self.runs.values() if not r.running]
+        excess = len(finished) - MAX_FINISHED_RUNS
+        if excess > 0:
+            for run in sorted(finished, key=lambda r: r.ended_at)[:excess]:
+                self.runs.pop(run.meeting_id, None)
+
+    # ── Registry upkeep ────────────────────────────────────────────────────────
+
+    async def heartbeat(self):
+        """Mark every bot this instance is watching as still supervised."""
+        run_ids = [bot.run_id for bot in self.runs.values() if bot.running and bot.run_id]
+        if not run_ids:
+            return
+        async with SessionLocal() as db:
+            await db.execute(
+                update(BotRun)
+                .where(BotRun.id.in_(run_ids))
+                .values(last_heartbeat_at=datetime.utcnow(), supervisor_pid=os.getpid())
+            )
+            await db.commit()
+
+    def open_runs_query(self):
+        """Every run not yet ended, on any host. Served by the partial ix_bot_runs_open."""
+        return select(BotRun).where(BotRun.ended_at.is_(None))
+
+    def orphaned_query(self, now: datetime):
+        """
+        SELECT id of IN_PROGRESS meetings past their grace period with no open run.
+        Served by ix_meetings_in_progress and, for the NOT EXISTS, ix_bot_runs_open.
+        """
+        return select(Meeting.id).where(
+            and_(
+                Meeting.status == MeetingStatus.IN_PROGRESS,
+                or_(
+                    Meeting.join_attempted_at.is_(None),
+                    Meeting.join_attempted_at < now - timedelta(seconds=ORPHAN_GRACE_SECONDS)
+                ),
+                ~exists().where(
+                    and_(BotRun.meeting_id == Meeting.id, BotRun.ended_at.is_(None))
+                )
+            )
+        )
+
+    async def reconcile(self):
+        """
+        Bring bot_runs in line with reality. Runs at startup and periodically:
+
+        - Open runs on this host whose supervisor is gone are re-attached if the
+          bot (or its container) is still alive, otherwise closed as lost.
+        - Open runs on other hosts that stopped heartbeating long ago are
+          closed as lost.
+        - Meetings left IN_PROGRESS by a lost run, or with no open run at all,
+          are retried or marked FAILED.
+        """
+        now = datetime.utcnow()
+        stale_before = now - timedelta(seconds=STALE_HEARTBEAT_SECONDS)
+        heartbeat_due = now - timedelta(seconds=3 * HEARTBEAT_SECONDS)
+        watched = {bot.run_id for bot in self.runs.values() if bot.running}
+
+        requeued: List[Meeting] = []
+        async with SessionLocal() as db:
+            result = await db.execute(self.open_runs_query())
+            lost: List[BotRun] = []
+
+            for row in result.scalars().all():
+                if row.id in watched:
+                    continue
+
+                if row.host != self.host:
+                    if row.last_heartbeat_at < stale_before:
+                        lost.append(row)
+                    continue
+
+                # Same host: leave it alone while another live API process
+                # (e.g. a second worker) is still heartbeating it
+                if (
+                    row.supervisor_pid != os.getpid()
+                    and pid_alive(row.supervisor_pid)
+                    and row.last_heartbeat_at >= heartbeat_due
+                ):
+                    continue
+
+                if pid_alive(row.pid, row.meeting_id):
+                    self._reattach(row)
+                    continue
+
+                container = None
+                if row.container_name:
+                    try:
+                        container = await docker_engine.inspect_container(row.container_name)
+                    except Exception as e:
+                        logger.warning(f"Could not inspect container {row.container_name}: {e}")
+                        continue
+                if container and container["State"]["Running"]:
+                    self._reattach(row, container_id=container["Id"])
+                else:
+                    lost.append(row)
+
+            for row in lost:
+                logger.warning(f"Bot run {row.id} for meeting {row.meeting_id} was lost (PID: {row.pid})")
+                row.status = BotRunStatus.LOST.value
+                row.ended_at = now
+                row.failure_reason = "Bot was lost while the API was down"
+                await self._settle_lost(db, row.meeting_id, row.failure_reason, requeued)
+
+            # IN_PROGRESS with no open run: launched before runs were recorded,
+            # or the API died between marking the meeting and spawning the bot
+            orphaned = await db.execute(self.orphaned_query(now))
+            for meeting_id in orphaned.scalars().all():
+                if self.is_running(meeting_id):
+                    continue
+                logger.warning(f"Meeting {meeting_id} is IN_PROGRESS with no bot")
+                await self._settle_lost(db, meeting_id, "No bot is running for this meeting", requeued)
+
+            await db.commit()
+
+        for meeting in requeued:
+            self._notify_requeue(meeting)
+
+        await self.heartbeat()
+
+    def _reattach(self, row: BotRun, container_id: Optional[str] = None):
+        bot = SupervisedBot(
+            row.meeting_id, row.pid,
+            Path(row.log_path) if row.log_path else None,
+            container_name=row.container_name,
+            started_at=row.started_at,
+            attempt=row.attempt,
+        )
+        bot.run_id = row.id
+        if container_id:
+            # Pick the log stream up from roughly where the file stops
+            since = int(bot.log_path.stat().st_mtime) if bot.log_path and bot.log_path.exists() else 0
+            self._attach_container(bot, container_id, since=since)
+        self.runs[row.meeting_id] = bot
+        admission_controller.adopt(row.meeting_id)
+        asyncio.get_event_loop().create_task(self._supervise(bot))
+        logger.info(f"Re-attached to bot for {row.meeting_id} (PID: {row.pid})")
+
+    async def _settle_lost(self, db, meeting_id: str, reason: str, requeued: List[Meeting]):
+        result = await db.execute(select(Meeting).where(Meeting.id == meeting_id))
+        meeting = result.scalar_one_or_none()
+        if meeting is None or meeting.status != MeetingStatus.IN_PROGRESS:
+            return
+        if fail_or_retry(meeting, reason):
+            requeued.append(meeting)
+
+
+# Global instance
+bot_supervisor = BotSupervisor()
@@ -0,0 +1,630 @@
+"""
+Calendar Ingestion
+Syncs ICS feeds (http(s) URLs or local files) into meetings incrementally.
+
+A feed is only re-read when its validators changed (HTTP ETag/Last-Modified
+via a conditional GET, or a local file's mtime/size). When it is read, it is
+parsed as a stream, VEVENT by VEVENT, and each event's content hash is
+compared with the hash stored on its meeting: only new or changed events
+reach the database, in one batched INSERT plus an UPDATE per changed row.
+"""
+import asyncio
+import hashlib
+import ipaddress
+import logging
+import os
+import re
+import socket
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Dict, List, Optional, Tuple
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+import httpx
+from dateutil.rrule import rrulestr
+from sqlalchemy import select, update, and_
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.db.session import AsyncSessionLocal as SessionLocal
+from app.models.calendar_source import CalendarSource
+from app.models.meeting import Meeting, MeetingStatus
+from app.services.platform_detector import platform_detector
+from app.services.meeting_events import publish_statuses
+
+logger = logging.getLogger(__name__)
+
+# Config
+CALENDAR_SYNC_SECONDS = 900  # How often each feed is re-checked
+SYNC_HORIZON_DAYS = 60  # Events further out are picked up by a later sync
+SYNC_LOOKBACK_HOURS = 1  # Events that started this recently are still synced
+MAX_OCCURRENCES_PER_EVENT = 200  # Per recurring event, within the horizon
+FETCH_TIMEOUT_SECONDS = 30
+MAX_REDIRECTS = 5  # Followed by hand so every hop's address is checked
+READ_CHUNK_CHARS = 64 * 1024
+DEFAULT_DURATION_MINUTES = 60
+MAX_DURATION_MINUTES = 480
+
+# Rewritten on every export by most providers; hashing it would make every
+# event look changed on every sync
+HASH_IGNORED_PROPERTIES = {"DTSTAMP"}
+
+# Where a meeting link can hide in a VEVENT, in order of preference
+URL_PROPERTIES = (
+    "URL",
+    "X-GOOGLE-CONFERENCE",
+    "X-MICROSOFT-SKYPETEAMSMEETINGURL",
+    "LOCATION",
+    "DESCRIPTION",
+)
+URL_PATTERN = re.compile(r'https?://[^\s<>"\']+')
+DURATION_PATTERN = re.compile(
+    r'^([+-])?P(?:(\d+)W)?(?:(\d+)D)?(?:T(?:(\d+)H)?(?:(\d+)M)?(?:(\d+)S)?)?$'
+)
+
+
+class CalendarSyncError(Exception):
+    """A feed could not be fetched or read"""
+
+
+class ICSEvent:
+    """One VEVENT: every content line by property name, and a content hash"""
+
+    def __init__(self, properties: Dict[str, List[Tuple[Dict[str, str], str]]], digest: str):
+        self.properties = properties
+        self.digest = digest
+
+    def get(self, name: str) -> Tuple[Dict[str, str], Optional[str]]:
+        """(params, value) of the first occurrence of a property."""
+        values = self.properties.get(name)
+        return values[0] if values else ({}, None)
+
+    def text(self, name: str) -> Optional[str]:
+        return _unescape(self.get(name)[1])
+
+
+class ICSParser:
+    """
+    Incremental VEVENT parser. Feed text chunks as they arrive; completed
+    events are returned from feed()/close(), so a feed is never held whole.
+    """
+
+    def __init__(self):
+        self.event_count = 0
+        self._pending = ""  # Incomplete physical line at the end of the last chunk
+        self._logical: Optional[str] = None  # Content line being unfolded
+        self._properties: Optional[Dict[str, List[Tuple[Dict[str, str], str]]]] = None
+        self._hash = None
+        self._nested = 0  # Depth of components inside the VEVENT (VALARM, ...)
+
+    def feed(self, chunk: str) -> List[ICSEvent]:
+        events: List[ICSEvent] = []
+        lines = (self._pending + chunk).split("\n")
+        self._pending = lines.pop()
+        for line in lines:
+            self._physical_line(line.rstrip("\r"), events)
+        return events
+
+    def close(self) -> List[ICSEvent]:
+        events: List[ICSEvent] = []
+        if self._pending:
+            self._physical_line(self._pending.rstrip("\r"), events)
+            self._pending = ""
+        if self._logical is not None:
+            self._content_line(self._logical, events)
+            self._logical = None
+        return events
+
+    def _physical_line(self, line: str, events: List[ICSEvent]):
+        # RFC 5545 folding: a leading space or tab continues the previous line
+        if line[:1] in (" ", "\t"):
+            if self._logical is not None:
+                self._logical += line[1:]
+            return
+        if self._logical is not None:
+            self._content_line(self._logical, events)
+        self._logical = line
+
+    def _content_line(self, line: str, events: List[ICSEvent]):
+        if not line:
+            return
+        name, params, value = _split_content_line(line)
+
+        if name == "BEGIN":
+            if self._properties is not None:
+                self._nested += 1
+            elif value.upper() == "VEVENT":
+                self._properties = {}
+                self._hash = hashlib.sha256()
+            return
+
+        if name == "END":
+            if self._properties is None:
+                return
+            if self._nested:
+                self._nested -= 1
+            elif value.upper() == "VEVENT":
+                events.append(ICSEvent(self._properties, self._hash.hexdigest()))
+                self.event_count += 1
+                self._properties = None
+            return
+
+        if self._properties is None or self._nested:
+            return
+        if name not in HASH_IGNORED_PROPERTIES:
+            self._hash.update(line.encode("utf-8", "replace"))
+            self._hash.update(b"\n")
+        self._properties.setdefault(name, []).append((params, value))
+
+
+def _split_content_line(line: str) -> Tuple[str, Dict[str, str], str]:
+    """NAME;PARAM=VALUE;...:value → (NAME, {PARAM: VALUE}, value)."""
+    in_quotes = False
+    for i, ch in enumerate(line):
+        if ch == '"':
+            in_quotes = not in_quotes
+        elif ch == ":" and not in_quotes:
+            head, value = line[:i], line[i + 1:]
+            break
+    else:
+        return line.upper(), {}, ""
+
+    name, *raw_params = head.split(";")
+    params = {}
+    for raw in raw_params:
+        key, _, param_value = raw.partition("=")
+        params[key.upper()] = param_value.strip('"')
+    return name.upper(), params, value
+
+
+def _unescape(value: Optional[str]) -> Optional[str]:
+    if value is None:
+        return None
+    return (
+        value.replace("\\n", "\n").replace("\\N", "\n")
+        .replace("\\,", ",").replace("\\;", ";").replace("\\\\", "\\")
+    )
+
+
+def _parse_datetime(params: Dict[str, str], value: Optional[str]) -> Optional[datetime]:
+    """
+    DTSTART-style value → aware datetime (in its TZID zone, so recurrences
+    keep wall-clock time across DST). None for all-day dates: nothing to join.
+    """
+    if not value or params.get("VALUE") == "DATE" or len(value) == 8:
+        return None
+    try:
+        parsed = datetime.strptime(value.rstrip("Z")[:15], "%Y%m%dT%H%M%S")
+    except ValueError:
+        return None
+    if value.endswith("Z"):
+        return parsed.replace(tzinfo=timezone.utc)
+    tzid = params.get("TZID")
+    if tzid:
+        try:
+            return parsed.replace(tzinfo=ZoneInfo(tzid))
+        except (ZoneInfoNotFoundError, ValueError):
+            # Non-IANA names (e.g. Outlook's "Pacific Standard Time")
+            logger.debug(f"Unknown TZID {tzid!r}; treating as UTC")
+    # Floating time: treated as UTC
+    return parsed.replace(tzinfo=timezone.utc)
+
+
+def _parse_duration(value: Optional[str]) -> Optional[timedelta]:
+    match = DURATION_PATTERN.match(value or "")
+    if not match:
+        return None
+    sign, weeks, days, hours, minutes, seconds = match.groups()
+    duration = timedelta(
+        weeks=int(weeks or 0), days=int(days or 0),
+        hours=int(hours or 0), minutes=int(minutes or 0), seconds=int(seconds or 0)
+    )
+    return -duration if sign == "-" else duration
+
+
+def _utc_naive(value: datetime) -> datetime:
+    """Meeting timestamps are stored as naive UTC."""
+    return value.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+def _occurrence_key(uid: str, start: datetime) -> str:
+    return f"{uid}/{_utc_naive(start):%Y%m%dT%H%M%SZ}"
+
+
+def _meeting_url(event: ICSEvent) -> Optional[str]:
+    """First link in the event that PlatformDetector recognises."""
+    for name in URL_PROPERTIES:
+        for _, value in event.properties.get(name, ()):
+            for match in URL_PATTERN.finditer(_unescape(value)):
+                url = match.group(0).rstrip(".,;)>]")
+                if platform_detector.is_valid_url(url):
+                    return url
+    return None
+
+
+async def _check_public_host(url: str):
+    """
+    Refuse feeds on private, loopback, link-local or reserved addresses, so
+    a calendar URL (or a redirect) can't reach the API's own network.
+    """
+    parsed = httpx.URL(url)
+    if parsed.scheme not in ("http", "https") or not parsed.host:
+        raise CalendarSyncError(f"{url} is not an http(s) URL")
+    port = parsed.port or (443 if parsed.scheme == "https" else 80)
+    try:
+        infos = await asyncio.get_running_loop().getaddrinfo(parsed.host, port, type=socket.SOCK_STREAM)
+    except socket.gaierror as e:
+        raise CalendarSyncError(f"Cannot resolve {parsed.host}: {e}")
+    for *_, sockaddr in infos:
+        address = ipaddress.ip_address(sockaddr[0].split("%")[0])
+        if getattr(address, "ipv4_mapped", None):
+            address = address.ipv4_mapped
+        if not address.is_global:
+            raise CalendarSyncError(f"{parsed.host} resolves to non-public address {address}")
+
+
+class CalendarIngestor:
+    """Fetches ICS feeds and upserts their meeting events"""
+
+    def __init__(self):
+        self._client: Optional[httpx.AsyncClient] = None
+        # Set by the scheduler: arms timers for created/changed meetings
+        self.on_meetings_changed: Optional[Callable[[Meeting], None]] = None
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        if self._client is None:
+            self._client = httpx.AsyncClient(timeout=FETCH_TIMEOUT_SECONDS, follow_redirects=False)
+        return self._client
+
+    async def close(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    # ── Fetching ───────────────────────────────────────────────────────────────
+
+    @staticmethod
+    def local_path(url: str, user_id) -> Optional[str]:
+        """
+        Resolved path of a local feed, or None if it isn't one / escapes the
+        owner's CALENDAR_FILE_DIR/<user_id> directory, so one user can't
+        register a file another user put there.
+        """
+        if url.startswith(("http://", "https://")):
+            return None
+        if url.startswith("file://"):
+            url = url[len("file://"):]
+        root = os.path.realpath(os.path.join(settings.CALENDAR_FILE_DIR, str(user_id)))
+        path = os.path.realpath(os.path.join(root, url))
+        if os.path.commonpath([root, path]) != root:
+            return None
+        return path
+
+    async def _read_http(self, source: CalendarSource, parser: ICSParser, collect) -> bool:
+        """Conditional GET, streamed through the parser. False on 304."""
+        headers = {}
+        if source.etag:
+            headers["If-None-Match"] = source.etag
+        if source.last_modified:
+            headers["If-Modified-Since"] = source.last_modified
+        url = source.url
+        try:
+            for _ in range(MAX_REDIRECTS + 1):
+                await _check_public_host(url)
+                async with self.client.stream("GET", url, headers=headers) as response:
+                    if response.is_redirect and response.next_request is not None:
+                        url = str(response.next_request.url)
+                        continue
+                    if response.status_code == 304:
+                        return False
+                    if response.status_code >= 400:
+                        raise CalendarSyncError(f"GET {source.url} returned {response.status_code}")
+                    async for chunk in response.aiter_text():
+                        collect(parser.feed(chunk))
+                    etag = response.headers.get("ETag")
+                    last_modified = response.headers.get("Last-Modified")
+                    break
+            else:
+                raise CalendarSyncError(f"GET {source.url}: more than {MAX_REDIRECTS} redirects")
+        except httpx.HTTPError as e:
+            raise CalendarSyncError(f"GET {source.url} failed: {e}")
+        collect(parser.close())
+        source.etag, source.last_modified = etag, last_modified
+        return True
+
+    async def _read_file(self, source: CalendarSource, parser: ICSParser, collect) -> bool:
+        """Read a local feed in chunks, unless its mtime/size are unchanged."""
+        path = self.local_path(source.url, source.user_id)
+        if path is None:
+            raise CalendarSyncError(f"{source.url} is outside CALENDAR_FILE_DIR/{source.user_id}")
+        try:
+            stat = await asyncio.to_thread(os.stat, path)
+            validator = f'"{stat.st_mtime_ns}-{stat.st_size}"'
+            if validator == source.etag:
+                return False
+            with open(path, encoding="utf-8", errors="replace", newline="") as f:
+                while True:
+                    chunk = await asyncio.to_thread(f.read, READ_CHUNK_CHARS)
+                    if not chunk:
+                        break
+                    collect(parser.feed(chunk))
+        except OSError as e:
+            raise CalendarSyncError(f"Cannot read {source.url}: {e}")
+        collect(parser.close())
+        source.etag = validator
+        return True
+
+    # ── Events → meeting rows ──────────────────────────────────────────────────
+
+    def _expand(self, event: ICSEvent, window_start: datetime, window_end: datetime):
+        """
+        (external_uid, start, is_override) for each occurrence of an event
+        inside the sync window. RRULEs are expanded; a RECURRENCE-ID event
+        is an edited occurrence and keys onto the occurrence it replaces.
+        """
+        uid = event.get("UID")[1]
+        start = _parse_datetime(*event.get("DTSTART"))
+        if not uid or start is None:
+            return []
+
+        recurrence_id = _parse_datetime(*event.get("RECURRENCE-ID"))
+        if recurrence_id is not None:
+            if window_start <= start <= window_end:
+                return [(_occurrence_key(uid, recurrence_id), start, True)]
+            return []
+
+        rrule = event.get("RRULE")[1]
+        if not rrule:
+            return [(uid, start, False)] if window_start <= start <= window_end else []
+
+        try:
+            rules = rrulestr(f"RRULE:{rrule}", dtstart=start, forceset=True)
+            for params, value in event.properties.get("EXDATE", ()):
+                for item in value.split(","):
+                    excluded = _parse_datetime(params, item)
+                    if excluded is not None:
+                        rules.exdate(excluded)
+            occurrences = rules.between(window_start, window_end, inc=True)
+        except (ValueError, TypeError) as e:
+            logger.warning(f"Unusable RRULE on event {uid}: {e}")
+            return [(uid, start, False)] if window_start <= start <= window_end else []
+
+        return [
+            (_occurrence_key(uid, occurrence), occurrence, False)
+            for occurrence in occurrences[:MAX_OCCURRENCES_PER_EVENT]
+        ]
+
+    def _fields(self, event: ICSEvent, start: datetime) -> Optional[dict]:
+        """Meeting columns for one occurrence, or None if it has no meeting link."""
+        url = _meeting_url(event)
+        if url is None:
+            return None
+
+        duration = None
+        end = _parse_datetime(*event.get("DTEND"))
+        if end is not None:
+            duration = end - _parse_datetime(*event.get("DTSTART"))
+        else:
+            duration = _parse_duration(event.get("DURATION")[1])
+        minutes = int(duration.total_seconds() // 60) if duration else DEFAULT_DURATION_MINUTES
+
+        platform, meeting_code = platform_detector.detect_platform(url)
+        description = event.text("DESCRIPTION")
+        return {
+            "url": url,
+            "platform": platform,
+            "meeting_code": meeting_code,
+            "title": (event.text("SUMMARY") or "Calendar meeting").strip()[:200] or "Calendar meeting",
+            "scheduled_time": _utc_naive(start),
+            "duration_minutes": max(1, min(minutes, MAX_DURATION_MINUTES)),
+            "purpose": description[:1000] if description else None,
+            "source_hash": event.digest,
+            "cancelled": (event.get("STATUS")[1] or "").upper() == "CANCELLED",
+        }
+
+    # ── Sync ───────────────────────────────────────────────────────────────────
+
+    async def sync_source(self, db: AsyncSession, source: CalendarSource, force: bool = False) -> dict:
+        """
+        Sync one feed into its owner's meetings.
+
+        Returns:
+            Counts: events read, meetings created/updated/cancelled, and
+            whether the feed was unchanged (not re-read)
+        """
+        now = datetime.now(timezone.utc)
+        window_start = now - timedelta(hours=SYNC_LOOKBACK_HOURS)
+        window_end = now + timedelta(days=SYNC_HORIZON_DAYS)
+
+        if force:
+            source.etag = source.last_modified = None
+
+        # external_uid → (is_override, fields); edited occurrences win over
+        # the ones their master event generates, whichever comes first
+        rows: Dict[str, Tuple[bool, dict]] = {}
+
+        def collect(events: List[ICSEvent]):
+            for event in events:
+                for key, start, is_override in self._expand(event, window_start, window_end):
+                    if key in rows and not is_override:
+                        continue
+                    fields = self._fields(event, start)
+                    if fields is not None:
+                        rows[key] = (is_override, fields)
+                    elif is_override:
+                        rows.pop(key, None)
+
+        parser = ICSParser()
+        if source.url.startswith(("http://", "https://")):
+            changed = await self._read_http(source, parser, collect)
+        else:
+            changed = await self._read_file(source, parser, collect)
+
+        source.last_synced_at = datetime.utcnow()
+        source.last_error = None
+        if not changed:
+            await db.commit()
+            return {"unchanged": True, "events": source.event_count, "created": 0, "updated": 0, "cancelled": 0}
+
+        source.event_count = parser.event_count
+        counts = await self._apply(
+            db, source,
+            {key: fields for key, (_, fields) in rows.items()},
+            _utc_naive(window_start), _utc_naive(window_end)
+        )
+        if counts["created"] or counts["updated"] or counts["cancelled"]:
+            source.last_changed_at = source.last_synced_at
+        logger.info(
+            f"Calendar {source.id}: {parser.event_count} events, {counts['created']} created, "
+            f"{counts['updated']} updated, {counts['cancelled']} cancelled"
+        )
+        return {"unchanged": False, "events": parser.event_count, **counts}
+
+    async def _apply(
+        self,
+        db: AsyncSession,
+        source: CalendarSource,
+        rows: Dict[str, dict],
+        window_start: datetime,
+        window_end: datetime
+    ) -> dict:
+        """Insert new events, update changed ones, cancel ones that disappeared."""
+        result = await db.execute(
+            select(Meeting.external_uid, Meeting.id, Meeting.source_hash, Meeting.status, Meeting.scheduled_time)
+            .where(
+                and_(
+                    Meeting.calendar_source_id == source.id,
+                    Meeting.scheduled_time >= window_start
+                )
+            )
+        )
+        existing = {row.external_uid: row for row in result.all()}
+        # A row from before the window whose event moved into it would make
+        # the insert below conflict (and be skipped): look new keys up too
+        missing = [key for key in rows if key not in existing]
+        if missing:
+            result = await db.execute(
+                select(Meeting.external_uid, Meeting.id, Meeting.source_hash, Meeting.status, Meeting.scheduled_time)
+                .where(
+                    and_(
+                        Meeting.calendar_source_id == source.id,
+                        Meeting.external_uid.in_(missing)
+                    )
+                )
+            )
+            existing.update((row.external_uid, row) for row in result.all())
+
+        inserts = []
+        changed: Dict[str, dict] = {}
+        for key, fields in rows.items():
+            row = existing.get(key)
+            if row is None:
+                if not fields["cancelled"]:
+                    inserts.append(key)
+            # Meetings that already started or ended are left alone; a
+            # cancelled one comes back if its event changes again
+            elif row.source_hash != fields["source_hash"] and row.status in (
+                MeetingStatus.SCHEDULED, MeetingStatus.CANCELLED
+            ):
+                changed[row.id] = fields
+        # Deleted upstream (or moved out of the window)
+        gone = [
+            row.id for key, row in existing.items()
+            if key not in rows and row.status == MeetingStatus.SCHEDULED and row.scheduled_time <= window_end
+        ]
+
+        touched: List[Meeting] = []
+        created = updated = cancelled = 0
+        if inserts:
+            result = await db.scalars(
+                pg_insert(Meeting)
+                .on_conflict_do_nothing(index_elements=["calendar_source_id", "external_uid"])
+                .returning(Meeting),
+                [
+                    {
+                        **{name: value for name, value in rows[key].items() if name != "cancelled"},
+                        "external_uid": key,
+                        "calendar_source_id": source.id,
+                        "user_id": source.user_id,
+                        "status": MeetingStatus.SCHEDULED,
+                    }
+                    for key in inserts
+                ]
+            )
+            new_meetings = result.all()
+            created = len(new_meetings)
+            touched.extend(new_meetings)
+            # Bulk INSERT skips Session.flush, so the after_flush NOTIFY never runs
+            await publish_statuses(db, new_meetings)
+
+        if changed or gone:
+            result = await db.execute(select(Meeting).where(Meeting.id.in_(list(changed) + gone)))
+            for meeting in result.scalars().all():
+                fields = changed.get(meeting.id)
+                if fields is None or fields["cancelled"]:
+                    if meeting.status != MeetingStatus.CANCELLED:
+                        meeting.status = MeetingStatus.CANCELLED
+                        cancelled += 1
+                    if fields is not None:
+                        meeting.source_hash = fields["source_hash"]
+                else:
+                    if meeting.scheduled_time != fields["scheduled_time"]:
+                        # A new time is a new join: fresh retry budget
+                        meeting.join_attempts = 0
+                        meeting.next_attempt_at = None
+                    for name, value in fields.items():
+                        if name != "cancelled":
+                            setattr(meeting, name, value)
+                    meeting.status = MeetingStatus.SCHEDULED
+                    updated += 1
+                touched.append(meeting)
+
+        await db.commit()
+
+        if self.on_meetings_changed is not None:
+            for meeting in touched:
+                self.on_meetings_changed(meeting)
+
+        return {"created": created, "updated": updated, "cancelled": cancelled}
+
+    async def sync_due(self):
+        """
+        Sync every feed whose next_sync_at has passed. Feeds are claimed with
+        FOR UPDATE SKIP LOCKED, so each is synced by one instance at a time.
+        """
+        now = datetime.utcnow()
+        async with SessionLocal() as db:
+            due = (
+                select(CalendarSource.id)
+                .where(CalendarSource.next_sync_at <= now)
+                .with_for_update(skip_locked=True)
+            )
+            result = await db.execute(
+                update(CalendarSource)
+                .where(CalendarSource.id.in_(due))
+                .values(next_sync_at=now + timedelta(seconds=CALENDAR_SYNC_SECONDS))
+                .returning(CalendarSource.id)
+                .execution_options(synchronize_session=False)
+            )
+            source_ids = list(result.scalars().all())
+            await db.commit()
+
+        for source_id in source_ids:
+            async with SessionLocal() as db:
+                source = await db.get(CalendarSource, source_id)
+                if source is None:
+                    continue
+                try:
+                    await self.sync_source(db, source)
+                except Exception as e:
+                    await db.rollback()
+                    logger.error(f"Calendar {source_id} sync failed: {e}")
+                    source = await db.get(CalendarSource, source_id)
+                    if source is not None:
+                        source.last_error = str(e)[:500]
+                        await db.commit()
+
+
+# Global instance
+calendar_ingestor = CalendarIngestor()
@@ -0,0 +1,141 @@
+"""
+Docker Engine Client
+Talks to the Docker Engine API directly (unix socket or tcp://) over one
+pooled async HTTP client, so bot-worker containers are created, watched and
+removed without forking a docker CLI per meeting.
+"""
+import json
+import logging
+import struct
+from typing import AsyncIterator, Dict, List, Optional
+from urllib.parse import urlparse
+
+import httpx
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Config
+DOCKER_API_VERSION = "v1.41"  # Docker 20.10+
+MAX_CONNECTIONS = 50  # Each followed log stream holds one
+REQUEST_TIMEOUT_SECONDS = 30
+
+# Label carried by every bot container; events and reconciliation filter on it
+MEETING_LABEL = "meetborg.meeting_id"
+
+
+class DockerEngineError(Exception):
+    """Non-2xx response from the Docker Engine API"""
+
+    def __init__(self, status_code: int, message: str):
+        super().__init__(f"Docker Engine API error {status_code}: {message}")
+        self.status_code = status_code
+
+
+class DockerEngine:
+    """Minimal async Docker Engine API client for bot-worker containers"""
+
+    def __init__(self, docker_host: str):
+        self.docker_host = docker_host
+        self._client: Optional[httpx.AsyncClient] = None
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        if self._client is None:
+            url = urlparse(self.docker_host)
+            limits = httpx.Limits(max_connections=MAX_CONNECTIONS, max_keepalive_connections=10)
+            if url.scheme == "unix":
+                transport = httpx.AsyncHTTPTransport(uds=url.path, limits=limits)
+                base_url = f"http://docker/{DOCKER_API_VERSION}"
+            else:
+                transport = httpx.AsyncHTTPTransport(limits=limits)
+                base_url = f"http://{url.netloc}/{DOCKER_API_VERSION}"
+            self._client = httpx.AsyncClient(
+                transport=transport,
+                base_url=base_url,
+                timeout=REQUEST_TIMEOUT_SECONDS,
+            )
+        return self._client
+
+    async def close(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def _request(self, method: str, path: str, **kwargs) -> httpx.Response:
+        response = await self.client.request(method, path, **kwargs)
+        if response.status_code >= 400:
+            try:
+                message = response.json().get("message", response.text)
+            except ValueError:
+                message = response.text
+            raise DockerEngineError(response.status_code, message)
+        return response
+
+    # ── Containers ─────────────────────────────────────────────────────────────
+
+    async def create_container(self, name: str, config: dict) -> str:
+        """Create a container; returns its ID."""
+        response = await self._request("POST", "/containers/create", params={"name": name}, json=config)
+        return response.json()["Id"]
+
+    async def start_container(self, container_id: str):
+        await self._request("POST", f"/containers/{container_id}/start")
+
+    async def inspect_container(self, container_id: str) -> Optional[dict]:
+        """Container details, or None if it doesn't exist."""
+        try:
+            response = await self._request("GET", f"/containers/{container_id}/json")
+        except DockerEngineError as e:
+            if e.status_code == 404:
+                return None
+            raise
+        return response.json()
+
+    async def remove_container(self, container_id: str, force: bool = False):
+        try:
+            await self._request("DELETE", f"/containers/{container_id}", params={"force": str(force).lower()})
+        except DockerEngineError as e:
+            if e.status_code != 404:
+                raise
+
+    # ── Streams ────────────────────────────────────────────────────────────────
+
+    async def stream_logs(self, container_id: str, since: int = 0) -> AsyncIterator[bytes]:
+        """
+        Follow a container's stdout+stderr until it exits.
+        Containers run without a TTY, so the stream is multiplexed: each frame
+        is an 8-byte header (stream type, 3 zero bytes, big-endian length).
+        """
+        params = {"follow": "true", "stdout": "true", "stderr": "true", "since": str(since)}
+        async with self.client.stream(
+            "GET", f"/containers/{container_id}/logs", params=params, timeout=None
+        ) as response:
+            if response.status_code >= 400:
+                raise DockerEngineError(response.status_code, (await response.aread()).decode(errors="replace"))
+            buffer = b""
+            async for chunk in response.aiter_raw():
+                buffer += chunk
+                while len(buffer) >= 8:
+                    _, length = struct.unpack(">BxxxL", buffer[:8])
+                    if len(buffer) < 8 + length:
+                        break
+                    yield buffer[8:8 + length]
+                    buffer = buffer[8 + length:]
+
+    async def stream_events(self, filters: Dict[str, List[str]], since: Optional[int] = None) -> AsyncIterator[dict]:
+        """Follow engine events matching the filters (one JSON object per line)."""
+        params = {"filters": json.dumps(filters)}
+        if since is not None:
+            params["since"] = str(since)
+        async with self.client.stream("GET", "/events", params=params, timeout=None) as response:
+            if response.status_code >= 400:
+                raise DockerEngineError(response.status_code, (await response.aread()).decode(errors="replace"))
+            async for line in response.aiter_lines():
+                if line.strip():
+                    yield json.loads(line)
+
+
+# Global instance
+docker_engine = DockerEngine(settings.DOCKER_HOST)
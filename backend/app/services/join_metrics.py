@@ -0,0 +1,100 @@
+"""
+Join Latency Metrics
+The join lifecycle as timed stages between Meeting timestamps, exported as
+Prometheus histograms (observed live) and as per-platform percentiles over
+recent history (computed in Postgres).
+
+    scheduled → claimed → bot started → browser ready → lobby → admitted → ended
+"""
+import logging
+from datetime import datetime, timedelta
+from typing import Dict, List, Tuple
+
+from prometheus_client import Histogram
+from sqlalchemy import select, func, and_, extract
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.meeting import Meeting
+
+logger = logging.getLogger(__name__)
+
+# (stage, start column, end column). join_lag is the headline number: how
+# long after its scheduled start a bot was let into the meeting.
+STAGES: List[Tuple[str, str, str]] = [
+    ("schedule_to_claim", "scheduled_time", "claimed_at"),
+    ("claim_to_start", "claimed_at", "bot_started_at"),
+    ("start_to_browser_ready", "bot_started_at", "browser_ready_at"),
+    ("browser_ready_to_lobby", "browser_ready_at", "lobby_reached_at"),
+    ("lobby_to_admitted", "lobby_reached_at", "admitted_at"),
+    ("join_lag", "scheduled_time", "admitted_at"),
+    ("time_in_meeting", "admitted_at", "ended_at"),
+]
+PERCENTILES = (0.5, 0.95, 0.99)
+
+# Bots launch ahead of the scheduled start, so schedule-relative stages go negative
+JOIN_STAGE_SECONDS = Histogram(
+    "meetborg_join_stage_seconds",
+    "Duration of each join lifecycle stage",
+    ["platform", "stage"],
+    buckets=(
+        -300, -120, -60, -30, -10, 0, 1, 2, 5, 10, 20, 30, 45, 60, 90,
+        120, 180, 300, 600, 1800, 3600, 7200, 14400,
+    ),
+)
+
+
+def observe_stages(meeting: Meeting, *ended: str):
+    """
+    Record every stage that ends at one of the given timestamp columns,
+    if both of its timestamps are set. Call right after setting them.
+    """
+    platform = meeting.platform.value if meeting.platform else "unknown"
+    for stage, start_attr, end_attr in STAGES:
+        if end_attr not in ended:
+            continue
+        start, end = getattr(meeting, start_attr), getattr(meeting, end_attr)
+        if start is None or end is None:
+            continue
+        try:
+            JOIN_STAGE_SECONDS.labels(platform=platform, stage=stage).observe((end - start).total_seconds())
+        except Exception as e:
+            logger.warning(f"Failed to record join stage {stage}: {e}")
+
+
+async def join_latency_percentiles(db: AsyncSession, days: int = 7) -> Dict[str, Dict[str, dict]]:
+    """
+    p50/p95/p99 (seconds) and sample count per platform and stage over
+    meetings whose bot started in the last `days` days.
+    """
+    since = datetime.utcnow() - timedelta(days=days)
+    stats: Dict[str, Dict[str, dict]] = {}
+
+    for stage, start_attr, end_attr in STAGES:
+        start_col = getattr(Meeting, start_attr)
+        end_col = getattr(Meeting, end_attr)
+        seconds = extract("epoch", end_col - start_col)
+        result = await db.execute(
+            select(
+                Meeting.platform,
+                func.count(),
+                *[func.percentile_cont(q).within_group(seconds) for q in PERCENTILES],
+            )
+            .where(
+                and_(
+                    Meeting.bot_started_at >= since,
+                    start_col.isnot(None),
+                    end_col.isnot(None)
+                )
+            )
+            .group_by(Meeting.platform)
+        )
+        for platform, count, *values in result.all():
+            stats.setdefault(platform.value, {})[stage] = {
+                "count": count,
+                **{
+                    f"p{int(q * 100)}": round(float(v), 1)
+                    for q, v in zip(PERCENTILES, values)
+                },
+            }
+
+    return stats
@@ -0,0 +1,67 @@
+"""
+Join Retry Policy
+Decides whether a failed join attempt is retried and when. Shared by the
+scheduler (launch failures) and the bot supervisor (crashed or lost bots).
+"""
+import logging
+import random
+from datetime import datetime, timedelta
+
+from app.models.meeting import Meeting, MeetingStatus
+
+logger = logging.getLogger(__name__)
+
+# Config
+MAX_JOIN_ATTEMPTS = 3
+RETRY_BASE_SECONDS = 20  # Backoff before the 2nd attempt; doubles per attempt
+RETRY_MAX_SECONDS = 300
+
+
+def retry_delay_seconds(attempt: int) -> float:
+    """
+    Backoff after the given (1-based) failed attempt. Half of it is fixed and
+    half random, so bots that failed together don't all retry together.
+    """
+    backoff = min(RETRY_MAX_SECONDS, RETRY_BASE_SECONDS * 2 ** max(0, attempt - 1))
+    return backoff / 2 + random.uniform(0, backoff / 2)
+
+
+def meeting_over(meeting: Meeting, now: datetime) -> bool:
+    """Past scheduled_time + duration — no point joining any more."""
+    if meeting.scheduled_time is None:
+        return False
+    return now >= meeting.scheduled_time + timedelta(minutes=meeting.duration_minutes or 60)
+
+
+def fail_or_retry(meeting: Meeting, reason: str) -> bool:
+    """
+    Settle a failed join attempt on a loaded meeting (the caller commits).
+
+    While attempts remain and the meeting hasn't ended, it goes back to
+    SCHEDULED with a backed-off next_attempt_at and no claim, so any
+    scheduler instance can pick the retry up. Otherwise it is FAILED.
+
+    Returns:
+        True if a retry was scheduled
+    """
+    now = datetime.utcnow()
+    attempts = meeting.join_attempts or 0
+    meeting.join_successful = reason
+    meeting.updated_at = now
+
+    if attempts < MAX_JOIN_ATTEMPTS and not meeting_over(meeting, now):
+        delay = retry_delay_seconds(attempts)
+        meeting.status = MeetingStatus.SCHEDULED
+        meeting.next_attempt_at = now + timedelta(seconds=delay)
+        meeting.claimed_by = None
+        meeting.claim_expires_at = None
+        logger.warning(
+            f"Join attempt {attempts}/{MAX_JOIN_ATTEMPTS} for meeting {meeting.id} failed "
+            f"({reason}) — retrying in {delay:.0f}s"
+        )
+        return True
+
+    meeting.status = MeetingStatus.FAILED
+    meeting.next_attempt_at = None
+    logger.warning(f"Giving up on meeting {meeting.id} after {attempts} attempt(s): {reason}")
+    return False
@@ -0,0 +1,100 @@
+"""
+Adaptive Join Lead Time
+Learns how long each platform's bot needs from process start to reaching the
+lobby, and tells the scheduler how far ahead of scheduled_time to launch.
+
+Launch→lobby is the part we control; lobby→admitted depends on the host, so
+it is recorded but not used to move the launch earlier.
+"""
+import logging
+import math
+from typing import Dict, List, Optional
+
+from sqlalchemy import select, and_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.meeting import Meeting, PlatformType
+
+logger = logging.getLogger(__name__)
+
+# Config
+SAMPLE_SIZE = 50  # Most recent joins per platform
+MIN_SAMPLES = 5  # Below this, keep the default lead
+PERCENTILE = 0.95
+MARGIN_SECONDS = 15
+MIN_LEAD_SECONDS = 20
+MAX_LEAD_SECONDS = 300
+
+
+def percentile(values: List[float], q: float) -> float:
+    """Nearest-rank percentile of a non-empty list"""
+    ordered = sorted(values)
+    rank = max(1, math.ceil(q * len(ordered)))
+    return ordered[rank - 1]
+
+
+class LeadTimeEstimator:
+    """Per-platform launch lead times, refreshed from recent join history"""
+
+    def __init__(self, default_seconds: float):
+        self.default_seconds = default_seconds
+        self._leads: Dict[PlatformType, float] = {}
+        self._samples: Dict[PlatformType, int] = {}
+
+    def lead_seconds(self, platform: Optional[PlatformType]) -> float:
+        return self._leads.get(platform, self.default_seconds)
+
+    async def refresh(self, db: AsyncSession) -> bool:
+        """
+        Recompute every platform's lead from its last SAMPLE_SIZE joins.
+
+        Returns:
+            True if any lead changed
+        """
+        leads: Dict[PlatformType, float] = {}
+        samples: Dict[PlatformType, int] = {}
+
+        for platform in PlatformType:
+            result = await db.execute(
+                select(Meeting.bot_started_at, Meeting.lobby_reached_at)
+                .where(
+                    and_(
+                        Meeting.platform == platform,
+                        Meeting.bot_started_at.isnot(None),
+                        Meeting.lobby_reached_at.isnot(None),
+                        Meeting.lobby_reached_at >= Meeting.bot_started_at
+                    )
+                )
+                .order_by(Meeting.bot_started_at.desc())
+                .limit(SAMPLE_SIZE)
+            )
+            durations = [
+                (lobby - started).total_seconds()
+                for started, lobby in result.all()
+            ]
+            samples[platform] = len(durations)
+            if len(durations) < MIN_SAMPLES:
+                continue
+
+            lead = percentile(durations, PERCENTILE) + MARGIN_SECONDS
+            leads[platform] = min(MAX_LEAD_SECONDS, max(MIN_LEAD_SECONDS, lead))
+
+        changed = leads != self._leads
+        self._leads = leads
+        self._samples = samples
+        if changed:
+            logger.info(
+                "Join lead times updated: "
+                + ", ".join(f"{p.value}={s:.0f}s" for p, s in leads.items())
+            )
+        return changed
+
+    def stats(self) -> dict:
+        return {
+            platform.value: {
+                "lead_seconds": round(self.lead_seconds(platform), 1),
+                "samples": self._samples.get(platform, 0),
+                "learned": platform in self._leads,
+            }
+            for platform in PlatformType
+        }
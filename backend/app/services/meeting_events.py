@@ -0,0 +1,161 @@
+"""
+Meeting Status Events
+Pushes meeting status transitions to connected clients on every API replica.
+
+Publishing: any flush that changes Meeting.status issues pg_notify on the
+same transaction, so an event goes out only if the change commits. Paths
+that change status with a Core UPDATE call publish_status() themselves;
+bulk INSERT ... RETURNING (which skips the flush) calls publish_statuses().
+
+Delivery: each replica holds one LISTEN connection and fans notifications
+out to per-user subscriber queues (the SSE stream endpoint reads these).
+"""
+import asyncio
+import json
+import logging
+from datetime import datetime
+from typing import Dict, Optional, Set
+
+import asyncpg
+from sqlalchemy import event, inspect, text
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.meeting import Meeting
+
+logger = logging.getLogger(__name__)
+
+# Config
+CHANNEL = "meeting_events"
+SUBSCRIBER_QUEUE_SIZE = 100  # A client this far behind is told to resync instead
+RECONNECT_MAX_SECONDS = 30
+
+# Sent to subscribers when events may have been missed (slow client, lost
+# LISTEN connection): they should refetch rather than trust their state
+RESYNC = {"type": "resync"}
+
+_NOTIFY = text("SELECT pg_notify(:channel, :payload)")
+
+
+def _payload(meeting_id: str, user_id, status, previous=None) -> str:
+    return json.dumps({
+        "type": "status",
+        "id": str(meeting_id),
+        "user_id": str(user_id),
+        "status": getattr(status, "value", status),
+        "previous": getattr(previous, "value", previous),
+        "at": datetime.utcnow().isoformat(),
+    })
+
+
+async def publish_status(db, meeting_id: str, user_id, status):
+    """Notify a status change made with a Core UPDATE (delivered on commit)."""
+    await db.execute(_NOTIFY, {"channel": CHANNEL, "payload": _payload(meeting_id, user_id, status)})
+
+
+async def publish_statuses(db, meetings):
+    """publish_status() for every row of a bulk INSERT/UPDATE, in one executemany."""
+    if meetings:
+        await db.execute(_NOTIFY, [
+            {"channel": CHANNEL, "payload": _payload(m.id, m.user_id, m.status)} for m in meetings
+        ])
+
+
+@event.listens_for(Session, "after_flush")
+def _notify_status_changes(session, flush_context):
+    """ORM status changes: NOTIFY inside the flushing transaction."""
+    for obj in list(session.dirty) + list(session.new):
+        if not isinstance(obj, Meeting):
+            continue
+        history = inspect(obj).attrs.status.history
+        if not history.added:
+            continue
+        previous = history.deleted[0] if history.deleted else None
+        session.connection().execute(_NOTIFY, {
+            "channel": CHANNEL,
+            "payload": _payload(obj.id, obj.user_id, history.added[0], previous),
+        })
+
+
+class MeetingEventBroker:
+    """One LISTEN connection per process, fanned out to per-user queues"""
+
+    def __init__(self):
+        self._subscribers: Dict[str, Set[asyncio.Queue]] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.get_event_loop().create_task(self._listen())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def subscribe(self, user_id: str) -> asyncio.Queue:
+        queue: asyncio.Queue = asyncio.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+        self._subscribers.setdefault(str(user_id), set()).add(queue)
+        return queue
+
+    def unsubscribe(self, user_id: str, queue: asyncio.Queue):
+        queues = self._subscribers.get(str(user_id))
+        if queues is not None:
+            queues.discard(queue)
+            if not queues:
+                del self._subscribers[str(user_id)]
+
+    def _deliver(self, queue: asyncio.Queue, message: dict):
+        try:
+            queue.put_nowait(message)
+        except asyncio.QueueFull:
+            # Too far behind: replace the backlog with a single resync
+            while not queue.empty():
+                queue.get_nowait()
+            queue.put_nowait(RESYNC)
+
+    def _on_notify(self, connection, pid, channel, payload):
+        try:
+            message = json.loads(payload)
+        except ValueError:
+            logger.warning(f"Ignoring malformed {CHANNEL} payload")
+            return
+        for queue in list(self._subscribers.get(message.get("user_id"), ())):
+            self._deliver(queue, message)
+
+    def _resync_all(self):
+        for queues in self._subscribers.values():
+            for queue in list(queues):
+                self._deliver(queue, RESYNC)
+
+    async def _listen(self):
+        delay = 1
+        while True:
+            connection = None
+            try:
+                connection = await asyncpg.connect(settings.DATABASE_URL)
+                await connection.add_listener(CHANNEL, self._on_notify)
+                logger.info(f"Listening for {CHANNEL}")
+                delay = 1
+                # Anything published while we were disconnected is gone
+                self._resync_all()
+                while not connection.is_closed():
+                    await asyncio.sleep(5)
+            except asyncio.CancelledError:
+                if connection is not None:
+                    await connection.close()
+                raise
+            except Exception as e:
+                logger.warning(f"{CHANNEL} listener disconnected: {e}")
+            if connection is not None and not connection.is_closed():
+                await connection.close()
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, RECONNECT_MAX_SECONDS)
+
+
+# Global instance
+meeting_event_broker = MeetingEventBroker()
@@ -1,82 +1,433 @@
 """
 Meeting Auto-Join Scheduler
-Polls database for upcoming meetings and triggers the join bot
+Keeps an in-memory timer heap of upcoming joins and fires each one at its
+deadline. A slow reconciliation sweep against the database remains as a
+safety net for anything the heap missed (e.g. rows edited outside the API).
+
+Safe to run in several processes at once: a join only happens after the
+meeting row has been claimed with FOR UPDATE SKIP LOCKED under a lease.
 """
 import asyncio
-import subprocess
-import sys
+import heapq
 import logging
+import os
+import socket
+import uuid
 from datetime import datetime, timedelta
-from sqlalchemy import select, and_, or_
+from typing import Dict, List, Optional, Tuple
+from sqlalchemy import select, update, and_, or_
 from sqlalchemy.ext.asyncio import AsyncSession
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.interval import IntervalTrigger
 
 from app.db.session import AsyncSessionLocal as SessionLocal
-from app.models.meeting import Meeting, MeetingStatus
-from app.utils.platform import detect_platform
+from app.models.meeting import Meeting, MeetingStatus, PlatformType
+from app.services.admission import admission_controller
+from app.services.bot_launcher import launch_bot
+from app.services.bot_supervisor import bot_supervisor, HEARTBEAT_SECONDS, RECONCILE_SECONDS
+from app.services.calendar_ingest import calendar_ingestor
+from app.services.join_retry import fail_or_retry
+from app.services.join_metrics import observe_stages
+from app.services.lead_time import LeadTimeEstimator
+from app.services.meeting_events import publish_status
 
 logger = logging.getLogger(__name__)
 
 # Config
-POLL_INTERVAL_SECONDS = 30
-JOIN_BUFFER_SECONDS = 60  # Join 60 seconds before scheduled time
-MAX_JOIN_ATTEMPTS = 3
+RECONCILE_INTERVAL_SECONDS = 300  # Safety-net sweep; the timer heap does the real work
+JOIN_BUFFER_SECONDS = 60  # Default lead until a platform has enough join history
+LEAD_REFRESH_SECONDS = 600  # How often per-platform lead times are re-learned
+MISSED_JOIN_GRACE_MINUTES = 15  # Don't join meetings that are too old
+CLAIM_LEASE_SECONDS = 120  # A crashed instance's claims become claimable after this
+CLAIM_RENEW_SECONDS = 30
+CALENDAR_POLL_SECONDS = 60  # How often feeds due for a sync are looked for
+
 
 class AutoJoinScheduler:
     def __init__(self):
         self.scheduler = AsyncIOScheduler()
         self.scheduler.add_job(
             self.check_upcoming_meetings,
-            IntervalTrigger(seconds=POLL_INTERVAL_SECONDS),
+            IntervalTrigger(seconds=RECONCILE_INTERVAL_SECONDS),
             id='check_meetings',
             replace_existing=True
         )
-        self.running_processes = {}  # meeting_id: subprocess
+        self.scheduler.add_job(
+            self.renew_claims,
+            IntervalTrigger(seconds=CLAIM_RENEW_SECONDS),
+            id='renew_claims',
+            replace_existing=True
+        )
+        self.scheduler.add_job(
+            self.refresh_lead_times,
+            IntervalTrigger(seconds=LEAD_REFRESH_SECONDS),
+            id='refresh_lead_times',
+            replace_existing=True
+        )
+        self.scheduler.add_job(
+            bot_supervisor.heartbeat,
+            IntervalTrigger(seconds=HEARTBEAT_SECONDS),
+            id='bot_heartbeat',
+            replace_existing=True
+        )
+        self.scheduler.add_job(
+            self.reconcile_bots,
+            IntervalTrigger(seconds=RECONCILE_SECONDS),
+            id='reconcile_bots',
+            replace_existing=True
+        )
+        self.scheduler.add_job(
+            self.sync_calendars,
+            IntervalTrigger(seconds=CALENDAR_POLL_SECONDS),
+            id='sync_calendars',
+            replace_existing=True
+        )
+
+        # Bots that fail mid-meeting come back here to have their retry armed
+        bot_supervisor.on_requeue = self.schedule_meeting
+        # Meetings created or moved by a calendar sync
+        calendar_ingestor.on_meetings_changed = self.schedule_meeting
+
+        # Identifies this process in Meeting.claimed_by
+        self.instance_id = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+
+        # Timer heap of (deadline, meeting_id). Entries are never removed in
+        # place: self._deadlines holds the live deadline per meeting and any
+        # heap entry that disagrees with it is stale and skipped when popped.
+        self._heap: List[Tuple[datetime, str]] = []
+        self._deadlines: Dict[str, datetime] = {}
+        # meeting_id: (scheduled_time, platform, next_attempt_at) — lets
+        # deadlines be re-keyed when the learned lead times change
+        self._timed: Dict[str, Tuple[Optional[datetime], PlatformType, Optional[datetime]]] = {}
+        self.lead_times = LeadTimeEstimator(JOIN_BUFFER_SECONDS)
+        self._wakeup: Optional[asyncio.Event] = None
+        self._timer_task: Optional[asyncio.Task] = None
 
     def start(self):
         """Start the scheduler"""
         if not self.scheduler.running:
             self.scheduler.start()
+            self._wakeup = asyncio.Event()
+            self._timer_task = asyncio.get_event_loop().create_task(self._run_timers())
             logger.info("Auto-join scheduler started")
 
     def stop(self):
         """Stop the scheduler"""
         if self.scheduler.running:
             self.scheduler.shutdown()
+            if self._timer_task:
+                self._timer_task.cancel()
+                self._timer_task = None
             logger.info("Auto-join scheduler stopped")
 
-    async def check_upcoming_meetings(self):
+    # ── Timer heap ─────────────────────────────────────────────────────────────
+
+    def schedule_meeting(self, meeting: Meeting):
         """
-        Check for meetings that need to be joined
+        Add or move the join timer for a meeting.
+        Called by the create/update endpoints and when a failed join is
+        requeued; meetings that are not SCHEDULED, or have neither a
+        scheduled_time nor a pending retry, simply drop their timer.
+        """
+        if meeting.status != MeetingStatus.SCHEDULED or (
+            meeting.scheduled_time is None and meeting.next_attempt_at is None
+        ):
+            self.cancel_meeting(meeting.id)
+            return
+
+        self._timed[meeting.id] = (meeting.scheduled_time, meeting.platform, meeting.next_attempt_at)
+        self._arm(meeting.id)
+
+    def _arm(self, meeting_id: str):
+        """
+        Push the meeting's deadline: scheduled_time minus its platform's lead,
+        but never before a pending retry's next_attempt_at.
+        """
+        scheduled_time, platform, next_attempt_at = self._timed[meeting_id]
+        deadline = next_attempt_at
+        if scheduled_time is not None:
+            lead_deadline = scheduled_time - timedelta(seconds=self.lead_times.lead_seconds(platform))
+            deadline = max(lead_deadline, next_attempt_at or lead_deadline)
+        if self._deadlines.get(meeting_id) == deadline:
+            return
+
+        self._deadlines[meeting_id] = deadline
+        heapq.heappush(self._heap, (deadline, meeting_id))
+
+        # Wake the timer loop only if this is now the earliest deadline
+        if self._wakeup is not None and self._heap[0][1] == meeting_id:
+            self._wakeup.set()
+
+    def cancel_meeting(self, meeting_id: str):
+        """Drop the join timer for a meeting (the heap entry goes stale)."""
+        self._deadlines.pop(meeting_id, None)
+        self._timed.pop(meeting_id, None)
+
+    async def reconcile_bots(self):
+        """Re-attach surviving bots and fail meetings whose bots were lost."""
+        try:
+            await bot_supervisor.reconcile()
+        except Exception as e:
+            logger.error(f"Bot reconciliation failed: {e}")
+
+    async def sync_calendars(self):
+        """Ingest ICS feeds that are due for a sync."""
+        try:
+            await calendar_ingestor.sync_due()
+        except Exception as e:
+            logger.error(f"Calendar sync failed: {e}")
+
+    async def refresh_lead_times(self):
+        """Re-learn per-platform lead times and move armed timers to match."""
+        async with SessionLocal() as db:
+            try:
+                changed = await self.lead_times.refresh(db)
+            except Exception as e:
+                logger.error(f"Failed to refresh join lead times: {e}")
+                return
+        if changed:
+            for meeting_id in list(self._timed):
+                self._arm(meeting_id)
+
+    async def load_pending_meetings(self):
+        """
+        Populate the timer heap from the database.
+        Runs once at startup; afterwards the endpoints keep the heap current.
         """
-        logger.info("Checking for upcoming meetings...")
-        
         async with SessionLocal() as db:
             try:
-                # Calculate time window
                 now = datetime.utcnow()
-                join_window_start = now
-                join_window_end = now + timedelta(seconds=JOIN_BUFFER_SECONDS)
-                
-                # Query meetings that are:
-                # 1. Scheduled
-                # 2. Start within buffer window OR started recently but missed
-                # 3. Have not been joined yet
-                query = select(Meeting).where(
-                    and_(
-                        Meeting.status == MeetingStatus.SCHEDULED,
-                        Meeting.scheduled_time <= join_window_end,
-                        # Don't join meetings that are too old (e.g. > 15 mins past start)
-                        Meeting.scheduled_time >= now - timedelta(minutes=15)
+                result = await db.execute(
+                    select(Meeting).where(
+                        and_(
+                            Meeting.status == MeetingStatus.SCHEDULED,
+                            or_(
+                                Meeting.scheduled_time >= now - timedelta(minutes=MISSED_JOIN_GRACE_MINUTES),
+                                Meeting.next_attempt_at.isnot(None)
+                            )
+                        )
                     )
                 )
-                
-                result = await db.execute(query)
                 meetings = result.scalars().all()
-                
                 for meeting in meetings:
-                    await self.trigger_join(meeting, db)
+                    self.schedule_meeting(meeting)
+                logger.info(f"Loaded {len(meetings)} pending meeting(s) into join timers")
+            except Exception as e:
+                logger.error(f"Failed to load pending meetings: {e}")
+
+    async def _run_timers(self):
+        """Sleep until the earliest deadline, then fire every join that is due."""
+        # Re-attach bots that outlived the previous API process first, so
+        # they hold their admission slots before anything new launches
+        await self.reconcile_bots()
+        await self.refresh_lead_times()
+        await self.load_pending_meetings()
+        # Pick up anything already due, including QUEUED meetings orphaned by
+        # an instance that went down (their claim lease has to expire first)
+        await self.check_upcoming_meetings()
+
+        while True:
+            self._wakeup.clear()
+
+            # Discard stale entries left behind by updates and cancellations
+            while self._heap and self._deadlines.get(self._heap[0][1]) != self._heap[0][0]:
+                heapq.heappop(self._heap)
+
+            if not self._heap:
+                await self._wakeup.wait()
+                continue
+
+            delay = (self._heap[0][0] - datetime.utcnow()).total_seconds()
+            if delay > 0:
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=delay)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            deadline, meeting_id = heapq.heappop(self._heap)
+            self.cancel_meeting(meeting_id)
+            try:
+                await self.fire_join(meeting_id)
+            except Exception as e:
+                logger.error(f"Join timer for {meeting_id} failed: {e}")
+
+    async def fire_join(self, meeting_id: str):
+        """
+        Claim a meeting whose timer expired and join it if it is still due.
+        Every instance arms the same timers; the claim makes sure only one
+        of them launches the bot.
+        """
+        async with SessionLocal() as db:
+            claimed = await self.claim_due_meetings(db, meeting_id=meeting_id)
+            if claimed:
+                await self._join_claimed(claimed, db)
+
+    # ── Claims ─────────────────────────────────────────────────────────────────
+
+    def _within_lead(self, now: datetime):
+        """scheduled_time falls inside the meeting's platform lead window."""
+        return or_(*[
+            and_(
+                Meeting.platform == platform,
+                Meeting.scheduled_time <= now + timedelta(seconds=self.lead_times.lead_seconds(platform))
+            )
+            for platform in PlatformType
+        ])
+
+    def _claimable(self, now: datetime):
+        """Rows no live instance is working on: unclaimed or lease expired."""
+        return and_(
+            Meeting.status.in_([MeetingStatus.SCHEDULED, MeetingStatus.QUEUED]),
+            or_(
+                Meeting.claimed_by.is_(None),
+                Meeting.claim_expires_at < now
+            )
+        )
+
+    def due_query(self, now: datetime):
+        """
+        SELECT id of meetings due for a join at `now`:
+        1. Scheduled, or queued by an instance that has since died
+        2. Start within their platform's lead window OR started recently but missed,
+           or are retrying a failed join
+        3. Past their retry backoff, if any
+        4. Not claimed by a live instance
+        Served by the partial ix_meetings_due / ix_meetings_retry_due indexes.
+        """
+        return select(Meeting.id).where(
+            and_(
+                self._claimable(now),
+                or_(
+                    Meeting.next_attempt_at.is_(None),
+                    Meeting.next_attempt_at <= now
+                ),
+                or_(
+                    Meeting.status == MeetingStatus.QUEUED,
+                    # Retries carry on past the grace window (until the meeting ends)
+                    Meeting.next_attempt_at.isnot(None),
+                    and_(
+                        self._within_lead(now),
+                        # Don't join meetings that are too old (e.g. > 15 mins past start)
+                        Meeting.scheduled_time >= now - timedelta(minutes=MISSED_JOIN_GRACE_MINUTES)
+                    )
+                )
+            )
+        )
+
+    async def claim_due_meetings(self, db: AsyncSession, meeting_id: Optional[str] = None) -> List[str]:
+        """
+        Atomically claim due meetings for this instance.
+
+        UPDATE ... WHERE id IN (SELECT ... FOR UPDATE SKIP LOCKED) RETURNING id
+        — concurrent schedulers skip rows another instance is claiming rather
+        than blocking on them or claiming them twice.
+
+        Returns:
+            IDs of the meetings this instance now owns
+        """
+        now = datetime.utcnow()
+        due = self.due_query(now)
+        if meeting_id is not None:
+            due = due.where(Meeting.id == meeting_id)
+        due = due.with_for_update(skip_locked=True)
+
+        result = await db.execute(
+            update(Meeting)
+            .where(Meeting.id.in_(due))
+            .values(
+                claimed_by=self.instance_id,
+                claim_expires_at=now + timedelta(seconds=CLAIM_LEASE_SECONDS),
+                claimed_at=now
+            )
+            .returning(Meeting.id)
+            .execution_options(synchronize_session=False)
+        )
+        claimed = list(result.scalars().all())
+        await db.commit()
+
+        if claimed:
+            logger.info(f"Claimed {len(claimed)} due meeting(s) as {self.instance_id}")
+        return claimed
+
+    async def claim_meeting(self, db: AsyncSession, meeting_id: str) -> bool:
+        """
+        Claim one meeting for a manual join, whatever its schedule.
+        Fails only if another live instance is about to launch or has
+        queued it.
+        """
+        now = datetime.utcnow()
+        result = await db.execute(
+            update(Meeting)
+            .where(
+                and_(
+                    Meeting.id == meeting_id,
+                    or_(
+                        Meeting.status.notin_([MeetingStatus.SCHEDULED, MeetingStatus.QUEUED]),
+                        Meeting.claimed_by.is_(None),
+                        Meeting.claimed_by == self.instance_id,
+                        Meeting.claim_expires_at < now
+                    )
+                )
+            )
+            .values(
+                claimed_by=self.instance_id,
+                claim_expires_at=now + timedelta(seconds=CLAIM_LEASE_SECONDS),
+                claimed_at=now
+            )
+            .returning(Meeting.id)
+            .execution_options(synchronize_session=False)
+        )
+        claimed = result.scalar_one_or_none() is not None
+        await db.commit()
+        return claimed
+
+    async def renew_claims(self):
+        """Extend the lease on every meeting this instance still has to launch."""
+        async with SessionLocal() as db:
+            try:
+                await db.execute(
+                    update(Meeting)
+                    .where(
+                        and_(
+                            Meeting.claimed_by == self.instance_id,
+                            Meeting.status.in_([MeetingStatus.SCHEDULED, MeetingStatus.QUEUED])
+                        )
+                    )
+                    .values(
+                        claim_expires_at=datetime.utcnow() + timedelta(seconds=CLAIM_LEASE_SECONDS),
+                        # A lease renewal isn't a change clients care about:
+                        # keep updated_at (and the list ETag) as they were
+                        updated_at=Meeting.updated_at
+                    )
+                    .execution_options(synchronize_session=False)
+                )
+                await db.commit()
+            except Exception as e:
+                logger.error(f"Failed to renew meeting claims: {e}")
+
+    async def _join_claimed(self, meeting_ids: List[str], db: AsyncSession):
+        result = await db.execute(select(Meeting).where(Meeting.id.in_(meeting_ids)))
+        for meeting in result.scalars().all():
+            await self.trigger_join(meeting, db)
+
+    # ── Reconciliation sweep ───────────────────────────────────────────────────
+
+    async def check_upcoming_meetings(self):
+        """
+        Safety-net sweep for meetings that need to be joined but have no
+        timer (created outside the API or on another instance, missed while
+        the process was down, or orphaned by a crashed instance)
+        """
+        logger.info("Reconciling upcoming meetings...")
+        
+        async with SessionLocal() as db:
+            try:
+                claimed = await self.claim_due_meetings(db)
+                for meeting_id in claimed:
+                    self.cancel_meeting(meeting_id)
+                if claimed:
+                    await self._join_claimed(claimed, db)
                     
             except Exception as e:
                 logger.error(f"Error in scheduler loop: {e}")
@@ -92,47 +443,94 @@ class AutoJoinScheduler:
         logger.info(f"Triggering auto-join for meeting: {title} ({url})")
         
         try:
-            # Update status to IN_PROGRESS
-            meeting.status = MeetingStatus.IN_PROGRESS
-            meeting.join_attempted_at = datetime.utcnow()
-            await db.commit()
-            await db.refresh(meeting)
-            
-            # Launch join script based on platform
-            platform = detect_platform(url)
-            logger.info(f"Detected platform: {platform} for meeting {meeting_id}")
-            
-            if platform == "google_meet":
-                cmd = [sys.executable, "simple_join.py", url, "--meeting-id", str(meeting_id), "--api-url", "http://localhost:8000/api/v1"]
-            elif platform == "zoom":
-                cmd = [sys.executable, "zoom_join.py", url, "--meeting-id", str(meeting_id), "--api-url", "http://localhost:8000/api/v1"]
-            elif platform == "microsoft_teams":
-                cmd = [sys.executable, "teams_join.py", url, "--meeting-id", str(meeting_id), "--api-url", "http://localhost:8000/api/v1"]
-            else:
-                logger.warning(f"Unknown platform for URL: {url}. Falling back to simple_join.py")
-                cmd = [sys.executable, "simple_join.py", url, "--meeting-id", str(meeting_id), "--api-url", "http://localhost:8000/api/v1"]
-            
-            # Note: In production, you might want to use a more robust task queue like Celery
-            # But for this MVP, a subprocess is sufficient
-            process = subprocess.Popen(
-                cmd,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                text=True
-            )
-            
-            # Store process reference (optional, for management)
-            self.running_processes[meeting_id] = process
-            
-            logger.info(f"Join process started for {meeting_id} (PID: {process.pid})")
-            
+            await self.request_join(meeting, db)
         except Exception as e:
+            # _start_bot has already requeued the meeting or marked it FAILED
             logger.error(f"Failed to trigger join for {meeting_id}: {e}")
             
-            # Revert status or mark as failed
-            meeting.status = MeetingStatus.FAILED
-            meeting.join_successful = f"Failed to launch bot: {str(e)}"
+    async def request_join(self, meeting: Meeting, db: AsyncSession) -> bool:
+        """
+        Ask the admission controller for a bot slot for this meeting.
+        Shared by the auto-join path and the manual join endpoint.
+
+        Returns:
+            True if the bot was launched now, False if the meeting was queued
+
+        Raises:
+            Exception: If the bot could not be launched
+        """
+        meeting_id = meeting.id
+        self.cancel_meeting(meeting_id)
+
+        admitted = await admission_controller.request(
+            meeting_id, meeting.scheduled_time, self._start_bot
+        )
+        if not admitted:
+            # Conditional so a slot that freed up while we awaited (and already
+            # moved the meeting to IN_PROGRESS), or a meeting that was
+            # completed/cancelled meanwhile, is not overwritten
+            result = await db.execute(
+                update(Meeting)
+                .where(
+                    and_(
+                        Meeting.id == meeting_id,
+                        Meeting.status.in_([MeetingStatus.SCHEDULED, MeetingStatus.QUEUED])
+                    )
+                )
+                .values(status=MeetingStatus.QUEUED, updated_at=datetime.utcnow())
+                .returning(Meeting.id)
+            )
+            if result.scalar_one_or_none() is not None:
+                await publish_status(db, meeting_id, meeting.user_id, MeetingStatus.QUEUED)
             await db.commit()
+        return admitted
+
+    async def _start_bot(self, meeting_id: str):
+        """
+        Launch the bot for a meeting that holds an admission slot.
+        Uses its own session: queued meetings are launched long after the
+        request that enqueued them has finished.
+        """
+        async with SessionLocal() as db:
+            result = await db.execute(select(Meeting).where(Meeting.id == meeting_id))
+            meeting = result.scalar_one_or_none()
+            if meeting is None or meeting.status in (MeetingStatus.CANCELLED, MeetingStatus.COMPLETED):
+                logger.info(f"Meeting {meeting_id} no longer needs a bot — releasing slot")
+                admission_controller.release(meeting_id)
+                return
+
+            try:
+                # Update status to IN_PROGRESS
+                meeting.status = MeetingStatus.IN_PROGRESS
+                meeting.join_attempts = (meeting.join_attempts or 0) + 1
+                meeting.next_attempt_at = None
+                meeting.join_attempted_at = datetime.utcnow()
+                # Fresh timeline for this launch; the bot reports the rest
+                meeting.bot_started_at = meeting.join_attempted_at
+                meeting.browser_ready_at = None
+                meeting.lobby_reached_at = None
+                meeting.admitted_at = None
+                meeting.ended_at = None
+                await db.commit()
+                observe_stages(meeting, "claimed_at", "bot_started_at")
+                
+                # The supervisor frees the slot and settles the status on exit
+                run = await launch_bot(meeting)
+                
+                logger.info(f"Join process started for {meeting_id} ({run.container_name or f'PID: {run.pid}'})")
+                
+            except Exception as e:
+                # Back off and retry, or mark as failed once attempts run out
+                reason = f"Failed to launch bot: {str(e)}"
+                retry = fail_or_retry(meeting, reason)
+                await db.commit()
+                try:
+                    await bot_supervisor.record_failed_launch(meeting_id, meeting.join_attempts, reason)
+                except Exception as record_error:
+                    logger.error(f"Failed to record launch failure for {meeting_id}: {record_error}")
+                if retry:
+                    self.schedule_meeting(meeting)
+                raise
 
 # Global instance
 scheduler = AutoJoinScheduler()
@@ -0,0 +1,101 @@
+"""
+Auth Benchmark — login throughput vs. latency of everything else.
+
+Hammers POST /auth/login with N concurrent clients for a fixed time while a
+probe keeps calling a cheap non-auth endpoint (GET /health by default) and
+records its latency. With bcrypt on the event loop the probe latency tracks
+the login load; with hashing off-loop it should stay flat.
+
+Usage (against a running backend with an existing user):
+    python bench_auth.py --username admin --password admin --concurrency 8 --duration 20
+    python bench_auth.py ... --baseline 5   # also measure the probe with no login load first
+"""
+import argparse
+import asyncio
+import statistics
+import time
+from typing import List
+
+import httpx
+
+
+def _percentile(values: List[float], q: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+def _report(name: str, latencies: List[float]):
+    if not latencies:
+        print(f"{name:<22} no samples")
+        return
+    ms = [l * 1000 for l in latencies]
+    print(
+        f"{name:<22} n={len(ms):<6} mean={statistics.mean(ms):7.1f} ms  "
+        f"p50={_percentile(ms, 0.50):7.1f}  p95={_percentile(ms, 0.95):7.1f}  "
+        f"p99={_percentile(ms, 0.99):7.1f}  max={max(ms):7.1f}"
+    )
+
+
+async def _login_worker(client: httpx.AsyncClient, args, deadline: float, latencies: List[float], errors: List[int]):
+    payload = {"username": args.username, "password": args.password}
+    while time.perf_counter() < deadline:
+        started = time.perf_counter()
+        response = await client.post("/auth/login", json=payload)
+        if response.status_code == 200:
+            latencies.append(time.perf_counter() - started)
+        else:
+            errors.append(response.status_code)
+
+
+async def _probe(client: httpx.AsyncClient, path: str, deadline: float, interval: float, latencies: List[float]):
+    while time.perf_counter() < deadline:
+        started = time.perf_counter()
+        await client.get(path)
+        latencies.append(time.perf_counter() - started)
+        await asyncio.sleep(interval)
+
+
+async def main(args):
+    limits = httpx.Limits(max_connections=args.concurrency + 4)
+    async with httpx.AsyncClient(base_url=args.api_url, limits=limits, timeout=60) as api, \
+            httpx.AsyncClient(base_url=args.base_url, timeout=60) as probe_client:
+
+        if args.baseline:
+            idle: List[float] = []
+            await _probe(probe_client, args.probe, time.perf_counter() + args.baseline, args.probe_interval, idle)
+            _report(f"{args.probe} (idle)", idle)
+
+        logins: List[float] = []
+        errors: List[int] = []
+        probed: List[float] = []
+        deadline = time.perf_counter() + args.duration
+        started = time.perf_counter()
+        await asyncio.gather(
+            *(_login_worker(api, args, deadline, logins, errors) for _ in range(args.concurrency)),
+            _probe(probe_client, args.probe, deadline, args.probe_interval, probed),
+        )
+        elapsed = time.perf_counter() - started
+
+    print(f"\nLogins: {len(logins)} ok, {len(errors)} failed in {elapsed:.1f}s "
+          f"→ {len(logins) / elapsed:.1f} logins/s at concurrency {args.concurrency}")
+    if errors:
+        print(f"Failed status codes: {sorted(set(errors))}")
+    _report("POST /auth/login", logins)
+    _report(f"{args.probe} (under load)", probed)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Login throughput and event-loop stall benchmark")
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--api-url", default=None, help="Defaults to <base-url>/api/v1")
+    parser.add_argument("--username", required=True)
+    parser.add_argument("--password", required=True)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--duration", type=float, default=20, help="Seconds of login load")
+    parser.add_argument("--probe", default="/health", help="Non-auth endpoint to time during the load")
+    parser.add_argument("--probe-interval", type=float, default=0.05)
+    parser.add_argument("--baseline", type=float, default=0, help="Seconds to probe with no load first")
+    args = parser.parse_args()
+    args.api_url = args.api_url or f"{args.base_url}/api/v1"
+
+    asyncio.run(main(args))
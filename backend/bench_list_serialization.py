@@ -0,0 +1,108 @@
+"""
+List Serialization Benchmark — ORM + Pydantic vs. column rows + orjson.
+
+Times the CPU side of GET /meetings for a page of N meetings, the way the
+endpoint used to build it and the way it does now:
+
+    orm+pydantic   Meeting objects → MeetingListResponse(from_attributes)
+                   → FastAPI's JSON encoding of the validated model
+    rows+orjson    column rows (dicts) → orjson.dumps
+
+No database needed: rows are synthesised in memory, so this isolates
+hydration/validation/encoding from query time.
+
+Usage:
+    python bench_list_serialization.py                 # 100-row pages
+    python bench_list_serialization.py --rows 1000 --repeat 200
+"""
+import argparse
+import json
+import time
+import uuid
+from datetime import datetime, timedelta
+
+import orjson
+from fastapi.encoders import jsonable_encoder
+
+from app.models.meeting import Meeting, MeetingStatus, PlatformType
+from app.schemas.meeting import MeetingListResponse, MeetingResponse
+
+
+def _rows(count: int):
+    """Column rows shaped like the endpoint's LIST_COLUMNS projection."""
+    user_id = uuid.uuid4()
+    now = datetime.utcnow()
+    rows = []
+    for i in range(count):
+        row = {name: None for name in MeetingResponse.model_fields}
+        row.update(
+            id=str(uuid.uuid4()),
+            url=f"https://meet.google.com/abc-defg-{i:03d}",
+            platform=PlatformType.GOOGLE_MEET,
+            meeting_code=f"abc-defg-{i:03d}",
+            title=f"Meeting {i}",
+            scheduled_time=now + timedelta(minutes=30 * i),
+            duration_minutes=60,
+            purpose="Weekly sync",
+            status=MeetingStatus.SCHEDULED,
+            user_id=user_id,
+            created_at=now,
+            updated_at=now,
+            join_attempts=0,
+        )
+        rows.append(row)
+    return rows
+
+
+def orm_pydantic(rows) -> bytes:
+    meetings = [Meeting(**row) for row in rows]  # Stands in for ORM hydration
+    response = MeetingListResponse(meetings=meetings, total=len(rows), page=1, page_size=len(rows))
+    # What FastAPI does with a returned model when the route has a response_model
+    body = MeetingListResponse.model_validate(response).model_dump(mode="json")
+    return json.dumps(jsonable_encoder(body), separators=(",", ":")).encode()
+
+
+def rows_orjson(rows) -> bytes:
+    return orjson.dumps({
+        "meetings": [dict(row) for row in rows],
+        "total": len(rows),
+        "page": 1,
+        "page_size": len(rows),
+        "next_cursor": None,
+    })
+
+
+def _time(fn, rows, repeat: int) -> float:
+    fn(rows)  # Warm-up
+    started = time.perf_counter()
+    for _ in range(repeat):
+        fn(rows)
+    return time.perf_counter() - started
+
+
+def main(args):
+    rows = _rows(args.rows)
+
+    # Both paths must produce the same document
+    before = json.loads(orm_pydantic(rows))
+    after = json.loads(rows_orjson(rows))
+    if before != after:
+        print("WARNING: outputs differ")
+
+    print(f"{args.rows} rows/page, {args.repeat} pages each\n")
+    results = {}
+    for name, fn in (("orm+pydantic", orm_pydantic), ("rows+orjson", rows_orjson)):
+        elapsed = _time(fn, rows, args.repeat)
+        results[name] = elapsed
+        per_page = elapsed / args.repeat * 1000
+        rows_per_sec = args.rows * args.repeat / elapsed
+        print(f"{name:<14} {per_page:8.2f} ms/page  {rows_per_sec:12,.0f} rows/s")
+
+    print(f"\nSpeed-up: {results['orm+pydantic'] / results['rows+orjson']:.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Meeting list serialization benchmark")
+    parser.add_argument("--rows", type=int, default=100, help="Meetings per page")
+    parser.add_argument("--repeat", type=int, default=500, help="Pages to serialize per path")
+    main(parser.parse_args())
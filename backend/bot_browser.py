@@ -0,0 +1,156 @@
+"""
+Bot Browser — how the join scripts get a Chrome context.
+
+If a browser pool (browser_pool.py) is reachable, lease one of its warm
+Chrome instances and open a fresh context in it over CDP: no cold Chrome
+launch at meeting time (the Playwright driver still starts per bot, to
+connect). Otherwise fall back to launching
+Chrome with the persistent profile, as the bots always did.
+
+Pooled contexts can't use the persistent profile (it is one Chrome's
+user-data dir); they are seeded from STORAGE_STATE_PATH instead, which the
+pool exports from the profile at startup (export_storage_state).
+"""
+import asyncio
+import json
+import os
+from pathlib import Path
+from typing import Optional
+
+# Chrome flags shared by every join script. Warm pool browsers are started
+# with these plus PROTOCOL_DIALOG_ARGS, since flags can't be set per context.
+BASE_CHROME_ARGS = [
+    '--disable-blink-features=AutomationControlled',
+    '--use-fake-ui-for-media-stream',
+    '--use-fake-device-for-media-stream',
+    '--window-size=1280,720',
+    '--window-position=100,50',
+]
+
+# Zoom's protocol-handler suppression; harmless for the other platforms,
+# so pool browsers always carry it
+PROTOCOL_DIALOG_ARGS = [
+    '--disable-features=ExternalProtocolDialogInProductHelp',
+    '--disable-external-intent-requests',
+    '--no-first-run',
+    '--no-default-browser-check',
+]
+
+USER_DATA_DIR = Path.home() / ".meetborg" / "chrome_profile"
+# Cookies/localStorage snapshot (Playwright storage_state) of the profile,
+# carrying its logged-in sessions into fresh pool contexts
+STORAGE_STATE_PATH = Path.home() / ".meetborg" / "storage_state.json"
+
+POOL_ENV_VAR = "MEETBORG_BROWSER_POOL"
+
+
+def docker_chrome_args() -> list:
+    return ["--no-sandbox", "--disable-dev-shm-usage"] if os.environ.get("DOCKER_ENV") == "1" else []
+
+
+def parse_pool_address(address: str) -> tuple:
+    host, _, port = address.rpartition(":")
+    return host or "127.0.0.1", int(port)
+
+
+async def export_storage_state(p) -> bool:
+    """
+    Snapshot the persistent profile's logins to STORAGE_STATE_PATH.
+    Fails (False) if the profile is in use by a running cold-launched bot.
+    """
+    if not USER_DATA_DIR.exists():
+        print(f"[WARN] No Chrome profile at {USER_DATA_DIR}; pooled bots will join signed out")
+        return False
+    try:
+        context = await p.chromium.launch_persistent_context(
+            str(USER_DATA_DIR),
+            headless=True,
+            channel='chrome',
+            args=docker_chrome_args() + BASE_CHROME_ARGS,
+        )
+    except Exception as e:
+        print(f"[WARN] Could not open {USER_DATA_DIR} to export its sessions: {e}")
+        return False
+    try:
+        STORAGE_STATE_PATH.parent.mkdir(parents=True, exist_ok=True)
+        await context.storage_state(path=str(STORAGE_STATE_PATH))
+    finally:
+        await context.close()
+    print(f"[OK] Exported profile sessions to {STORAGE_STATE_PATH}")
+    return True
+
+
+async def _lease_from_pool(address: str) -> Optional[tuple]:
+    """
+    Ask the pool for a warm browser.
+    Returns (cdp_url, writer) or None if the pool is unavailable/exhausted.
+    The lease lasts as long as the writer's connection stays open.
+    """
+    try:
+        host, port = parse_pool_address(address)
+        reader, writer = await asyncio.wait_for(asyncio.open_connection(host, port), timeout=3)
+        writer.write(b'{"op": "acquire"}\n')
+        await writer.drain()
+        reply = json.loads(await asyncio.wait_for(reader.readline(), timeout=10))
+    except Exception as e:
+        print(f"[WARN] Browser pool at {address} unavailable: {e}")
+        return None
+
+    if not reply.get("ok"):
+        print(f"[WARN] Browser pool refused lease: {reply.get('error')}")
+        writer.close()
+        return None
+    return reply["cdp_url"], writer
+
+
+async def open_bot_context(
+    p,
+    pool_address: Optional[str] = None,
+    extra_args: Optional[list] = None,
+    **context_options,
+):
+    """
+    Return a browser context for one meeting.
+
+    Args:
+        p: The running async_playwright() instance
+        pool_address: host:port of browser_pool.py (defaults to $MEETBORG_BROWSER_POOL)
+        extra_args: Extra Chrome flags for a cold launch (pool browsers already
+                    run with BASE_CHROME_ARGS + PROTOCOL_DIALOG_ARGS)
+        context_options: Passed to new_context / launch_persistent_context
+                         (permissions, viewport, user_agent, ...)
+    """
+    pool_address = pool_address or os.environ.get(POOL_ENV_VAR)
+    if pool_address:
+        lease = await _lease_from_pool(pool_address)
+        if lease:
+            cdp_url, lease_conn = lease
+            try:
+                browser = await p.chromium.connect_over_cdp(cdp_url)
+                if STORAGE_STATE_PATH.exists():
+                    context_options.setdefault("storage_state", str(STORAGE_STATE_PATH))
+                else:
+                    print(f"[WARN] No {STORAGE_STATE_PATH}: pooled Chrome joins signed out "
+                          f"(run browser_pool.py to export the profile's sessions)")
+                context = await browser.new_context(**context_options)
+                # The lease socket stays open for as long as the context is in
+                # use (or until this process exits); the pool then recycles
+                # the browser
+                context.on("close", lambda _: lease_conn.close())
+                print(f"[OK] Using warm pooled Chrome ({cdp_url})")
+                return context
+            except Exception as e:
+                print(f"[WARN] Could not use pooled Chrome, launching cold: {e}")
+                lease_conn.close()
+
+    # Cold path — persistent profile so logins survive between meetings
+    USER_DATA_DIR.mkdir(parents=True, exist_ok=True)
+    context = await p.chromium.launch_persistent_context(
+        str(USER_DATA_DIR),
+        headless=False,
+        channel='chrome',
+        args=docker_chrome_args() + BASE_CHROME_ARGS + list(extra_args or []),
+        **context_options,
+    )
+    print("[OK] Chrome launched!")
+    return context
@@ -0,0 +1,177 @@
+"""
+Browser Pool — long-lived bot host that keeps N warm Chrome instances.
+
+Join bots lease a browser over a local TCP socket and open a fresh context in
+it via CDP (see bot_browser.py), so time-to-lobby no longer includes a cold
+Chrome launch. Each bot still starts its own Playwright driver to connect
+over CDP; only the browser is pooled. Each browser serves one meeting and
+is replaced in the background once the lease ends, so CPU for launching
+Chrome is spent between meetings rather than at the top of the hour.
+
+Trade-off: pooled contexts are fresh, not the persistent chrome_profile the
+cold path uses, so Google/Teams logins only carry over as a storage_state
+snapshot. The pool exports one from the profile at startup; restart the
+pool after signing in again in the profile (bots warn and join signed out
+when there is no snapshot).
+
+Protocol (one JSON object per line):
+    -> {"op": "acquire"}   <- {"ok": true, "lease": "...", "cdp_url": "http://127.0.0.1:PORT"}
+    -> {"op": "status"}    <- {"ok": true, "size": N, "idle": n, "leased": n}
+A lease is held until the client closes its connection.
+
+Usage:
+    python browser_pool.py --size 3 --port 9300
+    # bots then run with --browser-pool 127.0.0.1:9300
+"""
+import asyncio
+import argparse
+import json
+import socket
+import uuid
+from typing import Dict, List, Optional
+
+from playwright.async_api import async_playwright
+
+from bot_browser import BASE_CHROME_ARGS, PROTOCOL_DIALOG_ARGS, docker_chrome_args, export_storage_state
+
+
+def _free_port() -> int:
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+class WarmBrowser:
+    """A pooled Chrome reachable over its remote-debugging port"""
+
+    def __init__(self, browser, port: int):
+        self.browser = browser
+        self.port = port
+        self.lease: Optional[str] = None
+
+    @property
+    def cdp_url(self) -> str:
+        return f"http://127.0.0.1:{self.port}"
+
+
+class BrowserPool:
+    def __init__(self, p, size: int):
+        self.p = p
+        self.size = size
+        self.idle: List[WarmBrowser] = []
+        self.leased: Dict[str, WarmBrowser] = {}
+        self._launching = 0
+
+    async def _launch(self) -> Optional[WarmBrowser]:
+        port = _free_port()
+        try:
+            browser = await self.p.chromium.launch(
+                headless=False,
+                channel='chrome',
+                args=docker_chrome_args() + BASE_CHROME_ARGS + PROTOCOL_DIALOG_ARGS + [
+                    f'--remote-debugging-port={port}',
+                    '--remote-debugging-address=127.0.0.1',
+                ],
+            )
+        except Exception as e:
+            print(f"[POOL] Chrome launch failed: {e}")
+            return None
+        print(f"[POOL] Warm Chrome ready on :{port}")
+        return WarmBrowser(browser, port)
+
+    async def fill(self):
+        """Launch browsers until the pool is back at full size."""
+        missing = self.size - len(self.idle) - len(self.leased) - self._launching
+        if missing <= 0:
+            return
+        self._launching += missing
+        try:
+            launched = await asyncio.gather(*(self._launch() for _ in range(missing)))
+        finally:
+            self._launching -= missing
+        self.idle.extend(b for b in launched if b is not None)
+
+    def acquire(self) -> Optional[WarmBrowser]:
+        while self.idle:
+            warm = self.idle.pop(0)
+            if warm.browser.is_connected():
+                warm.lease = uuid.uuid4().hex
+                self.leased[warm.lease] = warm
+                return warm
+            print(f"[POOL] Dropping dead Chrome on :{warm.port}")
+        return None
+
+    async def release(self, lease: str):
+        """Retire a used browser and start its replacement."""
+        warm = self.leased.pop(lease, None)
+        if warm is None:
+            return
+        try:
+            await warm.browser.close()
+        except Exception:
+            pass
+        print(f"[POOL] Lease {lease[:8]} ended — recycling Chrome on :{warm.port}")
+        asyncio.get_event_loop().create_task(self.fill())
+
+    def status(self) -> dict:
+        return {"ok": True, "size": self.size, "idle": len(self.idle), "leased": len(self.leased)}
+
+    async def handle_client(self, reader, writer):
+        lease = None
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                try:
+                    request = json.loads(line)
+                except ValueError:
+                    reply = {"ok": False, "error": "bad request"}
+                else:
+                    op = request.get("op")
+                    if op == "status":
+                        reply = self.status()
+                    elif op == "acquire" and lease is None:
+                        warm = self.acquire()
+                        if warm:
+                            lease = warm.lease
+                            reply = {"ok": True, "lease": lease, "cdp_url": warm.cdp_url}
+                        else:
+                            reply = {"ok": False, "error": "pool exhausted"}
+                            asyncio.get_event_loop().create_task(self.fill())
+                    else:
+                        reply = {"ok": False, "error": f"unsupported op: {op}"}
+                writer.write((json.dumps(reply) + "\n").encode())
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+            if lease:
+                await self.release(lease)
+
+
+async def serve(size: int, host: str, port: int):
+    async with async_playwright() as p:
+        # Before any warm browser exists: logins reach pooled contexts only
+        # through this snapshot
+        await export_storage_state(p)
+        pool = BrowserPool(p, size)
+        await pool.fill()
+        server = await asyncio.start_server(pool.handle_client, host, port)
+        print(f"[POOL] Serving {len(pool.idle)}/{size} warm browser(s) on {host}:{port}")
+        async with server:
+            await server.serve_forever()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Warm Chrome pool for join bots")
+    parser.add_argument("--size", type=int, default=3, help="Number of warm browsers (match MAX_CONCURRENT_BOTS)")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9300)
+    args = parser.parse_args()
+
+    try:
+        asyncio.run(serve(args.size, args.host, args.port))
+    except KeyboardInterrupt:
+        print("\n[POOL] Stopped")
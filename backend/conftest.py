@@ -0,0 +1,5 @@
+"""
+Pytest configuration: every test fails on a request that exceeds its
+route's QueryBudget (see app/db/pytest_plugin.py).
+"""
+pytest_plugins = ["app.db.pytest_plugin"]
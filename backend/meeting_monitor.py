@@ -1,14 +1,31 @@
 """
 Meeting End Monitor — stdlib only, no external dependencies.
 Detects meeting end via cross-frame scanning and multiple signals.
+
+End screens are caught as they appear by a MutationObserver injected into
+every frame, which calls back into Python through an exposed binding to
+wake the poll loop for an immediate check; otherwise the loop is a slow
+heartbeat for the signals the DOM can't push (URL changes, Teams
+timer/participant heuristics, controls disappearing).
+Those checks live in EndDetector, which never touches the browser, so
+recorded ticks (MONITOR_RECORD=true) can be replayed offline by
+replay_monitor.py.
 """
 import asyncio
+import gzip
+import http.client
 import json
+import os
+import random
 import re
+import sys
 import time
-import urllib.request
-import urllib.error
-from typing import Optional
+import urllib.parse
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Optional, Tuple
 
 
 # ── Teams call timer extraction ───────────────────────────────────────────────
@@ -19,6 +36,8 @@ _TIMER_RE = re.compile(r'\b(\d{1,2}):(\d{2})(?::(\d{2}))?\b')
 
 # Teams participant count patterns — e.g. '2 people', '1 person', '1 people'
 _TEAMS_PARTICIPANT_RE = re.compile(r'(\d+)\s+(?:people|person|participant)')
+# 'people' with no count: Teams drops the number when the bot is alone
+_TEAMS_ALONE_RE = re.compile(r'(?<!\d)\bpeople\b')
 
 
 def _extract_timer_seconds(frame_texts: list) -> Optional[int]:
@@ -49,7 +68,7 @@ def _extract_teams_participant_count(frame_texts: list) -> Optional[int]:
         # Teams removes the number entirely when bot is alone:
         # '2 people' becomes just 'people' (no digit)
         # Check for 'people' NOT preceded by a digit
-        if re.search(r'(?<!\d)\bpeople\b', text) and not _TEAMS_PARTICIPANT_RE.search(text):
+        if _TEAMS_ALONE_RE.search(text):
             return 0  # no number = bot is alone
     return None
 
@@ -82,27 +101,136 @@ _END_PHRASES = {
     ],
 }
 
-# ── JavaScript for detecting Rejoin button and special end elements ────────────
-_JS_POSTJOIN_CHECK = """
-() => {
-    // Check all buttons and links for rejoin text
-    const allEls = Array.from(document.querySelectorAll('button, a, [role="button"]'));
-    for (const el of allEls) {
-        const t = (el.innerText || el.textContent || '').toLowerCase().trim();
-        if (t === 'rejoin' || t === 're-join' || t.startsWith('rejoin ') || t === 'rejoin call') {
-            return 'rejoin:' + t;
-        }
-    }
-    // Teams-specific call-ended data-tid
-    const endEl = document.querySelector(
+# ── In-page end observer ───────────────────────────────────────────────────────
+# Installed in every frame (add_init_script + once into frames already loaded).
+# Mutations are batched and only the changed subtrees are checked, at most
+# once per debounce window, so a ticking call timer costs next to nothing.
+# A match only wakes the monitor for an immediate full check: end phrases
+# also show up in toasts and chat ("X left the meeting"), so the observer
+# never ends the meeting by itself and stays armed after a false alarm.
+_END_BINDING = "__meetborgEndSignal"
+_OBSERVER_DEBOUNCE_MS = 500
+_OBSERVER_COOLDOWN_MS = 2000  # Min gap between wake-ups from one frame
+
+_JS_END_OBSERVER = """
+(() => {
+    if (window.__meetborgEndObserver) return;
+    window.__meetborgEndObserver = true;
+
+    const config = __MEETBORG_CONFIG__;
+    const endTidSelector =
         '[data-tid="call-ended-page"], [data-tid*="call-ended"], ' +
-        '[data-tid="post-call-page"], [data-tid="prejoin-retry"]'
-    );
-    if (endEl) return 'tid:' + (endEl.getAttribute('data-tid') || 'ended');
-    return '';
-}
+        '[data-tid="post-call-page"], [data-tid="prejoin-retry"]';
+    const buttonSelector = 'button, a, [role="button"]';
+    let lastSignal = 0;
+    let scheduled = false;
+    let pending = new Set();
+
+    const isRejoin = (t) =>
+        t === 'rejoin' || t === 're-join' || t.startsWith('rejoin ') || t === 'rejoin call';
+
+    const check = (el) => {
+        const text = (el.innerText || el.textContent || '').toLowerCase();
+        for (const phrase of config.phrases) {
+            if (text.includes(phrase)) return 'text:' + phrase;
+        }
+        const tid = el.matches(endTidSelector) ? el : el.querySelector(endTidSelector);
+        if (tid) return 'tid:' + (tid.getAttribute('data-tid') || 'ended');
+        const buttons = el.matches(buttonSelector) ? [el] : el.querySelectorAll(buttonSelector);
+        for (const b of buttons) {
+            const t = (b.innerText || b.textContent || '').toLowerCase().trim();
+            if (isRejoin(t)) return 'rejoin:' + t;
+        }
+        return '';
+    };
+
+    const signal = (reason) => {
+        if (typeof window[config.binding] !== 'function') return;
+        const now = Date.now();
+        if (now - lastSignal < config.cooldownMs) return;
+        lastSignal = now;
+        window[config.binding](reason);
+    };
+
+    const flush = () => {
+        scheduled = false;
+        const targets = pending;
+        pending = new Set();
+        for (const el of targets) {
+            if (!el.isConnected) continue;
+            const reason = check(el);
+            if (reason) return signal(reason);
+        }
+    };
+
+    const queue = (node) => {
+        const el = node && (node.nodeType === 1 ? node : node.parentElement);
+        if (el) pending.add(el);
+    };
+
+    const observer = new MutationObserver((records) => {
+        for (const r of records) {
+            if (r.type === 'childList') r.addedNodes.forEach(queue);
+            else queue(r.target);
+        }
+        if (!scheduled && pending.size) {
+            scheduled = true;
+            setTimeout(flush, config.debounceMs);
+        }
+    });
+
+    const start = () => {
+        if (!document.documentElement) return false;
+        observer.observe(document.documentElement, {
+            childList: true, subtree: true, characterData: true,
+            attributes: true, attributeFilter: ['data-tid'],
+        });
+        // Already on an end screen when installed
+        if (document.body) { queue(document.body); flush(); }
+        return true;
+    };
+    if (!start()) document.addEventListener('DOMContentLoaded', start, { once: true });
+})();
 """
 
+
+def _end_observer_script(platform: str) -> str:
+    config = {
+        "phrases": _END_PHRASES.get(platform, []),
+        "binding": _END_BINDING,
+        "debounceMs": _OBSERVER_DEBOUNCE_MS,
+        "cooldownMs": _OBSERVER_COOLDOWN_MS,
+    }
+    return _JS_END_OBSERVER.replace("__MEETBORG_CONFIG__", json.dumps(config))
+
+
+async def _install_end_observer(page, context, platform: str, on_signal) -> bool:
+    """
+    Expose the end-signal binding and inject the observer into every frame,
+    current and future. on_signal(reason) is called from the page whenever a
+    possible end shows up (at most once per cooldown per frame).
+    Returns False if it could not be installed (polling still works).
+    """
+    def _binding(source, reason):
+        frame = source.get("frame") if isinstance(source, dict) else None
+        frame_url = (frame.url[:50] if frame is not None and frame.url else "?")
+        on_signal(f"[frame:{frame_url}] observer:{reason}")
+
+    try:
+        await context.expose_binding(_END_BINDING, _binding)
+        script = _end_observer_script(platform)
+        await context.add_init_script(script)
+        for frame in page.frames:
+            try:
+                await frame.evaluate(script)
+            except Exception:
+                pass  # Detached or cross-process mid-navigation; init script covers reloads
+        return True
+    except Exception as e:
+        print(f"[MONITOR] End observer unavailable ({e}) — polling only")
+        return False
+
+
 # ── Active-selector lists (used only to CONFIRM we're in — not for exit) ──────
 _ACTIVE_SELECTORS = {
     "google_meet": [
@@ -130,73 +258,140 @@ _ACTIVE_URL_CHECK = {
 }
 
 
-async def _scan_frame(frame, platform: str, debug: bool = False) -> str:
-    """
-    Scan a single frame for meeting-end signals.
-    Returns a reason string if ended, '' otherwise.
-    """
-    try:
-        body = await frame.evaluate(
-            "document.body ? document.body.innerText : ''"
-        )
-    except Exception:
-        return ""
+# ── Per-tick frame snapshot ───────────────────────────────────────────────────
+# One evaluate per frame per tick, all frames at once. The phrase list, the
+# timer/participant regexes and the active-control selectors are shipped into
+# each frame once; matching happens in the page and only a small result
+# (end reason, timer, participant count, controls present) comes back.
+_FRAME_SNAPSHOT_TIMEOUT_SECONDS = 3
+# Per-frame text kept by the recorder. Matches past it are lost to replay,
+# so each recorded frame also carries the live matcher's own results
+_RECORD_TEXT_LIMIT = 20000
 
-    body_lower = body.lower()
+_JS_SNAPSHOT_INSTALL = """
+(config) => {
+    const timerRe = new RegExp(config.timer);
+    const participantRe = new RegExp(config.participants);
+    const aloneRe = new RegExp(config.alone);
+    const endTidSelector =
+        '[data-tid="call-ended-page"], [data-tid*="call-ended"], ' +
+        '[data-tid="post-call-page"], [data-tid="prejoin-retry"]';
 
-    if debug and body_lower.strip():
-        snippet = body_lower.replace("\n", " ")[:200]
-        print(f"[MONITOR]   frame text: {snippet!r}")
+    const textOf = (el) => (el.innerText || el.textContent || '').toLowerCase();
 
-    # Text phrase scan
-    for phrase in _END_PHRASES.get(platform, []):
-        if phrase in body_lower:
-            return f"text:{phrase}"
+    const postJoinEnd = () => {
+        for (const el of document.querySelectorAll('button, a, [role="button"]')) {
+            const t = textOf(el).trim();
+            if (t === 'rejoin' || t === 're-join' || t.startsWith('rejoin ') || t === 'rejoin call') {
+                return 'js:rejoin:' + t;
+            }
+        }
+        const endEl = document.querySelector(endTidSelector);
+        return endEl ? 'js:tid:' + (endEl.getAttribute('data-tid') || 'ended') : '';
+    };
 
-    # Rejoin button + special elements scan
-    try:
-        reason = await frame.evaluate(_JS_POSTJOIN_CHECK)
-        if reason:
-            return f"js:{reason}"
-    except Exception:
-        pass
+    const selectorHit = ({ css, text }) => {
+        try {
+            const els = document.querySelectorAll(css);
+            if (!text) return els.length > 0;
+            for (const el of els) if (textOf(el).includes(text)) return true;
+        } catch (e) {}
+        return false;
+    };
 
-    return ""
+    window.__meetborgSnapshot = (withText, record) => {
+        const body = document.body ? (document.body.innerText || '').toLowerCase() : '';
+        const result = { end: '', timer: null, participants: null, active: false, chars: body.length };
+
+        const phrase = config.phrases.find((p) => body.includes(p));
+        result.end = phrase ? 'text:' + phrase : postJoinEnd();
+
+        const m = timerRe.exec(body);
+        if (m) {
+            result.timer = m[3] !== undefined
+                ? (+m[1]) * 3600 + (+m[2]) * 60 + (+m[3])
+                : (+m[1]) * 60 + (+m[2]);
+        }
+        const p = participantRe.exec(body);
+        if (p) result.participants = +p[1];
+        else if (aloneRe.test(body)) result.participants = 0;
 
+        if (record) {
+            // Raw inputs for the replay corpus (see _snapshot_from_text)
+            result.text = body.slice(0, config.recordTextLimit);
+            result.dom_end = postJoinEnd();
+            result.hits = config.active.map(selectorHit);
+            result.active = result.hits.some(Boolean);
+        } else {
+            result.active = config.active.some(selectorHit);
+        }
+        if (withText) result.snippet = body.replace(/\\n/g, ' ').slice(0, 200);
+        return result;
+    };
+}
+"""
+
+_JS_SNAPSHOT_CALL = "([withText, record]) => window.__meetborgSnapshot ? window.__meetborgSnapshot(withText, record) : null"
+
+_HAS_TEXT_RE = re.compile(r'^(.*):has-text\("(.+)"\)$')
+
+
+def _snapshot_config(platform: str) -> dict:
+    """Everything the in-page snapshot needs, as JSON-able values."""
+    active = []
+    for sel in _ACTIVE_SELECTORS.get(platform, []):
+        # Playwright's :has-text() isn't CSS: split it into selector + text
+        m = _HAS_TEXT_RE.match(sel)
+        active.append({"css": m.group(1) or "*", "text": m.group(2).lower()} if m else {"css": sel, "text": ""})
+    return {
+        "phrases": _END_PHRASES.get(platform, []),
+        "timer": _TIMER_RE.pattern,
+        "participants": _TEAMS_PARTICIPANT_RE.pattern,
+        "alone": _TEAMS_ALONE_RE.pattern,
+        "active": active,
+        "recordTextLimit": _RECORD_TEXT_LIMIT,
+    }
 
-async def _check_all_frames(page, platform: str, debug: bool = False) -> str:
+
+def _snapshot_init_script(platform: str) -> str:
+    return f"({_JS_SNAPSHOT_INSTALL})({json.dumps(_snapshot_config(platform))})"
+
+
+async def _snapshot_frame(frame, platform: str, with_text: bool, record: bool = False) -> Optional[dict]:
+    """One round trip: the frame's snapshot (installing the matcher first if this frame predates it)."""
+    result = await frame.evaluate(_JS_SNAPSHOT_CALL, [with_text, record])
+    if result is None:
+        await frame.evaluate(_JS_SNAPSHOT_INSTALL, _snapshot_config(platform))
+        result = await frame.evaluate(_JS_SNAPSHOT_CALL, [with_text, record])
+    if result is not None:
+        result["url"] = frame.url or ""
+    return result
+
+
+async def _snapshot_frames(page, platform: str, with_text: bool = False, record: bool = False) -> Tuple[list, int]:
     """
-    Scan ALL frames (main + iframes) for end signals.
-    Teams loads content in sub-frames — this is critical for Teams detection.
+    Snapshots of all frames (main + iframes), taken concurrently.
+    Returns (snapshots, failed): frames that raise or time out are left out
+    and counted, so callers don't read a slow frame as a vanished one.
     """
     frames = page.frames
-    if debug:
-        print(f"[MONITOR] Scanning {len(frames)} frame(s)")
+    results = await asyncio.gather(
+        *(
+            asyncio.wait_for(_snapshot_frame(f, platform, with_text, record), _FRAME_SNAPSHOT_TIMEOUT_SECONDS)
+            for f in frames
+        ),
+        return_exceptions=True,
+    )
+    snapshots = [r for r in results if isinstance(r, dict)]
+    return snapshots, len(results) - len(snapshots)
 
-    for frame in frames:
-        try:
-            reason = await _scan_frame(frame, platform, debug=debug)
-            if reason:
-                frame_url = frame.url[:50] if frame.url else "?"
-                return f"[frame:{frame_url}] {reason}"
-        except Exception:
-            pass
-    return ""
 
-
-async def _get_all_frame_text(page) -> list:
-    """Return list of (frame_url, body_lower) for all frames with non-empty bodies."""
-    results = []
-    for frame in page.frames:
-        try:
-            body = await frame.evaluate(
-                "document.body ? document.body.innerText : ''"
-            )
-            if body and body.strip():
-                results.append((frame.url or "", body.lower()))
-        except Exception:
-            pass
-    return results
+def _first(snapshots: list, key: str):
+    """First non-null value of key across frames (frame order, main frame first)."""
+    for snap in snapshots:
+        if snap.get(key) is not None:
+            return snap[key]
+    return None
 
 
 def _teams_signature_present(frame_texts: list) -> bool:
@@ -208,101 +403,516 @@ def _teams_signature_present(frame_texts: list) -> bool:
     return False
 
 
-async def _active_selector_present(page, platform: str) -> bool:
-    """Returns True if any active-meeting control is found on the page."""
-    for sel in _ACTIVE_SELECTORS.get(platform, []):
-        try:
-            count = await page.locator(sel).count()
-            if count > 0:
-                print(f"[MONITOR] Active selector matched: {sel}")
-                return True
-        except Exception:
-            pass
-    return False
+def _snapshot_from_text(platform: str, url: str, text: str, dom_end: str = "", hits: Optional[list] = None) -> dict:
+    """
+    Python twin of the in-page matcher: the snapshot a frame with this
+    (lowercased) text would produce. The replay harness rebuilds snapshots
+    from recorded text with it, so edits to _END_PHRASES or the timer and
+    participant extraction can be measured without a browser.
+    """
+    phrase = next((p for p in _END_PHRASES.get(platform, []) if p in text), None)
+    frame_texts = [(url, text)]
+    hits = hits or []
+    return {
+        "url": url,
+        "end": f"text:{phrase}" if phrase else dom_end,
+        "timer": _extract_timer_seconds(frame_texts),
+        "participants": _extract_teams_participant_count(frame_texts),
+        "active": any(hits),
+        "chars": len(text),
+    }
+
+
+def _is_text_end(reason: str) -> bool:
+    """End phrase in the page text (may be a toast), rather than an end-screen marker."""
+    return reason.startswith("text:") or "] text:" in reason
 
 
-async def _is_meeting_active(
-    page, platform: str, seen_active_selector: bool, tick: int
-) -> tuple:
+def _end_reason(
+    platform: str, url: str, seen_active_selector: bool, snapshots: list, complete: bool = True
+) -> str:
     """
-    Returns (is_active: bool, reason: str).
+    The end reason for one tick, or "" while the meeting looks active.
 
     Checks:
-      1. page.is_closed()
-      2. URL left meeting domain
-      3. Cross-frame text / DOM detection (every poll)
-      4. Active-selector disappeared (only if previously confirmed in-meeting)
+      1. URL left meeting domain
+      2. End phrases / rejoin button / end markers in any frame's snapshot
+      3. Active controls disappeared (only if previously confirmed in-meeting,
+         and only when every frame answered: complete=False skips it)
     """
-    # Signal 1 — browser closed
-    try:
-        if page.is_closed():
-            return False, "browser_closed"
-    except Exception:
-        return False, "context_lost"
-
-    url = page.url.lower()
-    print(f"[MONITOR] URL: {url[:80]}")
-
-    # Signal 2 — URL left meeting domain
+    # Signal 1 — URL left meeting domain
     url_checker = _ACTIVE_URL_CHECK.get(platform)
     if url_checker and not url_checker(url):
-        return False, f"url_left_domain:{url[:60]}"
+        return f"url_left_domain:{url[:60]}"
 
-    # Signal 3 — Log page title (useful for Teams debugging)
-    try:
-        title = await page.title()
-        if title:
-            print(f"[MONITOR] Page title: {title}")
-    except Exception:
-        pass
-
-    # Signal 4 — Cross-frame text / DOM detection
-    # Enable verbose frame debug on first 3 polls and every 10th poll
-    debug_frames = (tick < 3) or (tick % 10 == 0)
-    reason = await _check_all_frames(page, platform, debug=debug_frames)
-    if reason:
-        return False, reason
-
-    # Signal 5 — active selector disappeared (after we confirmed in-meeting)
-    if seen_active_selector:
-        still_active = await _active_selector_present(page, platform)
-        if not still_active:
-            return False, "controls_disappeared"
+    # Signal 2 — Cross-frame DOM end markers, then end phrases in the text
+    ends = [snap for snap in snapshots if snap["end"]]
+    ends.sort(key=lambda snap: _is_text_end(snap["end"]))
+    if ends:
+        return f"[frame:{ends[0]['url'][:50] or '?'}] {ends[0]['end']}"
+
+    # Signal 3 — active controls disappeared (after we confirmed in-meeting)
+    if complete and seen_active_selector and not any(snap["active"] for snap in snapshots):
+        return "controls_disappeared"
+
+    return ""
+
+
+class EndDetector:
+    """
+    Meeting-end detection as a per-tick state machine over frame snapshots.
+
+    Holds the cross-tick state (Teams timer freeze, bot-alone streak,
+    controls seen) but never touches the browser, so the live monitor and
+    the replay harness run exactly the same logic.
+    """
 
-    return True, ""
+    def __init__(self, platform: str, seen_active_selector: bool = False, log=print):
+        self.platform = platform
+        self.seen_active_selector = seen_active_selector
+        self.newly_active = False   # Controls confirmed on the last tick
+        self._log = log
 
+        # Teams-specific: track call timer for freeze/disappearance
+        self.teams_timer_confirmed = False   # True once we've seen the timer
+        self.teams_last_timer: Optional[int] = None
+        self.teams_timer_frozen_count = 0
+
+        # Teams-specific: track participant count (bot alone = meeting over)
+        self.teams_alone_count = 0           # consecutive polls where participant count <= 1
+        self.teams_last_participant_count: Optional[int] = None
+
+        self._suspect_polls = 0              # Fast polls left to confirm a suspected end
+        self._text_end_polls = 0             # Consecutive polls showing an end phrase
+
+    @property
+    def suspect(self) -> bool:
+        """A heuristic thinks the meeting may be ending: poll faster."""
+        return self._suspect_polls > 0
+
+    def observe(self, url: str, snapshots: list, failed_frames: int = 0) -> str:
+        """
+        Feed one tick; returns the end reason, or "" while the meeting is active.
+        failed_frames: frames that didn't answer this tick. Absence-based
+        signals (timer/controls disappeared) wait for a tick where all did.
+        """
+        self._suspect_polls = max(0, self._suspect_polls - 1)
+        self.newly_active = False
+        complete = failed_frames == 0
+        if not complete:
+            # Retry soon rather than wait a slow heartbeat for a full tick
+            self._suspect_polls = max(self._suspect_polls, 1)
+            self._log(f"[MONITOR] {failed_frames} frame(s) did not answer — skipping disappearance checks")
+
+        if self.platform == "microsoft_teams":
+            reason = self._observe_teams(snapshots, complete)
+            if reason:
+                return reason
+
+        # ── Generic end-signal checks ───────────────────────────────────────
+        reason = _end_reason(self.platform, url, self.seen_active_selector, snapshots, complete)
+        if reason and _is_text_end(reason):
+            # Phrases like 'left the meeting' also appear in toasts and chat:
+            # only an end screen keeps showing them poll after poll
+            self._text_end_polls += 1
+            if self._text_end_polls < _TEXT_END_CONFIRM_POLLS:
+                self._suspect_polls = _SUSPECT_POLLS
+                self._log(f"[MONITOR] End phrase seen ({self._text_end_polls}/{_TEXT_END_CONFIRM_POLLS} polls): {reason}")
+                return ""
+        else:
+            self._text_end_polls = 0
+        if reason:
+            return reason
+
+        # Re-check whether we've now confirmed the active selector
+        if not self.seen_active_selector and any(snap["active"] for snap in snapshots):
+            self.seen_active_selector = True
+            self.newly_active = True
+        return ""
 
-def _mark_completed(meeting_id: str, api_url: str, api_secret: str) -> bool:
-    """POST /meetings/{id}/complete using stdlib urllib."""
+    def _observe_teams(self, snapshots: list, complete: bool) -> str:
+        # ── Teams call-timer freeze/disappearance detection ─────────────────
+        timer_secs = _first(snapshots, "timer")
+
+        if timer_secs is not None:
+            if not self.teams_timer_confirmed:
+                self.teams_timer_confirmed = True
+                self.teams_last_timer = timer_secs
+                self._log(f"[MONITOR] Teams call timer confirmed: {timer_secs}s")
+            elif timer_secs != self.teams_last_timer:
+                # Timer is advancing — meeting active
+                self.teams_timer_frozen_count = 0
+                self.teams_last_timer = timer_secs
+            else:
+                # Timer value unchanged since last poll
+                self.teams_timer_frozen_count += 1
+                self._suspect_polls = _SUSPECT_POLLS
+                self._log(f"[MONITOR] Teams timer frozen at {timer_secs}s ({self.teams_timer_frozen_count}/3 polls)")
+                if self.teams_timer_frozen_count >= 3:
+                    return f"teams_timer_frozen_at_{timer_secs}s"
+        elif self.teams_timer_confirmed and complete:
+            # Timer was present before but is now gone — strong end signal
+            self._log("[MONITOR] Teams call timer disappeared")
+            return "teams_timer_disappeared"
+
+        # ── Teams participant count detection ─────────────────────────────
+        # Frame text shows '2 people', '3 people', etc.
+        # When host leaves, it drops to '1 person' or '1 people' — bot is alone.
+        participant_count = _first(snapshots, "participants")
+        if participant_count is not None:
+            last = self.teams_last_participant_count
+            if last is not None and participant_count < last:
+                # People are leaving — the meeting may be wrapping up
+                self._suspect_polls = _SUSPECT_POLLS
+            self.teams_last_participant_count = participant_count
+            if participant_count <= 1:
+                self.teams_alone_count += 1
+                self._suspect_polls = _SUSPECT_POLLS
+                self._log(f"[MONITOR] Teams: bot appears alone ({participant_count} participant) [{self.teams_alone_count}/2 polls]")
+                if self.teams_alone_count >= 2:
+                    return f"teams_bot_alone_{participant_count}_participants"
+            else:
+                self.teams_alone_count = 0  # reset — others are still in
+        return ""
+
+
+# ── Adaptive poll cadence ─────────────────────────────────────────────────────
+# Meetings rarely end in the middle, so the heartbeat is slow there and fast
+# around the scheduled end, or whenever a heuristic looks like the meeting is
+# wrapping up (frozen Teams timer, bot alone, participants leaving).
+_POLL_SLOW_SECONDS = 60       # Well before the scheduled end
+_POLL_END_WINDOW_SECONDS = 10  # Around the scheduled end
+_POLL_OVERRUN_SECONDS = 15    # Past the end window: could stop at any moment
+_POLL_SUSPECT_SECONDS = 5     # Confirming a suspected end
+_END_WINDOW_BEFORE = timedelta(minutes=5)
+_END_WINDOW_AFTER = timedelta(minutes=15)
+_SUSPECT_POLLS = 3            # Fast polls after each suspicious signal
+_TEXT_END_CONFIRM_POLLS = 3   # Consecutive polls an end phrase must persist
+
+
+def _scheduled_end(scheduled_time, duration_minutes: Optional[int]) -> Optional[datetime]:
+    """Scheduled end as aware UTC; scheduled_time may be ISO text (naive = UTC)."""
+    if not scheduled_time or not duration_minutes:
+        return None
+    if isinstance(scheduled_time, str):
+        try:
+            scheduled_time = datetime.fromisoformat(scheduled_time.replace("Z", "+00:00"))
+        except ValueError:
+            print(f"[MONITOR] Ignoring unparseable scheduled time {scheduled_time!r}")
+            return None
+    if scheduled_time.tzinfo is None:
+        scheduled_time = scheduled_time.replace(tzinfo=timezone.utc)
+    return scheduled_time + timedelta(minutes=duration_minutes)
+
+
+def _next_poll_interval(
+    now: datetime, scheduled_end: Optional[datetime], suspect: bool, default: int
+) -> int:
+    """Seconds until the next heartbeat poll."""
+    if suspect:
+        return _POLL_SUSPECT_SECONDS
+    if scheduled_end is None:
+        return default
+    if now < scheduled_end - _END_WINDOW_BEFORE:
+        # Mid-meeting: slow, but never sleep past the start of the end window
+        until_window = (scheduled_end - _END_WINDOW_BEFORE - now).total_seconds()
+        return max(_POLL_END_WINDOW_SECONDS, min(_POLL_SLOW_SECONDS, int(until_window)))
+    if now <= scheduled_end + _END_WINDOW_AFTER:
+        return _POLL_END_WINDOW_SECONDS
+    return _POLL_OVERRUN_SECONDS
+
+
+# ── Bot → backend event outbox ────────────────────────────────────────────────
+# Every event (milestones, completion) is appended to events.jsonl in the
+# meeting's recording dir before it is sent, and its ID to events.acked once
+# the backend has answered. A backend restart, or the bot dying mid-send,
+# leaves the event on disk; whoever opens the outbox next resends it. The
+# backend ignores an Idempotency-Key it has already applied.
+_OUTBOX_FILE = "events.jsonl"
+_OUTBOX_ACKED_FILE = "events.acked"
+_OUTBOX_BACKOFF_MAX_SECONDS = 60
+_OUTBOX_REQUEST_TIMEOUT_SECONDS = 10
+
+
+def _recording_dir(meeting_id: str) -> str:
+    """RECORDING_DIR from the bot-worker entrypoint, else ./recordings/<id> (local mode)."""
+    return os.environ.get("RECORDING_DIR") or os.path.join("recordings", meeting_id)
+
+
+def _append_line(path: str, line: str):
+    with open(path, "a", encoding="utf-8") as f:
+        f.write(line + "\n")
+        f.flush()
+        os.fsync(f.fileno())
+
+
+class EventOutbox:
+    """
+    Append-only on-disk spool drained by a background sender.
+
+    enqueue() never touches the network. The sender keeps one keep-alive
+    connection on a dedicated thread and retries each event, oldest first,
+    with capped exponential backoff for as long as the process lives.
+    """
+
+    def __init__(self, spool_dir: str, api_url: str, api_secret: str):
+        self.spool_dir = spool_dir
+        self._spool_path = os.path.join(spool_dir, _OUTBOX_FILE)
+        self._acked_path = os.path.join(spool_dir, _OUTBOX_ACKED_FILE)
+        self._api = urllib.parse.urlsplit(api_url)
+        self._headers = {
+            "Authorization": f"Bearer {api_secret}",
+            "Content-Type": "application/json",
+        }
+        self._pending: "OrderedDict[str, dict]" = OrderedDict()
+        self._connection = None
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="outbox")
+        self._wakeup = asyncio.Event()
+        self._drained = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        os.makedirs(spool_dir, exist_ok=True)
+        self._load()
+
+    def _load(self):
+        acked = set()
+        if os.path.exists(self._acked_path):
+            with open(self._acked_path, encoding="utf-8") as f:
+                acked = {line.strip() for line in f if line.strip()}
+        if os.path.exists(self._spool_path):
+            with open(self._spool_path, encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        continue  # Torn final line from a crash mid-append
+                    if record["id"] not in acked:
+                        self._pending[record["id"]] = record
+        if self._pending:
+            print(f"[MONITOR] Outbox: {len(self._pending)} unsent event(s) in {self.spool_dir}")
+        else:
+            self._drained.set()
+
+    @property
+    def pending(self) -> int:
+        return len(self._pending)
+
+    def enqueue(self, path: str, body: dict) -> str:
+        """Persist an event for POST <api_url><path>; returns its event ID."""
+        record = {
+            "id": str(uuid.uuid4()),
+            "path": path,
+            "body": body,
+            "created_at": datetime.now(timezone.utc).isoformat(),
+        }
+        _append_line(self._spool_path, json.dumps(record))
+        self._pending[record["id"]] = record
+        self._drained.clear()
+        self._wakeup.set()
+        self.start()
+        return record["id"]
+
+    def start(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_event_loop().create_task(self._run())
+
+    async def drain(self, timeout: Optional[float] = None) -> bool:
+        """Wait until every event is acknowledged; False on timeout."""
+        self.start()
+        try:
+            await asyncio.wait_for(self._drained.wait(), timeout=timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+
+    async def close(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await asyncio.get_event_loop().run_in_executor(self._executor, self._disconnect)
+        self._executor.shutdown(wait=False)
+
+    def _ack(self, event_id: str):
+        _append_line(self._acked_path, event_id)
+        self._pending.pop(event_id, None)
+        if not self._pending:
+            self._drained.set()
+
+    async def _run(self):
+        loop = asyncio.get_event_loop()
+        delay = 1
+        while True:
+            if not self._pending:
+                self._wakeup.clear()
+                await self._wakeup.wait()
+                continue
+            record = next(iter(self._pending.values()))
+            event = record["body"].get("event", record["path"].rsplit("/", 1)[-1])
+            status = await loop.run_in_executor(self._executor, self._send, record)
+
+            if status is None or status >= 500 or status in (408, 429):
+                # Backend down or restarting: keep the event and back off
+                print(f"[MONITOR] Outbox: '{event}' not delivered "
+                      f"({status or 'no connection'}), retrying in {delay}s")
+                await asyncio.sleep(delay + random.uniform(0, delay / 2))
+                delay = min(delay * 2, _OUTBOX_BACKOFF_MAX_SECONDS)
+                continue
+
+            delay = 1
+            if status < 300:
+                print(f"[MONITOR] Reported '{event}'")
+            else:
+                # Rejected for good (bad secret, meeting deleted): resending can't help
+                print(f"[MONITOR] ⚠ Backend rejected '{event}' with HTTP {status} — dropping")
+            self._ack(record["id"])
+
+    def _connect(self):
+        if self._api.scheme == "https":
+            return http.client.HTTPSConnection(self._api.netloc, timeout=_OUTBOX_REQUEST_TIMEOUT_SECONDS)
+        return http.client.HTTPConnection(self._api.netloc, timeout=_OUTBOX_REQUEST_TIMEOUT_SECONDS)
+
+    def _disconnect(self):
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+    def _send(self, record: dict) -> Optional[int]:
+        """POST one event on the pooled connection (sender thread). None = no response."""
+        headers = dict(self._headers, **{"Idempotency-Key": record["id"]})
+        body = json.dumps(record["body"]).encode("utf-8")
+        # A keep-alive connection the server already closed fails on first use;
+        # retry once on a fresh one before calling it a failed attempt
+        for _ in range(2):
+            fresh = self._connection is None
+            if fresh:
+                self._connection = self._connect()
+            try:
+                self._connection.request("POST", self._api.path.rstrip("/") + record["path"], body, headers)
+                response = self._connection.getresponse()
+                response.read()
+                if response.will_close:
+                    self._disconnect()
+                return response.status
+            except (OSError, http.client.HTTPException) as e:
+                self._disconnect()
+                if fresh:
+                    print(f"[MONITOR] Outbox: {e}")
+                    return None
+        return None
+
+
+_outboxes: Dict[str, EventOutbox] = {}
+
+
+def open_outbox(meeting_id: str, api_url: str, api_secret: str) -> EventOutbox:
+    """The meeting's outbox for this process; resends anything left from earlier runs."""
+    outbox = _outboxes.get(meeting_id)
+    if outbox is None:
+        outbox = _outboxes[meeting_id] = EventOutbox(_recording_dir(meeting_id), api_url, api_secret)
+        outbox.start()
+    return outbox
+
+
+async def report_event(
+    meeting_id: Optional[str], api_url: str, api_secret: str, event: str
+) -> bool:
+    """
+    Report a join milestone ('browser_ready', 'lobby_reached', 'admitted')
+    to the backend without blocking the event loop. The backend learns
+    per-platform pre-launch lead times and join latencies from these.
+    The event is queued in the outbox; True once it is safely on disk.
+    """
     if not meeting_id:
-        print("[MONITOR] No meeting_id — skipping backend update")
         return False
+    try:
+        open_outbox(meeting_id, api_url, api_secret).enqueue(
+            f"/meetings/{meeting_id}/events",
+            {"event": event, "at": datetime.now(timezone.utc).isoformat()},
+        )
+    except OSError as e:
+        print(f"[MONITOR] Could not queue '{event}': {e}")
+        return False
+    return True
 
-    endpoint = f"{api_url}/meetings/{meeting_id}/complete"
-    headers = {
-        "Authorization": f"Bearer {api_secret}",
-        "Content-Type": "application/json",
-    }
-    payload = json.dumps({}).encode("utf-8")
 
-    for attempt in range(1, 4):
+async def _mark_completed(meeting_id: str, api_url: str, api_secret: str):
+    """Queue /meetings/{id}/complete and wait, however long it takes, for delivery."""
+    outbox = open_outbox(meeting_id, api_url, api_secret)
+    outbox.enqueue(
+        f"/meetings/{meeting_id}/complete",
+        {"at": datetime.now(timezone.utc).isoformat()},
+    )
+    await outbox.drain()
+    await outbox.close()
+    print(f"[MONITOR] ✅ Meeting {meeting_id} marked COMPLETED")
+
+
+# ── Tick recorder (replay corpus) ─────────────────────────────────────────────
+# With MONITOR_RECORD=true the monitor polls at a fixed dense cadence and
+# writes every tick's raw frame inputs (url, text, selector hits, DOM end
+# markers) to monitor_ticks.jsonl.gz in the recording dir, plus what the
+# in-page matcher made of them ("live"). replay_monitor.py runs EndDetector
+# over a corpus of these files offline.
+_RECORD_FILE = "monitor_ticks.jsonl.gz"
+_RECORD_POLL_SECONDS = 5
+_RECORD_LIVE_KEYS = ("end", "timer", "participants", "chars")
+
+
+def _recording_enabled() -> bool:
+    return os.environ.get("MONITOR_RECORD", "").lower() in ("1", "true", "yes")
+
+
+class TickRecorder:
+    """Appends monitor ticks to a gzipped JSONL file, flushed every record."""
+
+    def __init__(self, path: str, platform: str, meeting_id: Optional[str], scheduled_end: Optional[datetime]):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.path = path
+        self._file = gzip.open(path, "at", encoding="utf-8")
+        self._started = time.monotonic()
+        self._write({
+            "type": "meta",
+            "platform": platform,
+            "meeting_id": meeting_id,
+            "started_at": datetime.now(timezone.utc).isoformat(),
+            "scheduled_end": scheduled_end.isoformat() if scheduled_end else None,
+            "interval": _RECORD_POLL_SECONDS,
+        })
+
+    def _write(self, record: dict):
+        if record["type"] != "meta":
+            record["t"] = round(time.monotonic() - self._started, 3)
+        self._file.write(json.dumps(record) + "\n")
+        self._file.flush()
+
+    def tick(self, url: str, snapshots: list, failed: int = 0):
+        self._write({
+            "type": "tick",
+            "url": url,
+            "failed": failed,
+            "frames": [
+                {
+                    **{k: snap.get(k) for k in ("url", "text", "dom_end", "hits")},
+                    "live": {k: snap.get(k) for k in _RECORD_LIVE_KEYS},
+                }
+                for snap in snapshots
+            ],
+        })
+
+    def observer(self, reason: str):
+        self._write({"type": "observer", "reason": reason})
+
+    def end(self, reason: str):
+        self._write({"type": "end", "reason": reason})
+
+    def close(self):
         try:
-            req = urllib.request.Request(
-                endpoint, data=payload, headers=headers, method="POST"
-            )
-            with urllib.request.urlopen(req, timeout=10) as resp:
-                if resp.status in (200, 204):
-                    print(f"[MONITOR] ✅ Meeting {meeting_id} marked COMPLETED")
-                    return True
-                print(f"[MONITOR] Backend returned HTTP {resp.status}")
-        except urllib.error.HTTPError as e:
-            print(f"[MONITOR] HTTP {e.code} on attempt {attempt}: {e.reason}")
+            self._file.close()
         except Exception as e:
-            print(f"[MONITOR] Attempt {attempt} error: {e}")
-        time.sleep(2 ** attempt)
-
-    print("[MONITOR] ⚠ Could not reach backend after 3 attempts")
-    return False
+            print(f"[MONITOR] Recorder close: {e}")
 
 
 async def monitor_and_complete(
@@ -312,124 +922,148 @@ async def monitor_and_complete(
     meeting_id: Optional[str],
     api_url: str = "http://localhost:8000/api/v1",
     api_secret: str = "",
-    poll_interval: int = 10,
+    poll_interval: int = 30,
     max_hours: int = 4,
+    scheduled_time=None,
+    duration_minutes: Optional[int] = None,
 ):
     """
     Monitor a meeting for end signals. When ended:
       1. Closes the browser context
-      2. Calls /meetings/{id}/complete on the backend
+      2. Queues /meetings/{id}/complete in the outbox and waits for delivery
+
+    Possible end screens wake the loop for an immediate check as soon as the
+    in-page observer sees them; the heartbeat poll covers everything else.
+    With scheduled_time and duration_minutes it slows to _POLL_SLOW_SECONDS
+    mid-meeting and speeds up around the scheduled end; without them it runs
+    every poll_interval.
     """
-    max_polls = int((max_hours * 3600) / poll_interval)
+    loop = asyncio.get_event_loop()
+    started = loop.time()
+    deadline = started + max_hours * 3600
+    scheduled_end = _scheduled_end(scheduled_time, duration_minutes)
 
     print(f"\n[MONITOR] Watching {platform} (ID: {meeting_id or 'None'})")
-    print(f"[MONITOR] Poll every {poll_interval}s · max {max_hours}h")
+    if scheduled_end:
+        print(f"[MONITOR] Scheduled to end {scheduled_end:%H:%M} UTC · adaptive heartbeat · max {max_hours}h")
+    else:
+        print(f"[MONITOR] Heartbeat every {poll_interval}s · max {max_hours}h")
+
+    # Pushed by the in-page observer: wakes the loop for an immediate check
+    wake = asyncio.Event()
+    observer_reasons: list = []
+
+    def _on_observer_signal(observed: str):
+        observer_reasons.append(observed)
+        wake.set()
+
+    if await _install_end_observer(page, context, platform, _on_observer_signal):
+        print("[MONITOR] End observer installed in all frames")
+    try:
+        # New frames get the snapshot matcher up front; existing ones on first use
+        await context.add_init_script(_snapshot_init_script(platform))
+    except Exception as e:
+        print(f"[MONITOR] Snapshot script not pre-installed: {e}")
 
     # Wait for page to fully settle inside the meeting
     await asyncio.sleep(8)
 
+    recorder = None
+    if _recording_enabled():
+        path = os.path.join(_recording_dir(meeting_id or "local"), _RECORD_FILE)
+        try:
+            recorder = TickRecorder(path, platform, meeting_id, scheduled_end)
+            print(f"[MONITOR] Recording ticks every {_RECORD_POLL_SECONDS}s to {path}")
+        except OSError as e:
+            print(f"[MONITOR] Tick recorder unavailable: {e}")
+
     # Confirm we are inside the meeting
-    seen_active_selector = await _active_selector_present(page, platform)
+    snapshots, failed = await _snapshot_frames(page, platform, record=recorder is not None)
+    if recorder:
+        recorder.tick(page.url, snapshots, failed)
+    seen_active_selector = any(s["active"] for s in snapshots)
     if seen_active_selector:
         print("[MONITOR] Active meeting controls confirmed — tracking end signals")
+        await report_event(meeting_id, api_url, api_secret, "admitted")
     else:
         print("[MONITOR] Active controls not found yet — relying on frame/text signals")
 
-    # Teams-specific: track call timer for freeze/disappearance
-    teams_timer_confirmed = False   # True once we've seen the timer
-    teams_last_timer: Optional[int] = None
-    teams_timer_frozen_count = 0
-
-    # Teams-specific: track participant count (bot alone = meeting over)
-    teams_alone_count = 0           # consecutive polls where participant count <= 1
-    teams_last_participant_count: Optional[int] = None
-
+    detector = EndDetector(platform, seen_active_selector)
     ended = False
     reason = ""
+    tick = 0
+    next_progress = loop.time() + 300
 
-    for tick in range(max_polls):
+    while loop.time() < deadline:
+        if recorder:
+            interval = _RECORD_POLL_SECONDS  # Dense, fixed: replay picks its own cadence
+        else:
+            interval = _next_poll_interval(
+                datetime.now(timezone.utc), scheduled_end, detector.suspect, poll_interval
+            )
         try:
-            await asyncio.sleep(poll_interval)
+            await asyncio.wait_for(wake.wait(), timeout=min(interval, deadline - loop.time()))
+        except asyncio.TimeoutError:
+            pass
         except asyncio.CancelledError:
             reason = "cancelled"
             break
 
-        # ── Teams call-timer freeze/disappearance detection ─────────────────
-        if platform == "microsoft_teams":
-            ft = await _get_all_frame_text(page)
-            timer_secs = _extract_timer_seconds(ft)
-
-            if timer_secs is not None:
-                if not teams_timer_confirmed:
-                    teams_timer_confirmed = True
-                    teams_last_timer = timer_secs
-                    print(f"[MONITOR] Teams call timer confirmed: {timer_secs}s")
-                else:
-                    if timer_secs != teams_last_timer:
-                        # Timer is advancing — meeting active
-                        teams_timer_frozen_count = 0
-                        teams_last_timer = timer_secs
-                    else:
-                        # Timer value unchanged since last poll
-                        teams_timer_frozen_count += 1
-                        print(f"[MONITOR] Teams timer frozen at {timer_secs}s ({teams_timer_frozen_count}/3 polls)")
-                        if teams_timer_frozen_count >= 3:
-                            reason = f"teams_timer_frozen_at_{timer_secs}s"
-                            ended = True
-                            break
-            elif teams_timer_confirmed:
-                # Timer was present before but is now gone — strong end signal
-                print("[MONITOR] Teams call timer disappeared")
-                reason = "teams_timer_disappeared"
-                ended = True
-                break
-
-            # ── Teams participant count detection ─────────────────────────────
-            # Frame text shows '2 people', '3 people', etc.
-            # When host leaves, it drops to '1 person' or '1 people' — bot is alone.
-            participant_count = _extract_teams_participant_count(ft)
-            if participant_count is not None:
-                teams_last_participant_count = participant_count
-                if participant_count <= 1:
-                    teams_alone_count += 1
-                    print(f"[MONITOR] Teams: bot appears alone ({participant_count} participant) [{teams_alone_count}/2 polls]")
-                    if teams_alone_count >= 2:
-                        reason = f"teams_bot_alone_{participant_count}_participants"
-                        ended = True
-                        break
-                else:
-                    teams_alone_count = 0  # reset — others are still in
-
-            # Log participant count and frame text every poll for debugging
-            if tick < 5 or tick % 5 == 0:
-                for _, text in ft:
-                    snippet = text.replace('\n', ' ')[:200]
-                    print(f"[MONITOR]   frame text: {snippet!r}")
+        if wake.is_set():
+            wake.clear()
+            print(f"[MONITOR] Observer: {observer_reasons[-1]} — checking now")
+            if recorder:
+                recorder.observer(observer_reasons[-1])
 
-        # ── Generic end-signal checks ───────────────────────────────────────
-        active, reason = await _is_meeting_active(
-            page, platform, seen_active_selector, tick
-        )
+        # Signal 0 — browser closed
+        try:
+            reason = "browser_closed" if page.is_closed() else ""
+        except Exception:
+            reason = "context_lost"
+        if reason:
+            print(f"[MONITOR] Meeting ended — reason: {reason}")
+            ended = True
+            break
 
-        if not active:
+        # One concurrent round trip over all frames feeds every check below
+        # Verbose frame logging on the first polls and every 10th
+        debug_frames = (tick < 3) or (tick % 10 == 0)
+        snapshots, failed = await _snapshot_frames(page, platform, with_text=debug_frames, record=recorder is not None)
+        url = page.url
+        if recorder:
+            recorder.tick(url, snapshots, failed)
+        if debug_frames:
+            print(f"[MONITOR] URL: {url.lower()[:80]}")
+            print(f"[MONITOR] Scanned {len(snapshots)} frame(s)" + (f", {failed} unanswered" if failed else ""))
+            for snap in snapshots:
+                if snap.get("snippet"):
+                    print(f"[MONITOR]   frame text: {snap['snippet']!r}")
+
+        reason = detector.observe(url.lower(), snapshots, failed)
+        if reason:
             print(f"[MONITOR] Meeting ended — reason: {reason}")
             ended = True
             break
 
-        # Re-check whether we've now confirmed the active selector
-        if not seen_active_selector:
-            seen_active_selector = await _active_selector_present(page, platform)
-            if seen_active_selector:
-                print("[MONITOR] Now tracking active meeting controls")
+        if detector.newly_active:
+            print("[MONITOR] Now tracking active meeting controls")
+            await report_event(meeting_id, api_url, api_secret, "admitted")
+
+        tick += 1
 
         # Progress log every 5 minutes
-        if (tick + 1) % max(1, 300 // poll_interval) == 0:
-            elapsed_min = ((tick + 1) * poll_interval) // 60
-            print(f"[MONITOR] Still in meeting ({elapsed_min} min elapsed)")
+        if loop.time() >= next_progress:
+            elapsed_min = int(loop.time() - started) // 60
+            print(f"[MONITOR] Still in meeting ({elapsed_min} min elapsed, polling every {interval}s)")
+            next_progress += 300
 
     if not ended:
         print(f"[MONITOR] Max duration ({max_hours}h) reached — forcing close")
 
+    if recorder:
+        recorder.end(reason if ended else "max_duration")
+        recorder.close()
+
     # ── Close browser ──────────────────────────────────────────────────────────
     try:
         if not page.is_closed():
@@ -440,4 +1074,29 @@ async def monitor_and_complete(
 
     # ── Notify backend ─────────────────────────────────────────────────────────
     if meeting_id:
-        _mark_completed(meeting_id, api_url, api_secret)
+        await _mark_completed(meeting_id, api_url, api_secret)
+    else:
+        print("[MONITOR] No meeting_id — skipping backend update")
+
+
+async def _drain_outbox(meeting_id: str, api_url: str, api_secret: str, max_seconds: Optional[float] = None) -> bool:
+    outbox = open_outbox(meeting_id, api_url, api_secret)
+    drained = await outbox.drain(max_seconds)
+    await outbox.close()
+    if not drained:
+        print(f"[MONITOR] Outbox: gave up after {max_seconds:.0f}s; events stay on disk for the next drain")
+    return drained
+
+
+if __name__ == "__main__":
+    # Resend whatever a bot left in its outbox (the bot-worker entrypoint
+    # runs this after the bot exits, so a crash can't lose the completion)
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Deliver a meeting's unsent bot events")
+    parser.add_argument("--meeting-id", required=True)
+    parser.add_argument("--api-url", default="http://localhost:8000/api/v1")
+    parser.add_argument("--api-secret", default="")
+    parser.add_argument("--max-seconds", type=float, default=None, help="Give up after this long (default: retry until sent)")
+    args = parser.parse_args()
+    sys.exit(0 if asyncio.run(_drain_outbox(args.meeting_id, args.api_url, args.api_secret, args.max_seconds)) else 1)
@@ -0,0 +1,265 @@
+"""
+Meeting-End Replay — benchmark end detection against recorded meetings.
+
+Replays monitor_ticks.jsonl.gz files (recorded by bots with
+MONITOR_RECORD=true / BOT_RECORD_MONITOR) through the same EndDetector the
+live monitor runs, with frame snapshots rebuilt from the recorded text by
+_snapshot_from_text, so changes to _END_PHRASES, the timer or participant
+extraction, or the detector itself are measured without a browser.
+
+Each recording is replayed at the adaptive cadence the live monitor would
+use (picking the first recorded tick at or after each poll), or at every
+recorded tick with --cadence recorded. The in-page end observer is modelled
+as waking the detector, out of cadence, on every recorded tick where a new
+end marker or phrase appears (--no-observer to leave it out).
+
+Frames recorded with the live matcher's results ("live") are checked
+against the rebuilt snapshot: disagreements are counted (--max-disagreements
+gates them), and where the recorder cut the text short, a match the live
+matcher made past the cut stands in for the one replay can't see.
+
+Ground truth is when the meeting really ended, in seconds from the start of
+the recording: a {"type": "label", "end_t": ...} line in the file, or
+--labels labels.json ({"<meeting id or file path>": end_t}; null = it did
+not end while recorded; "#1" etc. for later sessions in the same file).
+Unlabelled recordings fall back to when the live monitor saw the end. A
+detection before end_t - --tolerance is a false positive.
+
+Usage:
+    python replay_monitor.py recordings/                   # every monitor_ticks*.jsonl.gz below
+    python replay_monitor.py corpus/ --labels labels.json --max-false-positive-rate 0 --max-p95-latency 30
+    python replay_monitor.py one.jsonl.gz --cadence recorded --verbose
+
+tests/replay_corpus holds a small labelled corpus (one recording per
+platform plus a toast that must not end the meeting); tests/test_replay_monitor.py
+gates every change on it.
+"""
+import argparse
+import gzip
+import json
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import List, Tuple
+
+from meeting_monitor import (
+    EndDetector,
+    _next_poll_interval,
+    _snapshot_from_text,
+)
+
+LIVE_ONLY_REASONS = ("max_duration", "cancelled")  # Not a meeting end
+LIVE_FIELDS = ("end", "timer", "participants")
+
+
+def _percentile(values: List[float], q: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+def _find_recordings(paths: List[str]) -> List[Path]:
+    found = []
+    for p in map(Path, paths):
+        found += sorted(p.rglob("monitor_ticks*.jsonl.gz")) if p.is_dir() else [p]
+    return found
+
+
+def _load_sessions(path: Path) -> List[dict]:
+    """One file may hold several monitor sessions (the bot ran again): split at each meta."""
+    sessions = []
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue  # Torn last line from a killed bot
+            kind = record.get("type")
+            if kind == "meta":
+                sessions.append({"meta": record, "ticks": [], "end": None, "label": None})
+            elif not sessions:
+                continue
+            elif kind == "tick":
+                sessions[-1]["ticks"].append(record)
+            elif kind == "end" and sessions[-1]["end"] is None:
+                sessions[-1]["end"] = record
+            elif kind == "label":
+                sessions[-1]["label"] = record
+    return [s for s in sessions if s["ticks"]]
+
+
+def _rebuild(platform: str, frame: dict) -> Tuple[dict, bool]:
+    """A recorded frame's snapshot, and whether it disagrees with the live matcher."""
+    text = frame.get("text") or ""
+    snapshot = _snapshot_from_text(platform, frame.get("url") or "", text, frame.get("dom_end") or "", frame.get("hits"))
+    live = frame.get("live")
+    if live is None:
+        return snapshot, False  # Recorded before live results were kept
+    truncated = (live.get("chars") or 0) > len(text)
+    disagrees = False
+    for key in LIVE_FIELDS:
+        if snapshot[key] == live.get(key):
+            continue
+        if truncated and snapshot[key] in (None, ""):
+            snapshot[key] = live.get(key)  # Matched past the recorder's text cap
+        else:
+            disagrees = True
+    return snapshot, disagrees
+
+
+def _ground_truth(keys: List[str], session: dict, labels: dict):
+    """(end_t or None, source)"""
+    for key in keys:
+        if key in labels:
+            return labels[key], "labels"
+    if session["label"] is not None:
+        return session["label"].get("end_t"), "label"
+    end = session["end"]
+    if end is not None and end["reason"] not in LIVE_ONLY_REASONS:
+        return end["t"], "live"
+    return None, "live"
+
+
+def _replay(session: dict, args) -> dict:
+    """Run the detector over one session; returns detection time, reason and per-tick CPU."""
+    meta = session["meta"]
+    platform = meta["platform"]
+    ticks = session["ticks"]
+    started_at = datetime.fromisoformat(meta["started_at"])
+    scheduled_end = datetime.fromisoformat(meta["scheduled_end"]) if meta.get("scheduled_end") else None
+
+    disagreements = 0
+
+    def snapshots_of(tick: dict) -> list:
+        nonlocal disagreements
+        snapshots = []
+        for frame in tick["frames"]:
+            snapshot, disagrees = _rebuild(platform, frame)
+            snapshots.append(snapshot)
+            disagreements += disagrees
+        return snapshots
+
+    # First tick is the live monitor's "are we in?" check
+    first = snapshots_of(ticks[0])
+    detector = EndDetector(platform, any(s["active"] for s in first), log=(print if args.verbose else lambda *_: None))
+
+    cpu_ns: List[int] = []
+    detected_t, reason, evaluated = None, "", 0
+    target = ticks[0]["t"]
+    shown = {s["end"] for s in first if s["end"]}
+    for tick in ticks[1:]:
+        snapshots = snapshots_of(tick)
+        # The observer wakes the loop when an end marker/phrase appears
+        ends = {s["end"] for s in snapshots if s["end"]}
+        woken = args.observer and bool(ends - shown)
+        shown = ends
+        if args.cadence == "adaptive" and tick["t"] < target and not woken:
+            continue
+        started = time.process_time_ns()
+        reason = detector.observe(tick["url"].lower(), snapshots, tick.get("failed", 0))
+        cpu_ns.append(time.process_time_ns() - started)
+        evaluated += 1
+        if reason:
+            detected_t = tick["t"]
+            break
+        now = started_at + timedelta(seconds=tick["t"])
+        target = tick["t"] + _next_poll_interval(now, scheduled_end, detector.suspect, args.poll_interval)
+
+    return {
+        "detected_t": detected_t, "reason": reason, "cpu_ns": cpu_ns, "evaluated": evaluated,
+        "disagreements": disagreements,
+    }
+
+
+def main(args) -> int:
+    labels = {}
+    if args.labels:
+        with open(args.labels, encoding="utf-8") as f:
+            labels = json.load(f)
+
+    recordings = _find_recordings(args.paths)
+    if not recordings:
+        print("No recordings found")
+        return 1
+
+    rows, latencies, cpu_ns = [], [], []
+    false_positives = missed = disagreements = 0
+    for path in recordings:
+        for index, session in enumerate(_load_sessions(path)):
+            suffix = f"#{index}" if index else ""
+            meeting_id = session["meta"].get("meeting_id") or path.parent.name
+            name = f"{meeting_id}{suffix}"
+            end_t, source = _ground_truth([str(path) + suffix, name], session, labels)
+            result = _replay(session, args)
+            cpu_ns += result["cpu_ns"]
+            disagreements += result["disagreements"]
+            detected_t = result["detected_t"]
+
+            if detected_t is None:
+                outcome = "missed" if end_t is not None else "ok (no end)"
+                missed += end_t is not None
+            elif end_t is None or detected_t < end_t - args.tolerance:
+                outcome = "FALSE POSITIVE"
+                false_positives += 1
+            else:
+                latencies.append(detected_t - end_t)
+                outcome = f"+{detected_t - end_t:.0f}s"
+            rows.append((
+                name, session["meta"]["platform"], f"{result['evaluated']}/{len(session['ticks'])}",
+                "-" if end_t is None else f"{end_t:.0f}s ({source})",
+                "-" if detected_t is None else f"{detected_t:.0f}s", outcome, result["reason"][:60],
+            ))
+
+    header = ("recording", "platform", "ticks", "ended", "detected", "outcome", "reason")
+    widths = [max(len(str(r[i])) for r in rows + [header]) for i in range(len(header))]
+    for row in [header] + rows:
+        print("  ".join(str(v).ljust(w) for v, w in zip(row, widths)).rstrip())
+
+    total = len(rows)
+    fp_rate = false_positives / total if total else 0.0
+    print(f"\n{total} recording(s): {false_positives} false positive(s) ({fp_rate:.1%}), {missed} missed")
+    if latencies:
+        print(f"Detection latency: mean={statistics.mean(latencies):.1f}s  p50={_percentile(latencies, 0.50):.1f}s  "
+              f"p95={_percentile(latencies, 0.95):.1f}s  max={max(latencies):.1f}s")
+    if disagreements:
+        print(f"Live matcher: {disagreements} replayed frame(s) disagree with what the bot saw")
+    if cpu_ns:
+        us = [n / 1000 for n in cpu_ns]
+        print(f"Per-tick CPU: n={len(us)}  mean={statistics.mean(us):.0f} µs  "
+              f"p95={_percentile(us, 0.95):.0f} µs  max={max(us):.0f} µs")
+
+    failed = []
+    if args.max_false_positive_rate is not None and fp_rate > args.max_false_positive_rate:
+        failed.append(f"false-positive rate {fp_rate:.1%} > {args.max_false_positive_rate:.1%}")
+    if args.max_missed is not None and missed > args.max_missed:
+        failed.append(f"{missed} missed > {args.max_missed}")
+    if args.max_p95_latency is not None and latencies and _percentile(latencies, 0.95) > args.max_p95_latency:
+        failed.append(f"p95 latency {_percentile(latencies, 0.95):.1f}s > {args.max_p95_latency}s")
+    if args.max_disagreements is not None and disagreements > args.max_disagreements:
+        failed.append(f"{disagreements} frame(s) disagree with the live matcher > {args.max_disagreements}")
+    for failure in failed:
+        print(f"FAIL: {failure}")
+    return 1 if failed else 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Replay recorded meetings through the end detector")
+    parser.add_argument("paths", nargs="+", help="Recording files or directories to search")
+    parser.add_argument("--labels", default=None, help="JSON {recording or meeting id: end_t seconds | null}")
+    parser.add_argument("--cadence", choices=("adaptive", "recorded"), default="adaptive",
+                        help="Poll like the live monitor, or evaluate every recorded tick")
+    parser.add_argument("--poll-interval", type=int, default=30, help="Heartbeat when a recording has no schedule")
+    parser.add_argument("--no-observer", dest="observer", action="store_false", help="Leave the in-page observer out")
+    parser.add_argument("--tolerance", type=float, default=0, help="Seconds early a detection may be and still count")
+    parser.add_argument("--max-false-positive-rate", type=float, default=None, help="Exit 1 above this (0-1)")
+    parser.add_argument("--max-missed", type=int, default=None, help="Exit 1 above this many missed ends")
+    parser.add_argument("--max-p95-latency", type=float, default=None, help="Exit 1 above this many seconds")
+    parser.add_argument("--max-disagreements", type=int, default=None,
+                        help="Exit 1 above this many frames where replay and the live matcher differ")
+    parser.add_argument("--verbose", action="store_true", help="Show the detector's own log lines")
+    return parser
+
+
+if __name__ == "__main__":
+    sys.exit(main(build_parser().parse_args()))
@@ -4,11 +4,15 @@ Automated Google Meet Join - Uses separate profile (no need to close Chrome)
 import asyncio
 import argparse
 from playwright.async_api import async_playwright
-from meeting_monitor import monitor_and_complete
+from meeting_monitor import monitor_and_complete, report_event
+from bot_browser import open_bot_context
 
 async def join_meeting_auto(meeting_url: str, meeting_id: str = None,
                             api_url: str = "http://localhost:8000/api/v1",
-                            api_secret: str = ""):
+                            api_secret: str = "",
+                            browser_pool: str = None,
+                            scheduled_time: str = None,
+                            duration_minutes: int = None):
     """
     Join Google Meet automatically 
     Note: You'll need to log in once, then it will remember your session
@@ -23,36 +27,17 @@ async def join_meeting_auto(meeting_url: str, meeting_id: str = None,
     async with async_playwright() as p:
         print("\n[INFO] Launching Chrome...")
         
-        # Use persistent context to reuse browser sessions and open in new tabs
-        import os
-        from pathlib import Path
-        
-        # Create user data directory for persistent browser profile
-        user_data_dir = Path.home() / ".meetborg" / "chrome_profile"
-        user_data_dir.mkdir(parents=True, exist_ok=True)
-        
-        # Launch persistent context (reuses existing browser if running)
-        import os
-        docker_args = ["--no-sandbox", "--disable-dev-shm-usage"] if os.environ.get("DOCKER_ENV") == "1" else []
-        context = await p.chromium.launch_persistent_context(
-            str(user_data_dir),
-            headless=False,
-            channel='chrome',
-            args=docker_args + [
-                '--disable-blink-features=AutomationControlled',
-                '--use-fake-ui-for-media-stream',
-                '--use-fake-device-for-media-stream',
-                '--window-size=1280,720',
-                '--window-position=100,50',
-            ],
+        # Warm pooled Chrome if available, else persistent-profile cold launch
+        context = await open_bot_context(
+            p,
+            pool_address=browser_pool,
             permissions=['camera', 'microphone'],
             viewport={'width': 1280, 'height': 720}
         )
-        
-        print("[OK] Chrome launched!")
 
         # Create new page (new tab in existing browser)
         page = await context.new_page()
+        await report_event(meeting_id, api_url, api_secret, "browser_ready")
 
         # Force window size via CDP — overrides profile's saved maximized state
         try:
@@ -304,6 +289,7 @@ async def join_meeting_auto(meeting_url: str, meeting_id: str = None,
                     print("[SUCCESS] Join request sent/confirmed!")
                     print("[SUCCESS] The bot is now waiting to be admitted.")
                     print("=" * 60)
+                    await report_event(meeting_id, api_url, api_secret, "lobby_reached")
                 else:
                     print("[WARN] Could not click join button and not in waiting room")
                     await page.screenshot(path='meeting_page.png')
@@ -322,6 +308,8 @@ async def join_meeting_auto(meeting_url: str, meeting_id: str = None,
             meeting_id=meeting_id,
             api_url=api_url,
             api_secret=api_secret,
+            scheduled_time=scheduled_time,
+            duration_minutes=duration_minutes,
         )
         return True
 
@@ -335,6 +323,9 @@ if __name__ == "__main__":
     parser.add_argument("--meeting-id", default=None, help="Meeting ID for completion callback")
     parser.add_argument("--api-url", default="http://localhost:8000/api/v1")
     parser.add_argument("--api-secret", default="")
+    parser.add_argument("--browser-pool", default=None, help="host:port of browser_pool.py")
+    parser.add_argument("--scheduled-time", default=None, help="ISO start time (UTC), paces end detection")
+    parser.add_argument("--duration-minutes", type=int, default=None)
     args = parser.parse_args()
 
     result = asyncio.run(join_meeting_auto(
@@ -342,6 +333,9 @@ if __name__ == "__main__":
         meeting_id=args.meeting_id,
         api_url=args.api_url,
         api_secret=args.api_secret,
+        browser_pool=args.browser_pool,
+        scheduled_time=args.scheduled_time,
+        duration_minutes=args.duration_minutes,
     ))
 
     if result:
@@ -8,11 +8,15 @@ import sys
 import os
 from pathlib import Path
 from playwright.async_api import async_playwright
-from meeting_monitor import monitor_and_complete
+from meeting_monitor import monitor_and_complete, report_event
+from bot_browser import open_bot_context
 
 async def join_teams_meeting(meeting_url: str, meeting_id: str = None,
                             api_url: str = "http://localhost:8000/api/v1",
-                            api_secret: str = ""):
+                            api_secret: str = "",
+                            browser_pool: str = None,
+                            scheduled_time: str = None,
+                            duration_minutes: int = None):
     print("=" * 60)
     print("Automated Microsoft Teams Join Bot")
     print("=" * 60)
@@ -20,30 +24,17 @@ async def join_teams_meeting(meeting_url: str, meeting_id: str = None,
     print("=" * 60)
     
     async with async_playwright() as p:
-        # Create user data directory for persistent browser profile
-        user_data_dir = Path.home() / ".meetborg" / "chrome_profile"
-        user_data_dir.mkdir(parents=True, exist_ok=True)
-        
-        docker_args = ["--no-sandbox", "--disable-dev-shm-usage"] if os.environ.get("DOCKER_ENV") == "1" else []
-        
-        context = await p.chromium.launch_persistent_context(
-            str(user_data_dir),
-            headless=False,
-            channel='chrome',
-            args=docker_args + [
-                '--disable-blink-features=AutomationControlled',
-                '--use-fake-ui-for-media-stream',
-                '--use-fake-device-for-media-stream',
-                '--window-size=1280,720',
-                '--window-position=100,50',
-            ],
+        # Warm pooled Chrome if available, else persistent-profile cold launch
+        context = await open_bot_context(
+            p,
+            pool_address=browser_pool,
             permissions=['camera', 'microphone'],
             viewport={'width': 1280, 'height': 720},
             user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
         )
         
-        print("[OK] Chrome launched!")
         page = await context.new_page()
+        await report_event(meeting_id, api_url, api_secret, "browser_ready")
         
         # Help Teams bypass the "Open app" popup
         print(f"\n[INFO] Navigating to meeting: {meeting_url}")
@@ -125,6 +116,7 @@ async def join_teams_meeting(meeting_url: str, meeting_id: str = None,
             if join_btn:
                 print("[SUCCESS] Clicking 'Join now'...")
                 await join_btn.click()
+                await report_event(meeting_id, api_url, api_secret, "lobby_reached")
                 await asyncio.sleep(5)
             else:
                 print("[ERR] Join button not found!")
@@ -140,6 +132,8 @@ async def join_teams_meeting(meeting_url: str, meeting_id: str = None,
             meeting_id=meeting_id,
             api_url=api_url,
             api_secret=api_secret,
+            scheduled_time=scheduled_time,
+            duration_minutes=duration_minutes,
         )
         return True
 
@@ -149,6 +143,9 @@ if __name__ == "__main__":
     parser.add_argument('--meeting-id', default=None)
     parser.add_argument('--api-url', default="http://localhost:8000/api/v1")
     parser.add_argument('--api-secret', default="")
+    parser.add_argument('--browser-pool', default=None, help='host:port of browser_pool.py')
+    parser.add_argument('--scheduled-time', default=None, help='ISO start time (UTC), paces end detection')
+    parser.add_argument('--duration-minutes', type=int, default=None)
     
     args = parser.parse_args()
     
@@ -156,5 +153,8 @@ if __name__ == "__main__":
         meeting_url=args.url,
         meeting_id=args.meeting_id,
         api_url=args.api_url,
-        api_secret=args.api_secret
+        api_secret=args.api_secret,
+        browser_pool=args.browser_pool,
+        scheduled_time=args.scheduled_time,
+        duration_minutes=args.duration_minutes
     ))
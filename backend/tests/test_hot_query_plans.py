@@ -0,0 +1,214 @@
+"""
+Hot query plans: the scheduler's due-meeting scan, the meetings list
+(count + ETag, first page, cursor page) and the bot reconciler's open-run
+and orphan checks must never scan meetings or bot_runs sequentially.
+
+Needs a migrated, DISPOSABLE Postgres: set DATABASE_URL to run (skipped
+otherwise). On a few thousand rows Postgres may rightly prefer a seq scan,
+so the module seeds a realistic table first — mostly finished history
+(each with its closed bot run), a thin slice of live meetings — and
+removes it afterwards. HOT_QUERY_SEED_ROWS sets the size (default 200,000).
+"""
+import asyncio
+import json
+import os
+from datetime import datetime
+from typing import List
+
+import pytest
+
+DATABASE_URL = os.environ.get("DATABASE_URL")
+if not DATABASE_URL:
+    pytest.skip("DATABASE_URL not set (needs a disposable Postgres)", allow_module_level=True)
+
+from sqlalchemy import select, func, and_, text
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.pool import NullPool
+from sqlalchemy.sql.expression import ClauseElement, Executable
+
+from app.models.meeting import Meeting, MeetingStatus
+from app.services.scheduler import scheduler
+from app.services.bot_supervisor import bot_supervisor
+from app.api.v1.endpoints.meetings import LIST_COLUMNS, _after_cursor, _encode_cursor
+
+SEED_PREFIX = "explain_seed_"
+SEED_ROWS = int(os.environ.get("HOT_QUERY_SEED_ROWS", "200000"))
+SEED_USERS = 100
+SEED_HOST = "explain-seed"
+SCANNED_TABLES = {"meetings", "bot_runs"}
+
+
+class Explain(Executable, ClauseElement):
+    """EXPLAIN (FORMAT JSON) <statement>, with the statement's own binds"""
+    inherit_cache = False
+
+    def __init__(self, statement):
+        self.statement = statement
+
+
+@compiles(Explain, "postgresql")
+def _compile_explain(element, compiler, **kw):
+    return "EXPLAIN (FORMAT JSON) " + compiler.process(element.statement, **kw)
+
+
+SEED_USERS_SQL = text(f"""
+    INSERT INTO users (id, username, hashed_password, is_active, is_superuser)
+    SELECT gen_random_uuid(), '{SEED_PREFIX}' || g, 'x', true, false
+    FROM generate_series(1, :users) g
+    ON CONFLICT (username) DO NOTHING
+""")
+
+# ~97% finished history spread over two years, a thin live slice ahead
+SEED_MEETINGS_SQL = text(f"""
+    INSERT INTO meetings (
+        id, url, platform, title, status, user_id, scheduled_time,
+        duration_minutes, created_at, updated_at, join_attempts,
+        join_attempted_at, next_attempt_at
+    )
+    SELECT
+        gen_random_uuid()::text,
+        'https://meet.google.com/abc-defg-hij',
+        'GOOGLE_MEET',
+        '{SEED_PREFIX}' || s.g,
+        CASE
+            WHEN s.r < 0.004 THEN 'SCHEDULED'
+            WHEN s.r < 0.0045 THEN 'QUEUED'
+            WHEN s.r < 0.0047 THEN 'IN_PROGRESS'
+            WHEN s.r < 0.015 THEN 'FAILED'
+            WHEN s.r < 0.03 THEN 'CANCELLED'
+            ELSE 'COMPLETED'
+        END::meetingstatus,
+        u.id,
+        CASE
+            WHEN s.r < 0.0045 THEN (now() AT TIME ZONE 'utc') + random() * interval '30 days'
+            WHEN s.r < 0.0047 THEN (now() AT TIME ZONE 'utc') - interval '10 minutes'
+            ELSE (now() AT TIME ZONE 'utc') - random() * interval '730 days'
+        END,
+        60,
+        now() AT TIME ZONE 'utc',
+        now() AT TIME ZONE 'utc',
+        0,
+        CASE WHEN s.r >= 0.0045 THEN now() AT TIME ZONE 'utc' END,
+        CASE WHEN s.r < 0.0003 THEN (now() AT TIME ZONE 'utc') + interval '1 minute' END
+    FROM (
+        SELECT g, random() AS r, g % :users AS user_index
+        FROM generate_series(1, :rows) g
+    ) s
+    JOIN (
+        SELECT id, (row_number() OVER (ORDER BY username)) - 1 AS user_index
+        FROM users WHERE username LIKE '{SEED_PREFIX}%'
+    ) u ON u.user_index = s.user_index
+""")
+
+
+# One run per meeting that got a bot: closed for finished meetings, open
+# for the IN_PROGRESS ones
+SEED_BOT_RUNS_SQL = text(f"""
+    INSERT INTO bot_runs (
+        id, meeting_id, host, attempt, status, started_at, last_heartbeat_at, ended_at
+    )
+    SELECT
+        gen_random_uuid()::text,
+        m.id,
+        '{SEED_HOST}',
+        1,
+        CASE WHEN m.status = 'IN_PROGRESS' THEN 'running' ELSE 'exited' END,
+        m.scheduled_time,
+        m.scheduled_time,
+        CASE WHEN m.status = 'IN_PROGRESS' THEN NULL ELSE m.scheduled_time + interval '1 hour' END
+    FROM meetings m
+    WHERE m.title LIKE '{SEED_PREFIX}%'
+      AND m.status IN ('IN_PROGRESS', 'COMPLETED', 'FAILED')
+""")
+
+
+def _engine():
+    return create_async_engine(
+        DATABASE_URL.replace("postgresql://", "postgresql+asyncpg://"), poolclass=NullPool
+    )
+
+
+async def _seed():
+    engine = _engine()
+    try:
+        async with engine.begin() as conn:
+            await conn.execute(SEED_USERS_SQL, {"users": SEED_USERS})
+            await conn.execute(SEED_MEETINGS_SQL, {"users": SEED_USERS, "rows": SEED_ROWS})
+            await conn.execute(SEED_BOT_RUNS_SQL)
+        async with engine.connect() as conn:
+            # Autocommit: ANALYZE can't run inside the transaction block
+            await conn.execution_options(isolation_level="AUTOCOMMIT")
+            await conn.execute(text("ANALYZE meetings"))
+            await conn.execute(text("ANALYZE bot_runs"))
+            return (await conn.execute(
+                text(f"SELECT id FROM users WHERE username LIKE '{SEED_PREFIX}%' ORDER BY username LIMIT 1")
+            )).scalar_one()
+    finally:
+        await engine.dispose()
+
+
+async def _cleanup():
+    engine = _engine()
+    try:
+        async with engine.begin() as conn:
+            await conn.execute(text(f"DELETE FROM bot_runs WHERE host = '{SEED_HOST}'"))
+            await conn.execute(text(f"DELETE FROM meetings WHERE title LIKE '{SEED_PREFIX}%'"))
+            await conn.execute(text(f"DELETE FROM users WHERE username LIKE '{SEED_PREFIX}%'"))
+    finally:
+        await engine.dispose()
+
+
+async def _plan(statement) -> dict:
+    engine = _engine()
+    try:
+        async with engine.connect() as conn:
+            raw = (await conn.execute(Explain(statement))).scalar_one()
+        return (json.loads(raw) if isinstance(raw, str) else raw)[0]["Plan"]
+    finally:
+        await engine.dispose()
+
+
+def _walk(plan: dict):
+    yield plan
+    for child in plan.get("Plans", ()):
+        yield from _walk(child)
+
+
+def _seq_scanned(plan: dict) -> List[str]:
+    return [
+        node["Relation Name"] for node in _walk(plan)
+        if node["Node Type"] == "Seq Scan" and node.get("Relation Name") in SCANNED_TABLES
+    ]
+
+
+@pytest.fixture(scope="module")
+def seeded_user_id():
+    user_id = asyncio.run(_seed())
+    yield user_id
+    asyncio.run(_cleanup())
+
+
+def _hot_queries(user_id) -> dict:
+    """name → statement for every query whose plan must use an index."""
+    now = datetime.utcnow()
+    mine = Meeting.user_id == user_id
+    scheduled = and_(mine, Meeting.status == MeetingStatus.SCHEDULED)
+    page_order = (Meeting.scheduled_time.asc().nullsfirst(), Meeting.id.asc())
+    after = _after_cursor(_encode_cursor({"scheduled_time": now, "id": ""}))
+    return {
+        "scheduler: due meetings": scheduler.due_query(now),
+        "list: count + etag": select(func.count(), func.max(Meeting.updated_at)).where(mine),
+        "list: count + etag (status)": select(func.count(), func.max(Meeting.updated_at)).where(scheduled),
+        "list: first page": select(*LIST_COLUMNS).where(mine).order_by(*page_order).limit(101),
+        "list: first page (status)": select(*LIST_COLUMNS).where(scheduled).order_by(*page_order).limit(101),
+        "list: cursor page": select(*LIST_COLUMNS).where(and_(mine, after)).order_by(*page_order).limit(101),
+        "reconcile: open runs": bot_supervisor.open_runs_query(),
+        "reconcile: orphaned meetings": bot_supervisor.orphaned_query(now),
+    }
+
+
+@pytest.mark.parametrize("name", list(_hot_queries(None)))
+def test_hot_query_uses_an_index(seeded_user_id, name):
+    plan = asyncio.run(_plan(_hot_queries(seeded_user_id)[name]))
+    assert not _seq_scanned(plan), f"{name} seq-scans: {json.dumps(plan, indent=2)}"
@@ -0,0 +1,116 @@
+"""
+Query budget instrumentation: counting hooks, query_budget, and the
+request middleware (Server-Timing header, route budget violations).
+Runs against in-memory SQLite. Query counting is dialect-independent;
+row counts come from the asyncpg adapter's buffered result, so they are
+not asserted here.
+"""
+import pytest
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.pool import StaticPool
+
+from app.db.instrumentation import (
+    QueryBudget,
+    QueryBudgetExceeded,
+    collect_violations,
+    install,
+    query_stats_middleware,
+)
+
+
+@pytest.fixture
+def engine():
+    # One shared connection: TestClient runs the app on another thread
+    engine = create_engine(
+        "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    install(engine)
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE items (id INTEGER PRIMARY KEY)"))
+        conn.execute(text("INSERT INTO items (id) VALUES (1), (2), (3)"))
+    yield engine
+    engine.dispose()
+
+
+def _run_queries(engine, count: int):
+    with engine.connect() as conn:
+        for _ in range(count):
+            conn.execute(text("SELECT id FROM items")).all()
+
+
+def test_query_budget_counts_queries(engine, query_budget):
+    with query_budget(queries=2) as stats:
+        _run_queries(engine, 2)
+    assert stats.queries == 2
+    assert stats.statements == ["SELECT id FROM items"] * 2
+
+
+def test_query_budget_raises_when_exceeded(engine, query_budget):
+    with pytest.raises(QueryBudgetExceeded, match="3 queries > budget 2"):
+        with query_budget(queries=2):
+            _run_queries(engine, 3)
+
+
+def test_nested_budget_restores_outer_counters(engine, query_budget):
+    with query_budget(queries=3) as outer:
+        _run_queries(engine, 1)
+        with query_budget(queries=1) as inner:
+            _run_queries(engine, 1)
+        _run_queries(engine, 1)
+    assert inner.queries == 1
+    assert outer.queries == 2
+
+
+def test_failed_statement_does_not_leak_start_times(engine):
+    with engine.connect() as conn:
+        for _ in range(3):
+            with pytest.raises(OperationalError):
+                conn.execute(text("SELECT * FROM missing_table"))
+        assert not conn.info.get("query_started")
+        # The connection still counts normally afterwards
+        conn.execute(text("SELECT 1"))
+        assert not conn.info.get("query_started")
+
+
+@pytest.fixture
+def client(engine):
+    app = FastAPI()
+    app.middleware("http")(query_stats_middleware)
+
+    @app.get("/two", dependencies=[Depends(QueryBudget(queries=2))])
+    async def two_queries():
+        _run_queries(engine, 2)
+        return {"ok": True}
+
+    @app.get("/over", dependencies=[Depends(QueryBudget(queries=1))])
+    async def over_budget():
+        _run_queries(engine, 2)
+        return {"ok": True}
+
+    return TestClient(app)
+
+
+def test_middleware_sets_server_timing(client):
+    response = client.get("/two")
+    assert response.status_code == 200
+    timing = response.headers["Server-Timing"]
+    assert timing.startswith("db;dur=")
+    assert 'desc="2 queries' in timing
+
+
+def test_route_budget_violation_is_collected(client):
+    # Collected in a nested list, so the autouse fixture stays clean
+    with collect_violations() as violations:
+        response = client.get("/over")
+    assert response.status_code == 200
+    assert len(violations) == 1
+    assert violations[0].startswith("GET /over: 2 queries > budget 1")
+
+
+def test_route_within_budget_collects_nothing(client):
+    with collect_violations() as violations:
+        client.get("/two")
+    assert violations == []
@@ -0,0 +1,43 @@
+"""
+End-detection gate: replays the labelled corpus in tests/replay_corpus
+through replay_monitor.main, so edits to _END_PHRASES, the timer and
+participant extraction or EndDetector fail here before they reach a bot.
+
+Recordings are lowercased frame text, as the recorder writes it; text end
+phrases only count once they persist for _TEXT_END_CONFIRM_POLLS polls.
+"""
+import gzip
+import json
+from pathlib import Path
+
+import pytest
+
+from replay_monitor import build_parser, main
+
+CORPUS = Path(__file__).parent / "replay_corpus"
+THRESHOLDS = [
+    "--max-false-positive-rate", "0",
+    "--max-missed", "0",
+    "--max-p95-latency", "30",
+    "--max-disagreements", "0",
+]
+
+
+@pytest.mark.parametrize("cadence", ["adaptive", "recorded"])
+def test_corpus_within_thresholds(capsys, cadence):
+    args = build_parser().parse_args([str(CORPUS), "--cadence", cadence, *THRESHOLDS])
+    assert main(args) == 0, capsys.readouterr().out
+
+
+def test_corpus_covers_every_platform():
+    platforms = set()
+    for path in CORPUS.rglob("monitor_ticks.jsonl.gz"):
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            platforms.add(json.loads(f.readline())["platform"])
+    assert platforms == {"google_meet", "zoom", "microsoft_teams"}
+
+
+def test_toast_is_not_an_end(capsys):
+    args = build_parser().parse_args([str(CORPUS / "google_meet_left_toast"), "--max-false-positive-rate", "0"])
+    assert main(args) == 0
+    assert "ok (no end)" in capsys.readouterr().out
@@ -5,11 +5,15 @@ Handles Zoom web client join flow with camera/mic controls
 import asyncio
 import argparse
 from playwright.async_api import async_playwright
-from meeting_monitor import monitor_and_complete
+from meeting_monitor import monitor_and_complete, report_event
+from bot_browser import open_bot_context, PROTOCOL_DIALOG_ARGS
 
 async def join_zoom_meeting(meeting_url: str, meeting_id: str = None,
                             api_url: str = "http://localhost:8000/api/v1",
-                            api_secret: str = ""):
+                            api_secret: str = "",
+                            browser_pool: str = None,
+                            scheduled_time: str = None,
+                            duration_minutes: int = None):
     """
     Join Zoom meeting automatically via web browser
     Handles: "Join from browser" link, camera/mic toggle, name input, join button
@@ -24,39 +28,20 @@ async def join_zoom_meeting(meeting_url: str, meeting_id: str = None,
     async with async_playwright() as p:
         print("\n[INFO] Launching Chrome...")
         
-        from pathlib import Path
-        
-        # Create user data directory for persistent browser profile
-        user_data_dir = Path.home() / ".meetborg" / "chrome_profile"
-        user_data_dir.mkdir(parents=True, exist_ok=True)
-        
-        # Launch persistent context with args to bypass protocol handler dialogs
-        import os
-        docker_args = ["--no-sandbox", "--disable-dev-shm-usage"] if os.environ.get("DOCKER_ENV") == "1" else []
-        context = await p.chromium.launch_persistent_context(
-            str(user_data_dir),
-            headless=False,
-            channel='chrome',
-            args=docker_args + [
-                '--disable-blink-features=AutomationControlled',
-                '--use-fake-ui-for-media-stream',
-                '--use-fake-device-for-media-stream',
-                '--disable-features=ExternalProtocolDialogInProductHelp',
-                '--disable-external-intent-requests',
-                '--no-first-run',
-                '--no-default-browser-check',
-                '--window-size=1280,720',
-                '--window-position=100,50',
-            ],
+        # Warm pooled Chrome if available, else persistent-profile cold launch
+        # with args to bypass protocol handler dialogs
+        context = await open_bot_context(
+            p,
+            pool_address=browser_pool,
+            extra_args=PROTOCOL_DIALOG_ARGS,
             permissions=['camera', 'microphone'],
             viewport={'width': 1280, 'height': 720},
             accept_downloads=False
         )
         
-        print("[OK] Chrome launched!")
-        
         # Create new page
         page = await context.new_page()
+        await report_event(meeting_id, api_url, api_secret, "browser_ready")
 
         # Force window size via CDP — overrides profile's saved maximized state
         try:
@@ -346,6 +331,7 @@ async def join_zoom_meeting(meeting_url: str, meeting_id: str = None,
 
             if join_clicked:
                 print("[OK] Join button clicked or already in!")
+                await report_event(meeting_id, api_url, api_secret, "lobby_reached")
                 await page.wait_for_timeout(3000)
             else:
                 print("[WARN] Could not click Join button with any strategy")
@@ -375,6 +361,8 @@ async def join_zoom_meeting(meeting_url: str, meeting_id: str = None,
             meeting_id=meeting_id,
             api_url=api_url,
             api_secret=api_secret,
+            scheduled_time=scheduled_time,
+            duration_minutes=duration_minutes,
         )
         return True
 
@@ -384,6 +372,9 @@ if __name__ == "__main__":
     parser.add_argument("--meeting-id", default=None, help="Meeting ID for completion callback")
     parser.add_argument("--api-url", default="http://localhost:8000/api/v1")
     parser.add_argument("--api-secret", default="")
+    parser.add_argument("--browser-pool", default=None, help="host:port of browser_pool.py")
+    parser.add_argument("--scheduled-time", default=None, help="ISO start time (UTC), paces end detection")
+    parser.add_argument("--duration-minutes", type=int, default=None)
     args = parser.parse_args()
 
     result = asyncio.run(join_zoom_meeting(
@@ -391,6 +382,9 @@ if __name__ == "__main__":
         meeting_id=args.meeting_id,
         api_url=args.api_url,
         api_secret=args.api_secret,
+        browser_pool=args.browser_pool,
+        scheduled_time=args.scheduled_time,
+        duration_minutes=args.duration_minutes,
     ))
 
     if result:
@@ -13,6 +13,8 @@
 # Optional env vars:
 #   VNC_ENABLED  — true to start x11vnc on :5900 for live debugging
 #   RECORD_VIDEO — true to also record the screen as screen.mkv (audio always recorded)
+#   MONITOR_RECORD — true to save end-detection ticks as monitor_ticks.jsonl.gz
+#   SCHEDULED_TIME / DURATION_MINUTES — meeting schedule, paces end detection
 # ──────────────────────────────────────────────────────────────────────────────
 set -e
 
@@ -68,7 +70,8 @@ if [ "${VNC_ENABLED:-false}" = "true" ]; then
 fi
 
 # ── Step 4: Create recording directory ───────────────────────────────────────
-RECORDING_DIR="/recordings/${MEETING_ID}"
+# Exported: the bot keeps its event outbox (events.jsonl) here too
+export RECORDING_DIR="/recordings/${MEETING_ID}"
 mkdir -p "$RECORDING_DIR"
 echo "[INFO] Recording output: $RECORDING_DIR"
 
@@ -121,6 +124,11 @@ EOF
 export PULSE_SINK=VirtualSink
 export DOCKER_ENV=1  # tells the script to add --no-sandbox to Chrome args
 
+# Optional schedule: lets the monitor poll slowly mid-meeting, fast near the end
+SCHEDULE_ARGS=()
+[ -n "${SCHEDULED_TIME:-}" ] && SCHEDULE_ARGS+=(--scheduled-time "$SCHEDULED_TIME")
+[ -n "${DURATION_MINUTES:-}" ] && SCHEDULE_ARGS+=(--duration-minutes "$DURATION_MINUTES")
+
 BOT_EXIT_CODE=0
 case "$PLATFORM" in
     "google_meet")
@@ -128,21 +136,24 @@ case "$PLATFORM" in
         python3 simple_join.py "$MEETING_URL" \
             --meeting-id "$MEETING_ID" \
             --api-url "$API_URL" \
-            --api-secret "$API_SECRET" || BOT_EXIT_CODE=$?
+            --api-secret "$API_SECRET" \
+            "${SCHEDULE_ARGS[@]}" || BOT_EXIT_CODE=$?
         ;;
     "zoom")
         echo "[INFO] Launching Zoom bot..."
         python3 zoom_join.py "$MEETING_URL" \
             --meeting-id "$MEETING_ID" \
             --api-url "$API_URL" \
-            --api-secret "$API_SECRET" || BOT_EXIT_CODE=$?
+            --api-secret "$API_SECRET" \
+            "${SCHEDULE_ARGS[@]}" || BOT_EXIT_CODE=$?
         ;;
     "microsoft_teams")
         echo "[INFO] Launching Teams bot..."
         python3 teams_join.py "$MEETING_URL" \
             --meeting-id "$MEETING_ID" \
             --api-url "$API_URL" \
-            --api-secret "$API_SECRET" || BOT_EXIT_CODE=$?
+            --api-secret "$API_SECRET" \
+            "${SCHEDULE_ARGS[@]}" || BOT_EXIT_CODE=$?
         ;;
     *)
         echo "[ERROR] Unknown platform: $PLATFORM"
@@ -157,6 +168,16 @@ echo "[INFO] Bot exited (code: $BOT_EXIT_CODE). Stopping recorders..."
 [ -n "$FFMPEG_AUDIO_PID" ] && kill -SIGTERM $FFMPEG_AUDIO_PID 2>/dev/null && wait $FFMPEG_AUDIO_PID 2>/dev/null || true
 [ -n "$FFMPEG_VIDEO_PID" ] && kill -SIGTERM $FFMPEG_VIDEO_PID 2>/dev/null && wait $FFMPEG_VIDEO_PID 2>/dev/null || true
 
+# Deliver any bot events the bot could not send before it exited (e.g. the
+# completion, if the bot crashed or the backend was down). Bounded so a dead
+# backend can't keep the container alive; unsent events stay on disk for the
+# next drain.
+python3 meeting_monitor.py \
+    --meeting-id "$MEETING_ID" \
+    --api-url "$API_URL" \
+    --api-secret "$API_SECRET" \
+    --max-seconds "${OUTBOX_DRAIN_SECONDS:-300}" || true
+
 # Append end time to metadata
 cat >> "${RECORDING_DIR}/metadata.json" <<EOF
 
@@ -12,7 +12,7 @@ export interface Meeting {
     scheduled_time: string | null;
     duration_minutes: number;
     purpose: string | null;
-    status: 'scheduled' | 'in_progress' | 'completed' | 'cancelled' | 'failed';
+    status: 'scheduled' | 'queued' | 'in_progress' | 'completed' | 'cancelled' | 'failed';
     user_id: string;
     created_at: string;
     updated_at: string;
@@ -33,7 +33,16 @@ export interface MeetingUpdate {
     scheduled_time?: string;
     duration_minutes?: number;
     purpose?: string;
-    status?: 'scheduled' | 'in_progress' | 'completed' | 'cancelled' | 'failed';
+    status?: 'scheduled' | 'queued' | 'in_progress' | 'completed' | 'cancelled' | 'failed';
+}
+
+export interface MeetingStatusEvent {
+    type: 'status';
+    id: string;
+    user_id: string;
+    status: Meeting['status'];
+    previous: Meeting['status'] | null;
+    at: string;
 }
 
 export interface PlatformDetectionResponse {
@@ -63,8 +72,18 @@ export const meetingsAPI = {
         return response.data;
     },
 
+    // Create many meetings in one request; results are per item, by index
+    bulkCreate: async (meetings: MeetingCreate[]) => {
+        const response = await axios.post(`${API_BASE_URL}/meetings/bulk`, { meetings }, {
+            headers: {
+                Authorization: `Bearer ${getAuthToken()}`,
+            },
+        });
+        return response.data;
+    },
+
     // List all meetings
-    list: async (params?: { skip?: number; limit?: number; status_filter?: string }) => {
+    list: async (params?: { skip?: number; limit?: number; status_filter?: string; cursor?: string }) => {
         const response = await axios.get(`${API_BASE_URL}/meetings`, {
             params,
             headers: {
@@ -113,6 +132,16 @@ export const meetingsAPI = {
         return response.data;
     },
 
+    // Subscribe to status changes (server-sent events). onResync fires when
+    // events may have been missed and the list should be refetched.
+    streamStatus: (onStatus: (event: MeetingStatusEvent) => void, onResync: () => void): EventSource => {
+        const token = encodeURIComponent(getAuthToken() || '');
+        const source = new EventSource(`${API_BASE_URL}/meetings/stream?token=${token}`);
+        source.addEventListener('status', (e) => onStatus(JSON.parse((e as MessageEvent).data)));
+        source.addEventListener('resync', () => onResync());
+        return source;
+    },
+
     // Detect platform from URL (no auth required)
     detectPlatform: async (url: string): Promise<PlatformDetectionResponse> => {
         const response = await axios.post<PlatformDetectionResponse>(
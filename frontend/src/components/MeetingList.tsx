@@ -77,6 +77,8 @@ const MeetingList: React.FC<MeetingListProps> = ({ meetings, onJoin, onEdit, onD
         switch (status) {
             case 'scheduled':
                 return 'primary';
+            case 'queued':
+                return 'info';
             case 'in_progress':
                 return 'warning';
             case 'completed':
@@ -46,17 +46,24 @@ const Meetings: React.FC = () => {
         loadMeetings(statusFilter);
     }, [statusFilter]);
 
-    // Auto-refresh every 30s while any meeting is IN_PROGRESS
+    // Live status updates pushed by the backend instead of polling
     useEffect(() => {
-        const hasInProgress = meetings.some(m => m.status === 'in_progress');
-        if (!hasInProgress) return;
+        const source = meetingsAPI.streamStatus(
+            (event) => {
+                if (statusFilter !== 'all') {
+                    // The change may move the meeting in or out of the filtered list
+                    loadMeetings(statusFilter);
+                    return;
+                }
+                setMeetings(current => current.map(m =>
+                    m.id === event.id ? { ...m, status: event.status, updated_at: event.at } : m
+                ));
+            },
+            () => loadMeetings(statusFilter)
+        );
 
-        const interval = setInterval(() => {
-            loadMeetings(statusFilter);
-        }, 30000);
-
-        return () => clearInterval(interval);
-    }, [meetings, statusFilter]);
+        return () => source.close();
+    }, [statusFilter]);
 
 
     const handleFormSuccess = () => {